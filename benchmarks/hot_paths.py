@@ -0,0 +1,350 @@
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from game.catalog import EventCatalog
+from game.economy import Economy
+from game.event_index import EventIndex
+from game.effects import StatEffect
+from game.events import RandomEventSystem
+from game.household import Household
+from game.interaction import InteractionSystem
+from game.pet import Pet
+from game.rng import RandomStreams
+from game.travel import TravelSystem
+from sim.balance import policy_feeder
+from ui.replay import ReplayUI
+from ui.text_ui import TextUI
+from utils.helpers import NullOutput
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+CATALOG_SIZES = (10, 100, 1_000, 10_000, 100_000)
+# Catalogs whose hunger windows have fractional bounds, so nearly every event adds boundaries
+FRACTIONAL_SIZES = (1_000, 10_000)
+LOCATION_COUNTS = (4, 100, 10_000)
+HOUSEHOLD_SIZES = (1, 10, 100, 1000)
+# Ticks in the recorded session that session_replay re-runs
+SESSION_TICKS = 2000
+
+def measure(fn, min_time=0.1, repeat=5):
+    """
+    Call fn() in a loop and return the nanoseconds per call of the fastest of repeat runs,
+    each long enough (min_time seconds) for the timer resolution not to matter.
+    The fastest run is the one least disturbed by other work on the machine.
+    """
+    calls = 1
+    while True:
+        ns = _timed(fn, calls)
+        if ns >= min_time * 1e9:
+            break
+        # Aim straight for min_time, but at most 100x more calls per step
+        calls = min(calls * 100, max(calls * 2, int(calls * min_time * 1e9 / max(ns, 1))))
+    best = ns / calls
+    if ns > 10 * min_time * 1e9:
+        repeat = min(repeat, 2)     # Slow cases (whole catalogs, sessions): fewer repeats
+    for _ in range(repeat - 1):
+        best = min(best, _timed(fn, calls) / calls)
+    return best
+
+def _timed(fn, calls):
+    loop = range(calls)
+    start = time.perf_counter_ns()
+    for _ in loop:
+        fn()
+    return time.perf_counter_ns() - start
+
+def synthetic_events(count, seed=0, fractional=False):
+    """
+    A catalog of count random events: hunger windows of varied width (with fractional bounds
+    if asked), a third of them with an extra energy or happiness bound, small stat changes
+    and weights.
+    """
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        if fractional:
+            low = round(rng.uniform(0, 90), 3)
+            condition = {'min_hunger': low, 'max_hunger': round(rng.uniform(low + 10, 100), 3)}
+        else:
+            low = rng.randrange(0, 90)
+            condition = {'min_hunger': low, 'max_hunger': rng.randrange(low + 10, 101)}
+        if rng.random() < 0.33:
+            condition[rng.choice(('min_energy', 'min_happiness'))] = rng.randrange(0, 60)
+        events.append({
+            'key': f'event_{i}',
+            'condition': condition,
+            'weight': rng.randint(1, 5),
+            'happiness': rng.randint(-3, 3),
+            'energy': rng.randint(-3, 3),
+            'health': 0,
+            'text': f"{{pet_name}} has synthetic event {i}.",
+        })
+    return events
+
+def synthetic_locations(count, seed=0):
+    """
+    count travel locations with two scenarios each, shaped like TravelSystem.locations.
+    """
+    rng = random.Random(seed)
+    return {
+        f'place_{i}': {
+            'name': f'Synthetic place {i}',
+            'scenarios': [{'text': f'{{name}} visits place {i}.', 'happiness': rng.randint(-5, 10),
+                           'energy': -rng.randint(1, 10)} for _ in range(2)],
+        }
+        for i in range(count)
+    }
+
+def _write_catalog(directory, count):
+    path = os.path.join(directory, f'events_{count}.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(synthetic_events(count), f)
+    return path
+
+class _Player(TextUI):
+    """
+    Plays the recorded session for session_replay: always picks the reaction game and
+    answers it in 0.2s, without reading the terminal or sleeping.
+    """
+    def _read(self, prompt):
+        reply = '1' if prompt.startswith('Enter number') else ''
+        self.recorder.answer(reply, 0.2)
+        return reply
+
+    def _sleep(self, seconds):
+        self.recorder.waited(seconds)
+
+def record_session(path, ticks=SESSION_TICKS, seed=0):
+    """
+    Record a headless game: the feeder caretaker policy, petting and vet visits before
+    happiness, health or energy get low, a trip now and then, and the reaction minigame
+    whenever coins run low.
+    Returns the number of recorded entries.
+    """
+    ui = _Player('Polly', 'normal', seed=seed)
+    ui.record(path)
+    ui.running = True
+    for tick in range(ticks):
+        pet = ui.pet
+        commands = policy_feeder(pet, ui.economy)
+        if pet.happiness < 50:
+            commands.append('interact head')
+        if pet.health < 60 or pet.energy < 30:
+            commands.append('vet')
+        if ui.economy.coins < 40:
+            commands += ['money', 'money']
+        if tick % 10 == 0:
+            commands += ['travel beach', 'status']
+        for command in commands:
+            ui.dispatch(command)
+        ui.tick(ui.interval)
+        if not pet.is_alive():
+            break
+    entries = ui.recorder.entries
+    ui._shutdown()
+    return entries
+
+def _cases(directory, sizes, locations):
+    """
+    Yield (name, setup) pairs; setup() builds the objects of one case and returns the callable
+    to time, so only the selected cases pay for their setup.
+    """
+    def pet_update():
+        pet = Pet('Polly')
+        # A tiny delta keeps the pet on the normal (alive) path for any number of calls
+        return lambda: pet.update(1e-6)
+    yield 'pet_update', pet_update
+
+    def economy_buy_feed():
+        economy = Economy()
+        economy.coins = 10 ** 15
+        return lambda: economy.buy_feed(1)
+    yield 'economy_buy_feed', economy_buy_feed
+
+    def interaction_action():
+        interact = InteractionSystem(Pet('Polly'), Economy())
+        parts = itertools.cycle(interact.thresholds)
+        return lambda: interact.action(next(parts))
+    yield 'interaction_action', interaction_action
+
+    for count in locations:
+        def travel(count=count):
+            system = TravelSystem(Pet('Polly'), rng=random.Random(0))
+            system.locations = synthetic_locations(count)
+            system.effects = {key: [StatEffect.from_spec(s) for s in loc['scenarios']]
+                              for key, loc in system.locations.items()}
+            keys = itertools.cycle(list(system.locations))
+            return lambda: system.travel(next(keys))
+        yield f'travel_{count}_locations', travel
+
+    for count in sizes:
+        path = _write_catalog(directory, count)
+        cache_dir = os.path.join(directory, '.cache')
+
+        def compile_catalog(path=path, cache_dir=cache_dir):
+            def compile_once():
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                EventCatalog(path)
+            return compile_once
+        yield f'catalog_compile_{count}', compile_catalog
+
+        def cached_catalog(path=path):
+            EventCatalog(path)     # Writes the cache the timed loads read
+            return lambda: EventCatalog(path)
+        yield f'catalog_cached_{count}', cached_catalog
+
+        def trigger(path=path):
+            pet, economy = Pet('Polly'), Economy()
+            events = RandomEventSystem(pet, economy, config_path=path, rng=random.Random(0))
+            states = itertools.cycle([(h, 50 + h % 40, 80 - h % 50) for h in range(0, 100, 7)])
+
+            def run():
+                pet.hunger, pet.happiness, pet.energy = next(states)
+                events.trigger()
+            return run
+        yield f'event_trigger_{count}', trigger
+
+    for count in FRACTIONAL_SIZES:
+        def index_build(count=count):
+            events = synthetic_events(count, fractional=True)
+            return lambda: EventIndex(events)
+        yield f'event_index_fractional_{count}', index_build
+
+    for count in HOUSEHOLD_SIZES:
+        def household_tick(count=count):
+            household = Household(Economy(), RandomStreams(0))
+            for i in range(count):
+                household.adopt(f'pet{i}')
+            pets = [member.pet for member in household]
+
+            def tick():
+                # Keep every pet healthy, so each call ticks the whole household
+                for pet in pets:
+                    pet.hunger, pet.happiness, pet.energy, pet.health = 40, 60, 80, 100
+                household.tick(1e-3)
+            return tick
+        yield f'household_tick_{count}', household_tick
+
+    def dispatch(command):
+        def setup():
+            ui = TextUI('Polly', 'normal', seed=0)
+            ui.economy.feed_stock = 10 ** 15
+            ui.running = True
+            return lambda: ui.dispatch(command)
+        return setup
+    yield 'dispatch_status', dispatch('status')
+    yield 'dispatch_feed', dispatch('feed')
+    yield 'dispatch_unknown', dispatch('dance')
+
+    def session_replay():
+        path = os.path.join(directory, 'session.jsonl')
+        record_session(path)
+
+        def replay():
+            if not ReplayUI(path, quiet=True).replay()[0]:
+                raise AssertionError("session replay diverged from its recording")
+        return replay
+    yield 'session_replay', session_replay
+
+def run_suite(only=None, sizes=CATALOG_SIZES, locations=LOCATION_COUNTS, min_time=0.1, progress=None):
+    """
+    Run the benchmark cases whose name contains one of the only substrings (all by default).
+    Returns {case name: nanoseconds per call}.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, setup in _cases(directory, sizes, locations):
+            if only and not any(part in name for part in only):
+                continue
+            # Game code prints; keep it out of the report
+            with contextlib.redirect_stdout(NullOutput()):
+                results[name] = measure(setup(), min_time)
+            if progress:
+                progress(name, results[name])
+    return results
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def save_baseline(results, path=BASELINE_PATH):
+    data = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'created': time.strftime('%Y-%m-%d'),
+        'results': {name: round(ns, 1) for name, ns in results.items()},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+def regressions(results, baseline, threshold):
+    """
+    Return [(name, baseline ns, current ns)] for cases more than threshold (e.g. 0.25 = 25%)
+    slower than their baseline. Cases missing from either side are not compared.
+    """
+    slow = []
+    for name, ns in results.items():
+        base = baseline['results'].get(name)
+        if base and ns > base * (1 + threshold):
+            slow.append((name, base, ns))
+    return slow
+
+def _format_ns(ns):
+    for unit, scale in (('s', 1e9), ('ms', 1e6), ('µs', 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency and throughput of the game's hot paths, "
+                                                 "compared against a stored baseline")
+    parser.add_argument('--only', nargs='+', metavar='NAME',
+                        help="run only cases whose name contains one of these substrings")
+    parser.add_argument('--quick', action='store_true',
+                        help="catalogs up to 10k events, fewer locations and shorter timing runs")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="fail when a case is this much slower than the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    sizes = CATALOG_SIZES[:-1] if args.quick else CATALOG_SIZES
+    locations = LOCATION_COUNTS[:-1] if args.quick else LOCATION_COUNTS
+    baseline = None if args.save else load_baseline(args.baseline)
+    print(f"{'case':<28}{'per call':>12}{'calls/s':>14}{'vs baseline':>13}")
+
+    def progress(name, ns):
+        base = baseline and baseline['results'].get(name)
+        change = f"{ns / base - 1:+.0%}" if base else '-'
+        rate = 1e9 / ns
+        print(f"{name:<28}{_format_ns(ns):>12}{rate:>14,.{0 if rate >= 100 else 2}f}{change:>13}", flush=True)
+
+    results = run_suite(args.only, sizes, locations, 0.05 if args.quick else 0.1, progress)
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save to create one.")
+        return
+    slow = regressions(results, baseline, args.threshold)
+    for name, base, ns in slow:
+        print(f"REGRESSION {name}: {_format_ns(ns)} per call, baseline {_format_ns(base)}")
+    if slow:
+        sys.exit(1)
+    print(f"No case is more than {args.threshold:.0%} slower than the baseline.")
+
+if __name__ == "__main__":
+    main()
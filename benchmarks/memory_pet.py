@@ -0,0 +1,74 @@
+import argparse
+import gc
+import tracemalloc
+
+from game.economy import Economy
+from game.pet import Pet
+from game.population import PetPopulation
+
+class DictPet:
+    """
+    Pet and Economy as they were before __slots__: the same attributes in a per-instance __dict__.
+    """
+    __init__ = Pet.__init__
+    update = Pet.update
+
+class DictEconomy:
+    __init__ = Economy.__init__
+
+def _measure(build):
+    """
+    Return (bytes allocated, result) for build(), as seen by tracemalloc.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return after - before, result
+
+def _objects(pet_class, economy_class, count):
+    pets = []
+    economies = []
+    for i in range(count):
+        pet = pet_class(f"Polly{i}")
+        # One update turns the starting ints into the floats a running game holds
+        pet.update(0.5)
+        pets.append(pet)
+        economies.append(economy_class())
+    return pets, economies
+
+def _population(count):
+    population = PetPopulation(capacity=count)
+    for i in range(count):
+        population.add(f"Polly{i}")
+    population.step(0.5)
+    return population
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bytes per pet (with its economy) for each pet representation")
+    parser.add_argument('--count', type=int, default=1_000_000, help="number of pets to create")
+    args = parser.parse_args(argv)
+    n = args.count
+
+    # Names are the same in every representation; measure them once and report them apart
+    names, _ = _measure(lambda: [f"Polly{i}" for i in range(n)])
+    rows = [
+        ('dict Pet + Economy', lambda: _objects(DictPet, DictEconomy, n)),
+        ('__slots__ Pet + Economy', lambda: _objects(Pet, Economy, n)),
+        ('PetPopulation (no economy)', lambda: _population(n)),
+    ]
+    print(f"{n} pets, names alone take {names / n:.0f} bytes/pet")
+    baseline = None
+    for label, build in rows:
+        size, result = _measure(build)
+        del result
+        per_pet = (size - names) / n
+        baseline = baseline or per_pet
+        print(f"  {label:<28}{per_pet:>8.0f} bytes/pet  ({per_pet / baseline:.0%} of dict classes)")
+
+if __name__ == "__main__":
+    main()
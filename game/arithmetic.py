@@ -0,0 +1,111 @@
+import operator
+
+# Operator table: symbol -> (precedence, function, sign when applied to a whole term)
+OPERATORS = {
+    '+': (1, operator.add, 1),
+    '-': (1, operator.sub, -1),
+    '*': (2, operator.mul, None),
+}
+SYMBOLS = tuple(OPERATORS)
+
+class Tier:
+    """
+    A difficulty level of generated questions: which operators, the operand range and how
+    many operands (terms - 1 operators) each question has.
+    """
+    def __init__(self, ops, low, high, terms, reward):
+        self.ops = tuple(ops)
+        self.low = low
+        self.high = high
+        self.terms = terms
+        self.reward = reward    # Coins per correct answer
+
+# The game's quiz plays the normal tier, at the 5 coins per answer it always paid;
+# the other tiers are for bots and benchmarks, and hard questions pay more
+TIERS = {
+    'easy': Tier('+-', 1, 10, 2, 5),
+    'normal': Tier('+-*', 1, 20, 2, 5),
+    'hard': Tier('+-*', 2, 30, 3, 8),
+}
+
+def evaluate(operands, ops):
+    """
+    Evaluate operands[0] ops[0] operands[1] ... with * binding tighter than + and -,
+    using the operator table instead of eval().
+    """
+    total = 0
+    apply = operator.add
+    term = operands[0]
+    for op, value in zip(ops, operands[1:]):
+        precedence, fn, _ = OPERATORS[op]
+        if precedence == 2:
+            term = fn(term, value)
+        else:
+            total = apply(total, term)
+            apply = fn
+            term = value
+    return apply(total, term)
+
+def render(operands, ops):
+    """
+    Return the question text, e.g. "3 + 4 * 2".
+    """
+    parts = [str(operands[0])]
+    for op, value in zip(ops, operands[1:]):
+        parts += (op, str(value))
+    return ' '.join(parts)
+
+class Question:
+    __slots__ = ('operands', 'ops', 'answer')
+
+    def __init__(self, operands, ops, answer):
+        self.operands = operands
+        self.ops = ops
+        self.answer = answer
+
+    @property
+    def text(self):
+        return render(self.operands, self.ops)
+
+def generate(tier, count, rng):
+    """
+    Generate a whole round of count questions for a Tier (or tier name) with rng.
+    """
+    if isinstance(tier, str):
+        tier = TIERS[tier]
+    questions = []
+    for _ in range(count):
+        operands = [rng.randint(tier.low, tier.high) for _ in range(tier.terms)]
+        ops = [rng.choice(tier.ops) for _ in range(tier.terms - 1)]
+        questions.append(Question(operands, ops, evaluate(operands, ops)))
+    return questions
+
+def generate_arrays(tier, count, rng):
+    """
+    Vectorized version of generate() for bots and benchmarks (requires numpy).
+    rng is a numpy Generator. Returns (operands, op indices into SYMBOLS, answers) as
+    arrays of shapes (count, terms), (count, terms - 1) and (count,).
+    """
+    import numpy as np
+
+    if isinstance(tier, str):
+        tier = TIERS[tier]
+    operands = rng.integers(tier.low, tier.high + 1, size=(count, tier.terms), dtype=np.int64)
+    allowed = np.array([SYMBOLS.index(op) for op in tier.ops])
+    ops = allowed[rng.integers(0, len(allowed), size=(count, tier.terms - 1))]
+    precedence = np.array([OPERATORS[s][0] for s in SYMBOLS])
+    signs = np.array([OPERATORS[s][2] or 0 for s in SYMBOLS])
+
+    # Same fold as evaluate(), column by column: a * extends the current term,
+    # an additive operator adds the finished term with its sign and starts a new one
+    total = np.zeros(count, dtype=np.int64)
+    sign = np.ones(count, dtype=np.int64)
+    term = operands[:, 0].copy()
+    for j in range(tier.terms - 1):
+        value = operands[:, j + 1]
+        code = ops[:, j]
+        binds = precedence[code] == 2
+        total = np.where(binds, total, total + sign * term)
+        sign = np.where(binds, sign, signs[code])
+        term = np.where(binds, term * value, value)
+    return operands, ops, total + sign * term
@@ -0,0 +1,355 @@
+import hashlib
+import json
+import os
+import pickle
+import string
+import tempfile
+import threading
+from collections import Counter
+
+from game.conditions import validate_condition
+from game.effects import StatEffect
+from game.event_index import EventIndex
+from utils.output import emit
+
+# Stats an event can change
+EVENT_STATS = ('happiness', 'energy', 'hunger', 'health')
+EVENT_FIELDS = {'key', 'condition', 'weight', 'coins', 'text', *EVENT_STATS,
+                'cooldown', 'effects', 'followup', 'deadline'}
+# Fields of a scheduled effect, a follow-up and a deadline
+EFFECT_FIELDS = {'delay', 'every', 'times', 'coins', 'text', *EVENT_STATS}
+FOLLOWUP_FIELDS = {'event', 'delay'}
+DEADLINE_FIELDS = {'seconds', 'event', 'cleared_by', 'cleared_text'}
+# Player actions that can clear a deadline (see RandomEventSystem.resolve)
+ACTIONS = ('vet', 'feed')
+# Placeholders the event text may use
+TEXT_FIELDS = {'pet_name'}
+
+# Bump whenever the compiled layout (CompiledCatalog / EventIndex) changes, to invalidate old caches
+CACHE_VERSION = 5
+# Directory for compiled catalogs, under the user's cache directory
+CACHE_DIR = 'parrot-pet'
+
+def _cache_dir():
+    """
+    Where compiled catalogs are cached: $XDG_CACHE_HOME or ~/.cache, or the temp directory
+    when there is no home directory. Never next to the data, which may be read-only.
+    """
+    base = os.environ.get('XDG_CACHE_HOME')
+    if not base:
+        home = os.path.expanduser('~')
+        base = os.path.join(home, '.cache') if home != '~' else tempfile.gettempdir()
+    return os.path.join(base, CACHE_DIR)
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _check_text(text, label, errors):
+    if not isinstance(text, str):
+        errors.append(f"{label} must be a string")
+        return
+    try:
+        fields = {f for _, f, _, _ in string.Formatter().parse(text) if f is not None}
+    except ValueError as e:
+        errors.append(f"{label} is not a valid format string ({e})")
+        return
+    for field in sorted(fields - TEXT_FIELDS):
+        errors.append(f"{label} uses unknown placeholder {{{field}}}")
+
+def _check_fields(spec, label, allowed, errors):
+    if not isinstance(spec, dict):
+        errors.append(f"{label} must be an object")
+        return False
+    for field in sorted(set(spec) - allowed):
+        errors.append(f"unknown field '{field}' in {label}")
+    for field in ('coins', *EVENT_STATS):
+        if field in allowed and not _is_int(spec.get(field, 0)):
+            errors.append(f"{label}.{field} must be an integer, not {spec[field]!r}")
+    return True
+
+def _check_seconds(spec, field, label, errors, required=False):
+    if field not in spec:
+        if required:
+            errors.append(f"{label}.{field} is required")
+    elif not _is_number(spec[field]) or spec[field] < 0:
+        errors.append(f"{label}.{field} must be a non-negative number of seconds")
+
+def _check_timing(ev, errors):
+    """
+    Check the cooldown, effects, follow-up and deadline of an event.
+    References to other events are checked once the whole catalog is read.
+    """
+    _check_seconds(ev, 'cooldown', 'event', errors)
+    effects = ev.get('effects', [])
+    if not isinstance(effects, list):
+        errors.append("effects must be a list")
+        effects = []
+    for i, effect in enumerate(effects):
+        label = f"effects[{i}]"
+        if not _check_fields(effect, label, EFFECT_FIELDS, errors):
+            continue
+        _check_seconds(effect, 'delay', label, errors)
+        _check_seconds(effect, 'every', label, errors)
+        times = effect.get('times', 1)
+        if not _is_int(times) or times < 1:
+            errors.append(f"{label}.times must be a positive integer")
+        elif times > 1 and not effect.get('every'):
+            errors.append(f"{label}.every is required when times is above 1")
+        if 'text' in effect:
+            _check_text(effect['text'], f"{label}.text", errors)
+    if 'followup' in ev and _check_fields(ev['followup'], 'followup', FOLLOWUP_FIELDS, errors):
+        if not isinstance(ev['followup'].get('event'), str):
+            errors.append("followup.event must be an event key")
+        _check_seconds(ev['followup'], 'delay', 'followup', errors)
+    if 'deadline' in ev and _check_fields(ev['deadline'], 'deadline', DEADLINE_FIELDS, errors):
+        deadline = ev['deadline']
+        if not isinstance(deadline.get('event'), str):
+            errors.append("deadline.event must be an event key")
+        _check_seconds(deadline, 'seconds', 'deadline', errors, required=True)
+        if deadline.get('cleared_by') not in ACTIONS:
+            errors.append(f"deadline.cleared_by must be one of {', '.join(ACTIONS)}")
+        if 'cleared_text' in deadline:
+            _check_text(deadline['cleared_text'], 'deadline.cleared_text', errors)
+
+def validate_event(ev):
+    """
+    Check one event definition against the catalog schema.
+    Returns (event, errors, warnings): event is a normalized copy with defaults filled in
+    and its deltas compiled into a StatEffect, or None if the definition has errors.
+    """
+    if not isinstance(ev, dict):
+        return None, [f"event is not an object: {ev!r}"], []
+    key = ev.get('key')
+    name = key if isinstance(key, str) and key else '?'
+    errors = []
+    warnings = []
+    if name == '?':
+        errors.append("event has no key")
+    for field in sorted(set(ev) - EVENT_FIELDS):
+        warnings.append(f"unknown field '{field}' is ignored")
+
+    weight = ev.get('weight', 1)
+    if not _is_int(weight) or weight < 0:
+        errors.append(f"weight must be a non-negative integer, not {weight!r}")
+    for field in ('coins', *EVENT_STATS):
+        if not _is_int(ev.get(field, 0)):
+            errors.append(f"{field} must be an integer, not {ev[field]!r}")
+    _check_text(ev.get('text', ''), 'text', errors)
+    errors += validate_condition(ev.get('condition', {}))
+    _check_timing(ev, errors)
+
+    if errors:
+        return None, [f"{name}: {e}" for e in errors], warnings
+    event = dict(ev)
+    event['condition'] = ev.get('condition', {})
+    event['weight'] = weight
+    event['text'] = ev.get('text', '')
+    event['stat_effect'] = StatEffect.from_spec(ev)
+    if 'effects' in ev:
+        event['effects'] = [dict(effect, stat_effect=StatEffect.from_spec(effect)) for effect in ev['effects']]
+    return event, [], warnings
+
+def _references(event):
+    return [spec['event'] for spec in (event.get('followup'), event.get('deadline')) if spec]
+
+class CompiledCatalog:
+    """
+    One validated version of an event catalog: the events, their EventIndex and the
+    identity (mtime, size, SHA-256) of the file they were built from.
+    Instances are never modified; a reload builds a new one and swaps it in.
+    """
+    def __init__(self, events, index, mtime_ns=None, size=None, digest=None, validated=None):
+        self.events = events
+        self.index = index
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        # Canonical JSON of each accepted definition -> its normalized event, reused on reload
+        self.validated = validated or {}
+
+class EventCatalog:
+    """
+    An event configuration file loaded once per process and shared by every RandomEventSystem.
+    The compiled catalog is cached in the user's cache directory, keyed on the file's SHA-256,
+    so later starts skip parsing, validation and indexing.
+    watch() polls the file's mtime and size and swaps in a rebuilt catalog while the game keeps
+    running; readers take self.current once per use, so they always see one consistent version.
+    On a reload only changed definitions are validated again; the index is rebuilt.
+    """
+    def __init__(self, path):
+        self.path = path
+        # One cache file per catalog path, so several checkouts do not overwrite each other's
+        where = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+        self.cache_path = os.path.join(_cache_dir(), f"{os.path.basename(path)}-{where}.pickle")
+        self.current = CompiledCatalog([], EventIndex([]))
+        self._rejected = None       # (mtime, size) of a version that failed to load
+        self._watcher = None
+        self._stop = threading.Event()
+        self.reload()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self):
+        """
+        Load the file if it changed since the current version. Returns True if a new
+        catalog was swapped in; on errors the current catalog is kept.
+        """
+        stamp = self._stat()
+        current = self.current
+        if stamp is None or stamp == (current.mtime_ns, current.size) or stamp == self._rejected:
+            return False
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return False
+        digest = hashlib.sha256(data).hexdigest()
+        compiled = self._load_cache(stamp, digest)
+        if compiled is None:
+            compiled = self._compile(stamp, data, digest, current)
+        if compiled is None:
+            self._rejected = stamp
+            return False
+        self._rejected = None
+        changed = compiled.digest != current.digest
+        self.current = compiled
+        return changed
+
+    def _load_cache(self, stamp, digest):
+        """
+        Return the cached compiled catalog if it was built from a file with this content
+        (under the current stamp, which may differ from the one it was cached with).
+        """
+        try:
+            with open(self.cache_path, 'rb') as f:
+                header = pickle.load(f)
+                if header != (CACHE_VERSION, digest):
+                    return None
+                cached = pickle.load(f)
+        except Exception:
+            return None
+        return CompiledCatalog(cached.events, cached.index, *stamp, digest, cached.validated)
+
+    def _save_cache(self, compiled):
+        tmp = self.cache_path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                pickle.dump((CACHE_VERSION, compiled.digest), f)
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass    # e.g. no writable cache directory: run without the cache
+
+    def _compile(self, stamp, data, digest, previous):
+        """
+        Parse, validate and index the file's data. Definitions that are unchanged since the
+        previous version are not validated again. Returns None if the data cannot be parsed.
+        """
+        try:
+            if digest == previous.digest:
+                # Touched but not edited: keep the compiled catalog under the new mtime
+                compiled = CompiledCatalog(previous.events, previous.index, *stamp, digest,
+                                           previous.validated)
+                self._save_cache(compiled)
+                return compiled
+            definitions = json.loads(data.decode('utf-8'))
+            if not isinstance(definitions, list):
+                raise ValueError("the catalog must be a list of events")
+        except Exception as e:
+            emit(f"Failed to load event configurations: {e}")
+            return None
+
+        events = []
+        validated = {}
+        seen = set()
+        errors = []
+        warnings = Counter()
+        for ev in definitions:
+            source = json.dumps(ev, sort_keys=True)
+            event = previous.validated.get(source)
+            if event is None:
+                event, problems, notes = validate_event(ev)
+                errors += problems
+                warnings.update(notes)
+                if event is None:
+                    continue
+            if event['key'] in seen:
+                errors.append(f"{event['key']}: duplicate key, definition skipped")
+                continue
+            seen.add(event['key'])
+            validated[source] = event
+            events.append(event)
+        # Drop events that refer to a missing event (repeat, as dropping one can orphan others)
+        while True:
+            keys = {ev['key'] for ev in events}
+            broken = [ev for ev in events if any(ref not in keys for ref in _references(ev))]
+            if not broken:
+                break
+            for ev in broken:
+                missing = ', '.join(ref for ref in _references(ev) if ref not in keys)
+                errors.append(f"{ev['key']}: refers to unknown event {missing}, definition skipped")
+            events = [ev for ev in events if all(ref in keys for ref in _references(ev))]
+        name = os.path.basename(self.path)
+        for message in errors:
+            emit(f"[Catalog] {name}: {message}")
+        for message, count in warnings.items():
+            emit(f"[Catalog] {name}: {message} ({count} event{'s' if count != 1 else ''})")
+
+        compiled = CompiledCatalog(events, EventIndex(events), *stamp, digest, validated)
+        self._save_cache(compiled)
+        return compiled
+
+    def poll(self):
+        """
+        reload(), announcing a new version. Returns whether there was one.
+        """
+        if not self.reload():
+            return False
+        emit(f"[Catalog] Reloaded {len(self.current.events)} events "
+             f"from {os.path.basename(self.path)}.")
+        return True
+
+    def watch(self, interval=2.0):
+        """
+        Start polling the file for changes in a daemon thread (once per catalog).
+        The new catalog is built on that thread, so ticks never wait for a reload.
+        An asyncio program polls from a task instead (see ui.async_ui.watch_catalog).
+        """
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                         name='catalog-watch', daemon=True)
+        self._watcher.start()
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            self.poll()
+
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+# Loaded catalogs by absolute path
+_catalogs = {}
+
+def load_catalog(config_path='data/events.json'):
+    """
+    Return the shared EventCatalog for an event configuration file, loading it on first use.
+    Many games (e.g. server sessions) then share one copy of the events and their index.
+    """
+    path = os.path.join(os.getcwd(), config_path)
+    if path not in _catalogs:
+        _catalogs[path] = EventCatalog(path)
+    return _catalogs[path]
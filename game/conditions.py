@@ -0,0 +1,101 @@
+import operator
+
+# Attributes an event condition can test, in the order of the state tuple passed to predicates:
+# the pet's stats, then the player's coins and feed stock
+ATTRIBUTES = ('hunger', 'happiness', 'energy', 'health', 'coins', 'feed')
+RANGE_KEYS = {f'{bound}_{attr}' for bound in ('min', 'max') for attr in ATTRIBUTES}
+COMBINATORS = ('all', 'any', 'not')
+
+def game_state(pet, economy):
+    """
+    Return the state tuple that compiled conditions are evaluated against.
+    """
+    return (pet.hunger, pet.happiness, pet.energy, pet.health, economy.coins, economy.feed_stock)
+
+def validate_condition(cond, path='condition'):
+    """
+    Return a list of problems with a condition. A condition is an object of range bounds
+    (min_<attribute> / max_<attribute>, inclusive) that must all hold, optionally with
+    "all": [conditions], "any": [conditions] and "not": condition.
+    """
+    if not isinstance(cond, dict):
+        return [f"{path} must be an object"]
+    errors = []
+    for key, value in cond.items():
+        if key in ('all', 'any'):
+            if not isinstance(value, list):
+                errors.append(f"{path}.{key} must be a list of conditions")
+                continue
+            for i, sub in enumerate(value):
+                errors += validate_condition(sub, f"{path}.{key}[{i}]")
+        elif key == 'not':
+            errors += validate_condition(value, f"{path}.not")
+        elif key not in RANGE_KEYS:
+            errors.append(f"unknown condition '{key}' in {path}")
+        elif not isinstance(value, (int, float)) or isinstance(value, bool):
+            errors.append(f"{path}.{key} must be a number, not {value!r}")
+    for attr in ATTRIBUTES:
+        low, high = cond.get(f'min_{attr}'), cond.get(f'max_{attr}')
+        if isinstance(low, (int, float)) and isinstance(high, (int, float)) and low > high:
+            errors.append(f"{path}: min_{attr} {low} is above max_{attr} {high}")
+    return errors
+
+def split_hunger(cond):
+    """
+    Split the top-level hunger bounds off a condition: returns (min_hunger, max_hunger, rest).
+    The event index handles the hunger range; only the rest needs a predicate.
+    """
+    rest = {k: v for k, v in cond.items() if k not in ('min_hunger', 'max_hunger')}
+    return cond.get('min_hunger', 0), cond.get('max_hunger', 100), rest
+
+def _never(state):
+    return False
+
+def _range_predicate(index, low, high):
+    # Specialize the common shapes so a check is a single comparison chain
+    get = operator.itemgetter(index)
+    if low is None:
+        return lambda state: get(state) <= high
+    if high is None:
+        return lambda state: low <= get(state)
+    return lambda state: low <= get(state) <= high
+
+def _conjunction(predicates):
+    if not predicates:
+        return None
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda state: first(state) and second(state)
+    predicates = tuple(predicates)
+    return lambda state: all(p(state) for p in predicates)
+
+def compile_condition(cond):
+    """
+    Compile a (validated) condition into predicate(state) -> bool over a game_state() tuple,
+    or None if the condition always holds.
+    """
+    predicates = []
+    for attr_index, attr in enumerate(ATTRIBUTES):
+        low, high = cond.get(f'min_{attr}'), cond.get(f'max_{attr}')
+        if low is not None or high is not None:
+            predicates.append(_range_predicate(attr_index, low, high))
+    for sub in cond.get('all', ()):
+        predicate = compile_condition(sub)
+        if predicate is not None:
+            predicates.append(predicate)
+    if 'any' in cond:
+        options = [compile_condition(sub) for sub in cond['any']]
+        if not options:
+            predicates.append(_never)
+        elif None not in options:
+            options = tuple(options)
+            predicates.append(lambda state: any(p(state) for p in options))
+    if 'not' in cond:
+        negated = compile_condition(cond['not'])
+        if negated is None:
+            predicates.append(_never)
+        else:
+            predicates.append(lambda state: not negated(state))
+    return _conjunction(predicates)
@@ -7,6 +7,8 @@ class Economy:
     buy_price (integer): The number of coins required to buy one unit of bird feed.
     """
 
+    __slots__ = ('coins', 'feed_stock', 'buy_price')
+
     def __init__(self):
         self.coins = 20
         self.feed_stock = 5    # Initial bird feed stock
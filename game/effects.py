@@ -0,0 +1,88 @@
+class StatEffect:
+    """
+    A change to the pet's stats and the player's coins and feed stock.
+    Events, scheduled effects, travel, interactions, play, the vet and feeding all describe
+    what they do as a StatEffect, and apply() is the one place where deltas are added and
+    clamped. Effects can be summed first (see add), so the changes of a whole tick are
+    applied in one pass with one clamp.
+    """
+    # Pet stats, clamped to [0, 100] after the deltas are added
+    STATS = ('hunger', 'happiness', 'energy', 'health')
+    FIELDS = STATS + ('coins', 'feed')
+    __slots__ = FIELDS
+
+    def __init__(self, hunger=0, happiness=0, energy=0, health=0, coins=0, feed=0):
+        self.hunger = hunger
+        self.happiness = happiness
+        self.energy = energy
+        self.health = health
+        self.coins = coins
+        self.feed = feed
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Build an effect from a configuration dict such as an event in events.json.
+        """
+        return cls(spec.get('hunger', 0), spec.get('happiness', 0), spec.get('energy', 0),
+                   spec.get('health', 0), spec.get('coins', 0), spec.get('feed', 0))
+
+    def __repr__(self):
+        changes = ', '.join(f"{f}={getattr(self, f)}" for f in self.FIELDS if getattr(self, f))
+        return f"StatEffect({changes})"
+
+    def __bool__(self):
+        return any(getattr(self, f) for f in self.FIELDS)
+
+    def add(self, other):
+        """
+        Accumulate another effect into this one (in place); returns self.
+        """
+        self.hunger += other.hunger
+        self.happiness += other.happiness
+        self.energy += other.energy
+        self.health += other.health
+        self.coins += other.coins
+        self.feed += other.feed
+        return self
+
+    def apply(self, pet, economy=None):
+        """
+        Add the deltas to the pet with a single clamp per stat, and to the economy if given.
+        A coin cost the player cannot afford is not charged.
+        """
+        pet.hunger = min(100, max(0, pet.hunger + self.hunger))
+        pet.happiness = min(100, max(0, pet.happiness + self.happiness))
+        pet.energy = min(100, max(0, pet.energy + self.energy))
+        pet.health = min(100, max(0, pet.health + self.health))
+        if economy is not None:
+            if self.coins > 0:
+                economy.earn(self.coins)
+            elif self.coins < 0:
+                economy.spend(-self.coins)
+            if self.feed:
+                economy.feed_stock = max(0, economy.feed_stock + self.feed)
+
+# Feeding the pet: one feed unit for less hunger and more happiness
+FEED = StatEffect(hunger=-10, happiness=10, feed=-1)
+
+class EffectBatch:
+    """
+    Collects the effects produced during one tick and applies their sum at the end.
+    """
+    def __init__(self):
+        self.total = StatEffect()
+        self.count = 0
+
+    def add(self, effect):
+        self.total.add(effect)
+        self.count += 1
+
+    def apply(self, pet, economy=None):
+        """
+        Apply everything collected so far in one pass and start a new batch.
+        """
+        if self.count:
+            self.total.apply(pet, economy)
+            self.total = StatEffect()
+            self.count = 0
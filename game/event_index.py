@@ -0,0 +1,194 @@
+import random
+from bisect import bisect_left, bisect_right
+
+from game.conditions import compile_condition, split_hunger
+
+class EventIndex:
+    """
+    Precomputed weighted lookup of random events by game state.
+    At build time the hunger axis is split into elementary segments at every
+    min_hunger / max_hunger boundary. Events that share the same hunger range are grouped,
+    and each group is stored in the O(log S) nodes of a segment tree over the S segments
+    that together cover its range, with the cumulative weights of the groups in each node.
+    The groups eligible in a segment are those of the nodes on its path to the root, so
+    building takes O(G log S) time and memory for G groups rather than O(G * S).
+    Any other condition of an event is compiled into a predicate that is checked only
+    for the event drawn, so selection stays a few binary searches per draw however
+    large the catalog grows.
+    """
+    # Draws rejected by a predicate before falling back to an exact scan of the segment
+    ATTEMPTS = 32
+
+    def __init__(self, events):
+        """
+        Build the index from a list of event configurations (as loaded from events.json).
+        """
+        # Event configurations by key, for formatting logged events
+        self.by_key = {ev.get('key'): ev for ev in events}
+        # Group events by their (min_hunger, max_hunger) range, skipping zero weights
+        ranges = {}
+        for ev in events:
+            weight = ev.get('weight', 1)
+            if weight <= 0:
+                continue
+            lo, hi, _ = split_hunger(ev.get('condition', {}))
+            ranges.setdefault((lo, hi), []).append((ev, weight))
+
+        self.groups = []
+        for (lo, hi), members in ranges.items():
+            cumulative = []
+            total = 0
+            for _, weight in members:
+                total += weight
+                cumulative.append(total)
+            self.groups.append((lo, hi, [ev for ev, _ in members], cumulative))
+        self._compile()
+
+        # Sorted distinct boundaries; segment 2i+1 is the point boundaries[i],
+        # segment 2i is the open interval just below it, and the last segment lies above all
+        self.boundaries = sorted({b for lo, hi, _, _ in self.groups for b in (lo, hi)})
+        self._build_tree(2 * len(self.boundaries) + 1)
+
+    def _compile(self):
+        # Predicates are closures, so they are rebuilt rather than pickled with a cached index
+        self.predicates = [[compile_condition(split_hunger(ev.get('condition', {}))[2]) for ev in events]
+                           for _, _, events, _ in self.groups]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['predicates']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    def _build_tree(self, count):
+        """
+        Insert every group into the segment tree over count elementary segments, then store
+        per segment the tree nodes on its path that hold groups, with their cumulative weights.
+        """
+        size = 1
+        while size < count:
+            size *= 2
+        members = {}
+        for gid, (lo, hi, _, _) in enumerate(self.groups):
+            # Leaves of the point segments of lo and hi, both included
+            left = size + 2 * bisect_left(self.boundaries, lo) + 1
+            right = size + 2 * bisect_left(self.boundaries, hi) + 2
+            while left < right:
+                if left & 1:
+                    members.setdefault(left, []).append(gid)
+                    left += 1
+                if right & 1:
+                    right -= 1
+                    members.setdefault(right, []).append(gid)
+                left >>= 1
+                right >>= 1
+        # Node -> (group ids, cumulative weights of those groups)
+        self.nodes = {}
+        for node, group_ids in members.items():
+            cumulative = []
+            total = 0
+            for gid in group_ids:
+                total += self.groups[gid][3][-1]
+                cumulative.append(total)
+            self.nodes[node] = (group_ids, cumulative)
+        self.segments = []
+        for segment in range(count):
+            path = []
+            cumulative = []
+            total = 0
+            node = size + segment
+            while node:
+                held = self.nodes.get(node)
+                if held:
+                    total += held[1][-1]
+                    path.append(node)
+                    cumulative.append(total)
+                node >>= 1
+            self.segments.append((path, cumulative))
+
+    def _segment(self, hunger):
+        i = bisect_left(self.boundaries, hunger)
+        if i < len(self.boundaries) and self.boundaries[i] == hunger:
+            return self.segments[2 * i + 1]
+        return self.segments[2 * i]
+
+    def total_weight(self, hunger):
+        """
+        Return the summed weight of all events whose hunger range includes the given hunger.
+        """
+        cumulative = self._segment(hunger)[1]
+        return cumulative[-1] if cumulative else 0
+
+    def _draw(self, path, cumulative, r):
+        target = r * cumulative[-1]
+        k = min(bisect_right(cumulative, target), len(cumulative) - 1)
+        if k:
+            target -= cumulative[k - 1]
+        group_ids, totals = self.nodes[path[k]]
+        g = min(bisect_right(totals, target), len(totals) - 1)
+        if g:
+            target -= totals[g - 1]
+        gid = group_ids[g]
+        weights = self.groups[gid][3]
+        e = min(bisect_right(weights, target), len(weights) - 1)
+        return gid, e
+
+    def choose(self, state, rng=random, allow=None):
+        """
+        Pick an eligible event for a game state (see conditions.game_state) using rng.random().
+        allow, if given, is an extra filter allow(event) -> bool (e.g. cooldowns).
+        Probabilities are proportional to event weights. Returns None if nothing is eligible.
+        """
+        return self._choose_in(self._segment(state[0]), state, rng, allow)
+
+    def choose_many(self, states, rngs, allows=None):
+        """
+        choose() for several game states at once (e.g. the pets of a household), each with its
+        own rng and optional allow filter. The hunger segment of each distinct hunger value is
+        looked up once for all of them. Returns one event (or None) per state.
+        """
+        segments = {}
+        chosen = []
+        for i, state in enumerate(states):
+            segment = segments.get(state[0])
+            if segment is None:
+                segment = segments[state[0]] = self._segment(state[0])
+            chosen.append(self._choose_in(segment, state, rngs[i], allows[i] if allows else None))
+        return chosen
+
+    def _choose_in(self, segment, state, rng, allow):
+        path, cumulative = segment
+        if not cumulative:
+            return None
+        # Rejection sampling: a draw from the hunger segment that passes its predicate
+        # is distributed exactly as a weighted draw among the fully eligible events
+        for _ in range(self.ATTEMPTS):
+            gid, e = self._draw(path, cumulative, rng.random())
+            predicate = self.predicates[gid][e]
+            ev = self.groups[gid][2][e]
+            if (predicate is None or predicate(state)) and (allow is None or allow(ev)):
+                return ev
+        return self._scan(path, state, rng.random(), allow)
+
+    def _scan(self, path, state, r, allow=None):
+        """
+        Exact weighted choice among the events of a segment whose predicates hold.
+        Used when most of the segment's weight is ruled out by other conditions.
+        """
+        eligible = []
+        total = 0
+        for gid in (gid for node in path for gid in self.nodes[node][0]):
+            _, _, events, weights = self.groups[gid]
+            previous = 0
+            for ev, weight, predicate in zip(events, weights, self.predicates[gid]):
+                if (predicate is None or predicate(state)) and (allow is None or allow(ev)):
+                    total += weight - previous
+                    eligible.append((total, ev))
+                previous = weight
+        if not eligible:
+            return None
+        i = min(bisect_right([c for c, _ in eligible], r * total), len(eligible) - 1)
+        return eligible[i][1]
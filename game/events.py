@@ -1,84 +1,237 @@
 import random
-import json
-import os
 from datetime import datetime
 
+from game.catalog import load_catalog
+from game.conditions import game_state
+from game.effects import EffectBatch
+from game.logbook import LogBook
+from game.timing_wheel import TimingWheel
+from utils.output import emit
+
 class RandomEventSystem:
     """
     Random event system: load event configurations from data/events.json,
     randomly trigger events based on game state and defined weights, and record event logs.
+    Events may also schedule effects over the following game time (repeated stat changes,
+    follow-up events, deadlines that a player action must clear) and have cooldowns.
     """
-    def __init__(self, pet, economy, config_path='data/events.json'):
+    # Chance per tick that an event is considered at all.
+    # The 40% probability here is to balance the pace of the game.
+    CHANCE = 0.4
+    # Callbacks that scheduled timers may hold (see save_state)
+    TIMER_CALLBACKS = ('_run_effect', '_fire_key', '_expire')
+
+    def __init__(self, pet, economy, config_path='data/events.json', log_capacity=500, log_spill=None,
+                 rng=None):
         self.pet = pet
         self.economy = economy
-        # Load event configurations from JSON file
-        path = os.path.join(os.getcwd(), config_path)
+        # Source of randomness (like the random module); a session passes its own stream
+        self.rng = rng or random
+        # Shared, validated event catalog; reloaded in place when the file changes
+        self.catalog = load_catalog(config_path)
+        # Bounded event trigger log: event key and stat deltas per entry, text is formatted on display
+        self.event_log = LogBook(('happiness', 'energy', 'hunger', 'health'),
+                                 capacity=log_capacity, spill_path=log_spill)
+        # Pending effects, follow-ups and deadlines, driven by game time in update()
+        self.wheel = TimingWheel()
+        self.cooldowns = {}     # event key -> game time at which it may trigger again
+        self.deadlines = {}     # event key -> (clearing action, Timer) of its pending deadline
+        self.batch = None       # Collects stat effects while a tick is running
+        self.metrics = None     # With a Metrics object, fired events are counted
+        self._batch = EffectBatch()     # Reused every tick (applying it empties it)
+
+    @property
+    def events(self):
+        return self.catalog.current.events
+
+    @property
+    def index(self):
+        return self.catalog.current.index
+
+    def tick(self, delta):
+        """
+        One game tick: advance game time by delta seconds, running the scheduled effects that
+        came due, and maybe trigger a random event. The stat changes of all of them are
+        summed and applied together at the end.
+        """
+        self.batch = self._batch
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                self.events = json.load(f)
-        except Exception as e:
-            print(f"Failed to load event configurations: {e}")
-            self.events = []
-        # Initialize event trigger log
-        self.event_log = []
+            self.wheel.advance(delta)
+            self.trigger()
+        finally:
+            batch, self.batch = self.batch, None
+            batch.apply(self.pet, self.economy)
+
+    @staticmethod
+    def tick_many(systems, delta):
+        """
+        tick() for the event systems of several pets sharing one catalog (a household), in one
+        pass: each advances its scheduled effects, then the chance draws and the event choices
+        of all of them are made together with EventIndex.choose_many. Every system keeps its
+        own random stream, so with a single system this is exactly tick().
+        """
+        for system in systems:
+            system.batch = system._batch
+        try:
+            for system in systems:
+                system.wheel.advance(delta)
+            picked = [system for system in systems if system.rng.random() <= system.CHANCE]
+            if picked:
+                states = [game_state(system.pet, system.economy) for system in picked]
+                allows = [system._ready if system.cooldowns else None for system in picked]
+                chosen = picked[0].index.choose_many(states, [system.rng for system in picked], allows)
+                for system, ev in zip(picked, chosen):
+                    if ev is not None:
+                        system.fire(ev)
+        finally:
+            for system in systems:
+                batch, system.batch = system.batch, None
+                batch.apply(system.pet, system.economy)
+
+    def _emit(self, effect):
+        if self.batch is not None:
+            self.batch.add(effect)
+        else:
+            effect.apply(self.pet, self.economy)
 
     def trigger(self):
 
-        # Chance filter: only continue with a 40% probability.
-        # The 40% probability here is to balance the pace of the game.
-        if random.random() > 0.4:
+        # Chance filter: only continue with a 40% probability (see CHANCE).
+        if self.rng.random() > self.CHANCE:
             return
 
-        # Filter events by condition and build weighted candidate list
-        candidates = []
-        for ev in self.events:
-            cond = ev.get('condition', {})
-            min_h = cond.get('min_hunger', 0)
-            max_h = cond.get('max_hunger', 100)
-            if min_h <= self.pet.hunger <= max_h:
-                weight = ev.get('weight', 1)
-                candidates.extend([ev] * weight)
-        if not candidates:
+        # Weighted choice among the events whose condition matches the current state
+        # and that are not cooling down
+        allow = self._ready if self.cooldowns else None
+        ev = self.index.choose(game_state(self.pet, self.economy), self.rng, allow)
+        if ev is None:
             return
-        ev = random.choice(candidates)
-
-        # Extract attribute deltas
-        delta_h = ev.get('happiness', 0)
-        delta_e = ev.get('energy', 0)
-        delta_g = ev.get('hunger', 0)
-        delta_c = ev.get('coins', 0)
-        delta_health = ev.get('health', 0)
-
-        # Adjust coins
-        if delta_c:
-            if delta_c > 0:
-                self.economy.earn(delta_c)
-            else:
-                self.economy.spend(-delta_c)
-
-        # Adjust other attributes with clamping to [0,100]
-        self.pet.happiness = min(100, max(0, self.pet.happiness + delta_h))
-        self.pet.energy    = min(100, max(0, self.pet.energy + delta_e))
-        self.pet.hunger    = min(100, max(0, self.pet.hunger + delta_g))
-        self.pet.health    = min(100, max(0, self.pet.health + delta_health))
-
-        # Format and print event text
+        self.fire(ev)
+
+    def _ready(self, ev):
+        return self.cooldowns.get(ev['key'], 0) <= self.wheel.now
+
+    def fire(self, ev):
+        """
+        Apply an event now, log it, and schedule its effects, follow-up and deadline.
+        """
+        effect = ev['stat_effect']
+        self._emit(effect)
+
+        # Format and show event text
         text = ev.get('text', '').format(pet_name=self.pet.name)
-        print(f"[Event] {text}")
+        emit(f"[Event] {text}", 'event')
 
         # Record the event in the log
-        self.event_log.append({
-            'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'key': ev.get('key'),
-            'text': text,
-            'happiness_change': delta_h,
-            'energy_change': delta_e,
-            'hunger_change': delta_g,
-            'health_change': delta_health
-        })
+        self.event_log.append(ev.get('key'), effect.happiness, effect.energy, effect.hunger, effect.health)
+        if self.metrics:
+            self.metrics.incr('events_fired')
+
+        now = self.wheel.now
+        if ev.get('cooldown'):
+            self.cooldowns[ev['key']] = now + ev['cooldown']
+        for i, effect in enumerate(ev.get('effects', ())):
+            self.wheel.schedule(effect.get('delay', 0), self._run_effect, ev['key'], i, effect.get('times', 1))
+        followup = ev.get('followup')
+        if followup:
+            self.wheel.schedule(followup.get('delay', 0), self._fire_key, followup['event'])
+        deadline = ev.get('deadline')
+        if deadline:
+            pending = self.deadlines.pop(ev['key'], None)
+            if pending:
+                pending[1].cancel()
+            timer = self.wheel.schedule(deadline['seconds'], self._expire, ev['key'])
+            self.deadlines[ev['key']] = (deadline.get('cleared_by'), timer)
 
-    def get_log(self):
+    # Timers only hold event keys and numbers: the event is looked up when due, so a reloaded
+    # catalog's version of it is used, and pending timers can be saved (see save_state)
+
+    def _run_effect(self, key, index, remaining):
+        ev = self.index.by_key.get(key)
+        effects = ev.get('effects', ()) if ev else ()
+        if index >= len(effects):
+            return
+        effect = effects[index]
+        self._emit(effect['stat_effect'])
+        if effect.get('text'):
+            emit(f"[Event] {effect['text'].format(pet_name=self.pet.name)}", 'event')
+        if remaining > 1:
+            self.wheel.schedule(effect.get('every', 0), self._run_effect, key, index, remaining - 1)
+
+    def _fire_key(self, key):
+        ev = self.index.by_key.get(key)
+        if ev is not None:
+            self.fire(ev)
+
+    def _expire(self, key):
+        del self.deadlines[key]
+        ev = self.index.by_key.get(key)
+        deadline = ev.get('deadline') if ev else None
+        if deadline:
+            self._fire_key(deadline['event'])
+
+    def save_state(self):
+        """
+        The game time, pending timers (effects, follow-ups, deadlines) and cooldowns as plain
+        data, for a saved game (see load_state).
+        """
+        return {
+            'slot': self.wheel.slot,
+            'elapsed': self.wheel.elapsed,
+            'timers': [[timer.expires, timer.callback.__name__, *timer.args] for timer in self.wheel.timers()],
+            'cooldowns': self.cooldowns,
+            'deadlines': {key: cleared_by for key, (cleared_by, _) in self.deadlines.items()},
+        }
+
+    def load_state(self, state):
+        """
+        Continue from save_state() data, in place of anything pending now.
         """
-        Return a list of logged events that have been triggered.
+        self.wheel = wheel = TimingWheel(self.wheel.resolution, self.wheel.size, self.wheel.levels)
+        wheel.slot, wheel.elapsed = state['slot'], state['elapsed']
+        self.cooldowns = dict(state['cooldowns'])
+        self.deadlines = {}
+        for expires, name, *args in state['timers']:
+            if name not in self.TIMER_CALLBACKS:
+                continue
+            timer = wheel.at(expires, getattr(self, name), *args)
+            if name == '_expire':
+                self.deadlines[args[0]] = (state['deadlines'].get(args[0]), timer)
+
+    def resolve(self, action):
+        """
+        A player action (e.g. 'vet') happened: cancel the pending deadlines it clears.
+        """
+        for key, (cleared_by, timer) in list(self.deadlines.items()):
+            if cleared_by == action:
+                timer.cancel()
+                del self.deadlines[key]
+                ev = self.index.by_key.get(key)
+                text = ev['deadline'].get('cleared_text') if ev else None
+                if text:
+                    emit(f"[Event] {text.format(pet_name=self.pet.name)}", 'event')
+
+    def get_log(self, page=1, per_page=10, key=None):
+        """
+        Return (entries, page_count) for one page of logged events, newest first,
+        optionally only events with the given key. Entries are formatted for display here.
         """
-        return list(self.event_log)
+        records, pages = self.event_log.query(key, page, per_page)
+        return [self.format_entry(r) for r in records], pages
+
+    def format_entry(self, record):
+        """
+        Turn a compact log record into the dict shown by the events command.
+        """
+        _, when, key, (happ, energy, hunger, health) = record
+        ev = self.index.by_key.get(key)
+        text = ev.get('text', '').format(pet_name=self.pet.name) if ev else key
+        return {
+            'time': datetime.fromtimestamp(when).strftime('%Y-%m-%d %H:%M:%S'),
+            'key': key,
+            'text': text,
+            'happiness_change': happ,
+            'energy_change': energy,
+            'hunger_change': hunger,
+            'health_change': health
+        }
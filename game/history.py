@@ -0,0 +1,230 @@
+import csv
+import json
+from array import array
+
+from game.logbook import LogBook
+
+# Recorded stats, in the order of every sample
+FIELDS = ('hunger', 'happiness', 'energy', 'health')
+# Danger zones whose entry is logged as an alert (hunger >= 80, happiness <= 20, energy 0,
+# health < 30): the thresholds that start Pet.update's failure timers
+ZONES = ('hunger_high', 'happiness_low', 'energy_empty', 'health_low')
+
+class _Ring:
+    """
+    Fixed-capacity ring of rows: start and end time, number of raw samples, and one number
+    per column. Columns are separate typed arrays, so a run of rows is a cheap slice.
+    """
+    def __init__(self, columns, capacity):
+        self.capacity = capacity
+        self.starts = array('d')
+        self.ends = array('d')
+        self.samples = array('I')
+        self.columns = [array('f') for _ in range(columns)]
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def add(self, start, end, samples, values):
+        slot = self.total % self.capacity
+        if slot == len(self.starts):
+            self.starts.append(start)
+            self.ends.append(end)
+            self.samples.append(samples)
+            for column, value in zip(self.columns, values):
+                column.append(value)
+        else:
+            self.starts[slot] = start
+            self.ends[slot] = end
+            self.samples[slot] = samples
+            for column, value in zip(self.columns, values):
+                column[slot] = value
+        self.total += 1
+
+    def newest(self, count):
+        """
+        Return the slots [a, b) of the newest count rows; they are contiguous because
+        rows are only ever rolled up in aligned runs (see StatHistory).
+        """
+        b = (self.total - 1) % self.capacity + 1
+        return b - count, b
+
+    def held(self):
+        """
+        Iterate (start, end, samples, values) of the rows still held, newest first.
+        """
+        columns = self.columns
+        for n in range(self.total - 1, self.total - len(self) - 1, -1):
+            slot = n % self.capacity
+            yield (self.starts[slot], self.ends[slot], self.samples[slot],
+                   tuple(column[slot] for column in columns))
+
+class StatHistory:
+    """
+    Bounded time series of one pet's stats, one sample per game tick.
+    The newest raw samples are kept as they are; older ones survive as summary buckets
+    (min, mean and max of every stat) in levels that are each factor times coarser than
+    the one before: with the defaults, the last 120 ticks exactly, then buckets of 10,
+    100, 1000 and 10000 ticks, 60 of each (600,000 ticks, about two months of normal play),
+    in about 33 KB. Every level is a fixed ring, so memory is constant however long the
+    session runs. A sample is only written to
+    the raw ring; every factor samples the newest run of them is rolled up into one bucket
+    of the next level (and so on up), so the summaries cost little per tick.
+    Entering a danger zone (the thresholds of Pet.update's failure timers) and the pet's
+    failure are also logged, to explain how the game was lost.
+    """
+    def __init__(self, raw=120, buckets=60, factor=10, levels=4):
+        if raw % factor or buckets % factor:
+            raise ValueError("raw and buckets must be multiples of factor")
+        self.factor = factor
+        self.raw = _Ring(len(FIELDS), raw)
+        self.levels = [_Ring(3 * len(FIELDS), buckets) for _ in range(levels)]
+        self.alerts = LogBook(('value',), capacity=64)
+        self._zones = (False,) * len(ZONES)
+        self._failed = False
+
+    @property
+    def total(self):
+        """
+        Samples ever recorded.
+        """
+        return self.raw.total
+
+    def append(self, when, pet):
+        """
+        Record the stats of pet at game time when (seconds).
+        """
+        hunger, happiness, energy, health = values = (pet.hunger, pet.happiness, pet.energy, pet.health)
+        raw = self.raw
+        slot = raw.total % raw.capacity
+        if slot < len(raw.starts):
+            # The ring is full: overwrite in place (sample counts stay 1)
+            raw.starts[slot] = raw.ends[slot] = when
+            columns = raw.columns
+            columns[0][slot] = hunger
+            columns[1][slot] = happiness
+            columns[2][slot] = energy
+            columns[3][slot] = health
+            raw.total += 1
+        else:
+            raw.add(when, when, 1, values)
+        if pet.failure_reason:
+            # Failing zeroes health; log the reason rather than that
+            if not self._failed:
+                self.alerts.append(f'failed:{pet.failure_reason}', 0, when=when)
+                self._failed = True
+        else:
+            entered = (hunger >= 80, happiness <= 20, energy <= 0, health < 30)
+            if entered != self._zones:
+                for label, value, now, before in zip(ZONES, values, entered, self._zones):
+                    if now and not before:
+                        self.alerts.append(label, round(value), when=when)
+                self._zones = entered
+        if raw.total % self.factor == 0 and self.levels:
+            self._roll(0)
+
+    def _roll(self, k):
+        """
+        Summarize the newest factor rows of the level below k into one bucket of level k.
+        """
+        source = self.levels[k - 1] if k else self.raw
+        factor = self.factor
+        a, b = source.newest(factor)
+        values = []
+        columns = source.columns
+        if k:
+            # Buckets of one level all summarize the same number of samples,
+            # so the mean of their means is the mean of the samples
+            for i in range(0, len(columns), 3):
+                values += (min(columns[i][a:b]), sum(columns[i + 1][a:b]) / factor,
+                           max(columns[i + 2][a:b]))
+        else:
+            for column in columns:
+                run = column[a:b]
+                values += (min(run), sum(run) / factor, max(run))
+        level = self.levels[k]
+        level.add(source.starts[a], source.ends[b - 1], factor ** (k + 1), values)
+        if k + 1 < len(self.levels) and level.total % self.factor == 0:
+            self._roll(k + 1)
+
+    def _raw_rows(self):
+        for start, end, samples, values in self.raw.held():
+            yield start, end, samples, tuple(v for value in values for v in (value, value, value))
+
+    def series(self, since=None):
+        """
+        Return everything held as [(start, end, samples, values)], oldest first, where values
+        holds (min, mean, max) per field. Recent rows are raw samples (start == end), older
+        rows come from ever coarser levels, and no two rows overlap. With since, rows that
+        ended before that game time are left out.
+        """
+        rows = []
+        cutoff = float('inf')
+        for source in [self._raw_rows()] + [level.held() for level in self.levels]:
+            oldest = cutoff
+            for row in source:
+                if since is not None and row[1] < since:
+                    break
+                if row[1] < cutoff:
+                    rows.append(row)
+                oldest = row[0]
+            cutoff = min(cutoff, oldest)
+        rows.reverse()
+        return rows
+
+    def last_time(self):
+        raw = self.raw
+        return raw.ends[(raw.total - 1) % raw.capacity] if raw.total else 0.0
+
+    def columns(self, since=None, width=60):
+        """
+        Resample series(since) onto at most width equal spans of game time, for display.
+        Returns (start time, {field: [mean per column, None where nothing was recorded]},
+        {field: (min, max)}).
+        """
+        rows = self.series(since)
+        if not rows:
+            return None, {}, {}
+        start, end = rows[0][0], rows[-1][1]
+        width = min(width, len(rows))
+        scale = width / ((end - start) or 1)
+        sums = [[0.0] * width for _ in FIELDS]
+        weights = [0] * width
+        low = [float('inf')] * len(FIELDS)
+        high = [float('-inf')] * len(FIELDS)
+        for first, last, samples, values in rows:
+            column = min(int(((first + last) / 2 - start) * scale), width - 1)
+            weights[column] += samples
+            for i in range(len(FIELDS)):
+                sums[i][column] += values[3 * i + 1] * samples
+                low[i] = min(low[i], values[3 * i])
+                high[i] = max(high[i], values[3 * i + 2])
+        means = {field: [s / w if w else None for s, w in zip(sums[i], weights)]
+                 for i, field in enumerate(FIELDS)}
+        ranges = {field: (low[i], high[i]) for i, field in enumerate(FIELDS)}
+        return start, means, ranges
+
+    def export(self, path):
+        """
+        Write series() to path as CSV (one column per field and statistic) or, for a .json
+        path, as an object of rows and alerts.
+        """
+        rows = self.series()
+        columns = [f'{field}_{stat}' for field in FIELDS for stat in ('min', 'mean', 'max')]
+        if path.endswith('.json'):
+            data = {
+                'rows': [dict(start=start, end=end, samples=samples,
+                              **{c: round(v, 3) for c, v in zip(columns, values)})
+                         for start, end, samples, values in rows],
+                'alerts': [{'time': when, 'alert': label, 'value': value[0]}
+                           for _, when, label, value in self.alerts.since(0)],
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1)
+            return
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['start', 'end', 'samples'] + columns)
+            for start, end, samples, values in rows:
+                writer.writerow([start, end, samples] + [round(v, 3) for v in values])
@@ -0,0 +1,98 @@
+from game.events import RandomEventSystem
+from game.history import StatHistory
+from game.interaction import InteractionSystem
+from game.pet import Pet
+from game.travel import TravelSystem
+from game.veterinary import Veterinary
+
+class Member:
+    """
+    One pet of a household together with the systems that act on it.
+    """
+    __slots__ = ('pet', 'events', 'travel', 'interact', 'vet', 'history')
+
+    def __init__(self, pet, events, travel, interact, vet, history):
+        self.pet = pet
+        self.events = events
+        self.travel = travel
+        self.interact = interact
+        self.vet = vet
+        self.history = history
+
+class Household:
+    """
+    The pets of one player, sharing one Economy (coins and feed stock).
+    Every pet has its own random events (with their scheduled effects and cooldowns), travel
+    memories, event log and stat history. One tick updates all living pets and runs their
+    events in a single pass (see RandomEventSystem.tick_many), so a household needs no
+    thread per pet; then each pet's stats are added to its history.
+    """
+    def __init__(self, economy, streams, history=StatHistory):
+        """
+        economy is shared by all pets; streams is the session's RandomStreams;
+        history() makes the StatHistory of each pet.
+        """
+        self.economy = economy
+        self.streams = streams
+        self.history = history
+        self.metrics = None     # Given to the event system of every pet (see TextUI._instrument)
+        self.members = []
+        self.by_name = {}
+        self.now = 0.0      # Game time in seconds: the sum of the tick deltas
+
+    def __len__(self):
+        return len(self.members)
+
+    def __iter__(self):
+        return iter(self.members)
+
+    def adopt(self, name):
+        """
+        Add a pet and return its Member. Names are unique, ignoring case.
+        """
+        if name.lower() in self.by_name:
+            raise ValueError(f"There is already a pet called {name}.")
+        # The first pet keeps the plain stream names, so single-pet sessions stay reproducible
+        suffix = f'.{len(self.members)}' if self.members else ''
+        pet = Pet(name)
+        member = Member(
+            pet,
+            RandomEventSystem(pet, self.economy, rng=self.streams.stream('events' + suffix)),
+            TravelSystem(pet, rng=self.streams.stream('travel' + suffix)),
+            InteractionSystem(pet, self.economy),
+            Veterinary(pet, self.economy),
+            self.history(),
+        )
+        member.events.metrics = self.metrics
+        self.members.append(member)
+        self.by_name[name.lower()] = member
+        return member
+
+    def get(self, name):
+        """
+        Return the Member of the named pet (ignoring case), or None.
+        """
+        return self.by_name.get(name.lower())
+
+    def living(self):
+        return [member for member in self.members if member.pet.is_alive()]
+
+    def update_pets(self, members, delta):
+        for member in members:
+            member.pet.update(delta)
+
+    def run_events(self, members, delta):
+        RandomEventSystem.tick_many([member.events for member in members], delta)
+
+    def tick(self, delta):
+        """
+        Advance every pet alive at the start of the tick by delta seconds, then run their events.
+        Returns the members that were ticked.
+        """
+        members = self.living()
+        self.update_pets(members, delta)
+        self.run_events(members, delta)
+        self.now += delta
+        for member in members:
+            member.history.append(self.now, member.pet)
+        return members
@@ -0,0 +1,138 @@
+import os
+import struct
+import time
+from array import array
+
+class LogBook:
+    """
+    Bounded history of compact records, used for the event log and travel memories.
+    Each record is an epoch timestamp, an interned label (event key or location key) and a few
+    small integers (e.g. stat deltas), stored in flat typed arrays used as a ring buffer.
+    Once capacity records are held, the oldest is overwritten; if spill_path is set it is
+    appended to that file first, so the full history can still be read back with archived().
+    The file stays open (buffered) until close().
+    Display text is not stored: callers format records only when they are shown.
+    """
+    def __init__(self, fields, capacity=500, spill_path=None):
+        """
+        fields: names of the integer values stored with each record.
+        """
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self.spill_path = spill_path
+        # Arrays grow up to capacity on demand, so an unused log costs almost nothing
+        self._times = array('d')
+        self._labels = array('H')
+        self._values = array('h')
+        self._spill = struct.Struct(f'<d{len(self.fields)}h')
+        self._spill_file = None     # Opened on the first spilled record
+        self.label_names = []
+        self._label_ids = {}
+        self.total = 0      # Records ever appended; record n has sequence number n
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def intern(self, label):
+        """
+        Return the small integer id of a label, assigning one on first use.
+        """
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = len(self.label_names)
+            self.label_names.append(label)
+            self._label_ids[label] = label_id
+        return label_id
+
+    def append(self, label, *values, when=None):
+        """
+        Add a record; values must match fields in order. Returns its sequence number.
+        """
+        slot = self.total % self.capacity
+        if self.total >= self.capacity and self.spill_path:
+            self._spill_slot(slot)
+        when = time.time() if when is None else when
+        if slot == len(self._times):
+            self._times.append(when)
+            self._labels.append(self.intern(label))
+            self._values.extend(values)
+        else:
+            width = len(self.fields)
+            self._times[slot] = when
+            self._labels[slot] = self.intern(label)
+            self._values[slot * width:(slot + 1) * width] = array('h', values)
+        self.total += 1
+        return self.total - 1
+
+    def _spill_slot(self, slot):
+        width = len(self.fields)
+        record = self._spill.pack(self._times[slot], *self._values[slot * width:(slot + 1) * width])
+        if self._spill_file is None:
+            self._spill_file = open(self.spill_path, 'ab')
+        # Labels are written by name so the file does not depend on this process's interning
+        self._spill_file.write(record + self.label_names[self._labels[slot]].encode('utf-8') + b'\n')
+
+    def get(self, seq):
+        """
+        Return (seq, time, label, values) for a record still held in memory.
+        """
+        if not self.total - len(self) <= seq < self.total:
+            raise IndexError("record is no longer held in memory")
+        slot = seq % self.capacity
+        width = len(self.fields)
+        return (seq, self._times[slot], self.label_names[self._labels[slot]],
+                tuple(self._values[slot * width:(slot + 1) * width]))
+
+    def since(self, seq):
+        """
+        Iterate the records with sequence number >= seq that are still held, oldest first.
+        """
+        for n in range(max(seq, self.total - len(self)), self.total):
+            yield self.get(n)
+
+    def query(self, label=None, page=1, per_page=10):
+        """
+        Return (records, page_count) for one page of the held records, newest first,
+        optionally only those with the given label.
+        """
+        label_id = self._label_ids.get(label) if label is not None else None
+        if label is not None and label_id is None:
+            return [], 0
+        start = self.total - len(self)
+        if label_id is None:
+            seqs = range(self.total - 1, start - 1, -1)
+        else:
+            seqs = [n for n in range(self.total - 1, start - 1, -1)
+                    if self._labels[n % self.capacity] == label_id]
+        page_count = (len(seqs) + per_page - 1) // per_page
+        chosen = seqs[(page - 1) * per_page:page * per_page] if page >= 1 else []
+        return [self.get(n) for n in chosen], page_count
+
+    def archived(self):
+        """
+        Iterate (time, label, values) for records spilled to disk, oldest first.
+        """
+        if self._spill_file is not None:
+            self._spill_file.flush()
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        with open(self.spill_path, 'rb') as f:
+            while True:
+                head = f.read(self._spill.size)
+                if len(head) < self._spill.size:
+                    return
+                when, *values = self._spill.unpack(head)
+                label = f.readline().rstrip(b'\n').decode('utf-8')
+                yield when, label, tuple(values)
+
+    def close(self):
+        """
+        Write out and close the spill file (it is opened again if more records spill).
+        """
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def clear(self):
+        self.total = 0
+        del self._times[:], self._labels[:], self._values[:]
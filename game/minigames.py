@@ -1,30 +1,140 @@
 import random
+import sys
 import time
 
+from game.arithmetic import TIERS, generate
+from game.scheduler import MonotonicClock
+from utils.helpers import supports_ansi
+
+class Wait:
+    """
+    Step request from a minigame: pause for the given number of seconds.
+    """
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+class Ask:
+    """
+    Step request from a minigame: show a prompt and send back the player's input line.
+    answer is the reply that wins, for bots and tests; it is never shown to the player.
+    """
+    def __init__(self, prompt, answer=None):
+        self.prompt = prompt
+        self.answer = answer
+
+class Clear:
+    """
+    Step request from a minigame: hide what was shown so far (e.g. a sequence to memorize).
+    """
+
+def clear_screen():
+    """
+    Clear a terminal with ANSI codes. Other outputs (pipes, sockets, classic Windows consoles)
+    get blank lines instead, which push what was shown out of view.
+    """
+    if supports_ansi(sys.stdout):
+        sys.stdout.write("\x1b[2J\x1b[H")
+    else:
+        sys.stdout.write("\n" * 50)
+
+def run_steps(steps, read=input, sleep=time.sleep):
+    """
+    Drive a minigame's steps() generator with blocking sleep and read (time.sleep and input).
+    Other runtimes drive the same generator their own way: the asyncio UI awaits waits and
+    prompts on its loop, and run_headless() answers with a bot against a virtual clock.
+    """
+    reply = None
+    try:
+        while True:
+            request = steps.send(reply)
+            reply = None
+            if isinstance(request, Wait):
+                sleep(request.seconds)
+            elif isinstance(request, Clear):
+                clear_screen()
+            else:
+                reply = read(request.prompt)
+    except StopIteration:
+        pass
+
+def run_headless(steps, bot, clock):
+    """
+    Drive a steps() generator without a player: waits advance the VirtualClock the game was
+    built with, and each Ask is answered by bot(request) -> (reply, seconds taken to answer).
+    Nothing sleeps, so bots can play thousands of rounds per second.
+    """
+    reply = None
+    try:
+        while True:
+            request = steps.send(reply)
+            reply = None
+            if isinstance(request, Wait):
+                clock.time += request.seconds
+            elif isinstance(request, Ask):
+                reply, seconds = bot(request)
+                clock.time += seconds
+    except StopIteration:
+        pass
+
+class Bot:
+    """
+    A simulated player: answers a prompt correctly with probability accuracy, after a
+    uniformly random think time between low and high seconds.
+    """
+    def __init__(self, accuracy, low, high, rng):
+        self.accuracy = accuracy
+        self.low = low
+        self.high = high
+        self.rng = rng
+
+    def __call__(self, request):
+        seconds = self.rng.uniform(self.low, self.high)
+        if request.answer is not None and self.rng.random() < self.accuracy:
+            return request.answer, seconds
+        return '?', seconds
+
+# Bot skill levels: (accuracy, think time range in seconds)
+BOTS = {
+    'novice': (0.5, 0.4, 1.2),
+    'casual': (0.8, 0.25, 0.6),
+    'expert': (1.0, 0.15, 0.3),
+}
+
 class ReactionGame:
     """
     Reaction Speed Minigame: The system generates a random delay and then
     measures the reaction time of the player to press Enter.
     """
-    def __init__(self, economy):
+    def __init__(self, economy, clock=None, rng=None):
         """
         Initialize the reaction game with the economy system.
+        clock (with a now() method) and rng (like the random module) default to real time
+        and the global random generator; bots pass a VirtualClock and a seeded Random.
         """
         self.economy = economy
+        self.clock = clock or MonotonicClock()
+        self.rng = rng or random
 
-    def play(self):
+    def play(self, read=input, sleep=time.sleep):
         """
         How to play the reaction game:
             1, wait for a random delay of 1 to 3 seconds.
             2, The system will prompt the player to press Enter.
             3, The system calculates the player's reaction time and awards coins according to the speed.
+        Input and waits go through read and sleep (input and time.sleep by default).
+        """
+        run_steps(self.steps(), read, sleep)
+
+    def steps(self):
+        """
+        The game as a generator of Wait / Ask requests; see play() for the rules.
         """
-        delay = random.uniform(1, 3)
+        delay = self.rng.uniform(1, 3)
         print("Get ready...")
-        time.sleep(delay)
-        start = time.time()
-        input("Press Enter to start!")
-        rt = time.time() - start
+        yield Wait(delay)
+        start = self.clock.now()
+        yield Ask("Press Enter to start!", answer='')
+        rt = self.clock.now() - start
         reward = max(1, int((1.5 - rt) * 10))
         self.economy.earn(reward)
         print(f"Reaction time: {rt:.3f}s. Coins earned: {reward}")
@@ -35,23 +145,32 @@ class MemoryGame:
     The system displays a random 5-digit sequence, which is hidden after a few seconds,
     and the player needs to enter the correct sequence to get the coins.
     """
-    def __init__(self, economy):
+    def __init__(self, economy, clock=None, rng=None):
         """
-        Initialize the memory game with the economy system.
+        Initialize the memory game with the economy system (clock / rng as in ReactionGame).
         """
         self.economy = economy
+        self.clock = clock or MonotonicClock()
+        self.rng = rng or random
 
-    def play(self):
+    def play(self, read=input, sleep=time.sleep):
         """
         How to play the memory game:
             1, The system displays a sequence of 5 random numbers and waits 2 seconds before clearing the screen.
             2, The player needs to enter a space-separated sequence, and if it is correct, 20 coins will be awarded.
         """
-        seq = [random.randint(0, 9) for _ in range(5)]
+        run_steps(self.steps(), read, sleep)
+
+    def steps(self):
+        """
+        The game as a generator of Wait / Ask requests; see play() for the rules.
+        """
+        seq = [self.rng.randint(0, 9) for _ in range(5)]
         print("Memorize the sequence:", seq)
-        time.sleep(2)
-        print("\n" * 50)
-        guess = input("Enter the sequence, separated by spaces: ").split()
+        yield Wait(2)
+        yield Clear()
+        answer = ' '.join(map(str, seq))
+        guess = (yield Ask("Enter the sequence, separated by spaces: ", answer)).split()
         success = guess == list(map(str, seq))
         reward = 20 if success else 0
         if success:
@@ -63,62 +182,78 @@ class MathQuizGame:
     Arithmetic Challenge Minigame:
     The system asks a series of arithmetic questions, and correct answers are rewarded with coins.
     """
-    def __init__(self, economy, questions=5):
+    def __init__(self, economy, questions=5, clock=None, rng=None, tier='normal'):
         """
-        Initialize the math quiz game.
+        Initialize the math quiz game (clock / rng as in ReactionGame).
+        tier names a difficulty in arithmetic.TIERS: operators, operand range, number of terms
+        and coins per correct answer.
         """
         self.economy = economy
         self.questions = questions
-        self.ops = ['+', '-', '*']
+        self.clock = clock or MonotonicClock()
+        self.rng = rng or random
+        self.tier = TIERS[tier]
 
-    def play(self):
+    def play(self, read=input, sleep=time.sleep):
         """
         How to play the math quiz game:
             1, the system asks for a series of arithmetic expressions and the screen clears after 2 seconds.
-            2, Players give their answers. Each correct answer awards 5 coins.
+            2, Players give their answers. Each correct answer awards coins (5, or 8 on the hard tier).
+        """
+        run_steps(self.steps(), read, sleep)
+
+    def steps(self):
+        """
+        The game as a generator of Wait / Ask requests; see play() for the rules.
         """
         correct = 0
-        for i in range(1, self.questions + 1):
-            a = random.randint(1, 20)
-            b = random.randint(1, 20)
-            op = random.choice(self.ops)
-            expr = f"{a} {op} {b}"
-            ans = eval(expr)
+        reward = self.tier.reward
+        # The whole round is generated (and answered) up front
+        for i, question in enumerate(generate(self.tier, self.questions, self.rng), 1):
+            ans = question.answer
             try:
-                user = int(input(f"Question {i}: {expr} = "))
+                user = int((yield Ask(f"Question {i}: {question.text} = ", str(ans))))
             except ValueError:
                 print("Invalid input, counted as incorrect.")
                 continue
             if user == ans:
-                print("√ Correct! +5 coins")
-                self.economy.earn(5)
+                print(f"√ Correct! +{reward} coins")
+                self.economy.earn(reward)
                 correct += 1
             else:
                 print(f"× Incorrect, the correct answer is {ans}")
-        print(f"You answered {correct}/{self.questions} correctly, and earned {correct * 5} coins.")
+        print(f"You answered {correct}/{self.questions} correctly, and earned {correct * reward} coins.")
 
 class WordScrambleGame:
     """
     Word Scramble Minigame:
     The system gives a garbled word and the player finds the correct order of the letters.
     """
-    def __init__(self, economy, words=None):
+    def __init__(self, economy, words=None, clock=None, rng=None):
         """
-        Initialize the word scramble game.
+        Initialize the word scramble game (clock / rng as in ReactionGame).
         """
         self.economy = economy
         self.words = words or ["parrot", "python", "gaming", "memory", "challenge"]
+        self.clock = clock or MonotonicClock()
+        self.rng = rng or random
 
-    def play(self):
+    def play(self, read=input, sleep=time.sleep):
         """
         How to play the word scramble game:
             1, The system randomly selects a word and spells its letters.
             2, The player enters the word in the correct order and receives 10 coins for correctly guessing the word.
         """
-        word = random.choice(self.words)
-        scrambled = ''.join(random.sample(word, len(word)))
+        run_steps(self.steps(), read, sleep)
+
+    def steps(self):
+        """
+        The game as a generator of Wait / Ask requests; see play() for the rules.
+        """
+        word = self.rng.choice(self.words)
+        scrambled = ''.join(self.rng.sample(word, len(word)))
         print(f"Unscramble the word: {scrambled}")
-        guess = input("Your guess: ").strip().lower()
+        guess = (yield Ask("Your guess: ", word)).strip().lower()
         if guess == word:
             print("√ Success! +10 coins")
             self.economy.earn(10)
@@ -0,0 +1,399 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+# Snapshot slot: sequence number, coins / feed / price, journal length at save time,
+# difficulty, name of the first pet and the length of the state that follows (see
+# _encode_state), then the state, a CRC32 of the header and the state, and unused space up
+# to the capacity of the slot
+SNAPSHOT = struct.Struct('<QqqqQ8s48sI')
+CRC = struct.Struct('<I')
+SNAPSHOT_MAGIC = b'PPSNAP2\n'
+# After the magic: the state capacity of both slots, raised (by rewriting the file) when a
+# state does not fit, e.g. after adopting pets
+CAPACITY = struct.Struct('<I')
+MIN_CAPACITY = 16 * 1024
+
+# State: length of its JSON part and number of random streams, the JSON, then the
+# Mersenne Twister words of every stream (in the order the JSON lists the streams)
+STATE_HEAD = struct.Struct('<II')
+MT_STATE = struct.Struct('<625I')
+
+# Journal record: header (payload length, kind, epoch time), payload, trailing payload length.
+# The trailing length lets the journal be read backwards from the end.
+RECORD_HEAD = struct.Struct('<IBd')
+RECORD_TAIL = struct.Struct('<I')
+# Event and travel records: the household index of the pet and the integer values of the
+# record (LogBook fields), zero padded, then the label
+DELTA_FIELDS = 5
+DELTAS = struct.Struct(f'<H{DELTA_FIELDS}h')
+
+COMMAND = 1
+EVENT = 2
+TRAVEL = 3
+
+PET_FIELDS = ('hunger', 'happiness', 'energy', 'health',
+              'hunger_timer', 'unhappy_timer', 'neglect_timer')
+
+class Snapshot:
+    """
+    State of one game: economy and difficulty in fixed fields, and the household, pending
+    event timers and random streams in state (a dict, see _encode_state).
+    """
+    def __init__(self, seq, coins, feed_stock, buy_price, journal_size, difficulty, name, state):
+        self.seq = seq
+        self.coins = coins
+        self.feed_stock = feed_stock
+        self.buy_price = buy_price
+        self.journal_size = journal_size
+        self.difficulty = difficulty
+        self.name = name
+        self.state = state
+
+def _encode_text(text, size):
+    return text.encode('utf-8')[:size]
+
+def _encode_state(ui, recorded):
+    """
+    Everything of a game beyond the fixed snapshot fields: every pet of the household with its
+    pending event timers, deadlines and cooldowns, the game time, which pet is active, the
+    number of journaled history records per pet and the state of every random stream.
+    """
+    household = ui.household
+    seed, streams = ui.random.getstate()
+    names = list(streams)
+    data = {
+        'seed': seed,
+        'now': household.now,
+        'active': household.members.index(ui.member),
+        'pets': [{
+            'name': member.pet.name,
+            'stats': [getattr(member.pet, f) for f in PET_FIELDS],
+            'failure_reason': member.pet.failure_reason,
+            'events': recorded.get((EVENT, i), 0),
+            'memories': recorded.get((TRAVEL, i), 0),
+            'pending': member.events.save_state(),
+        } for i, member in enumerate(household)],
+        # Version and cached gaussian of each stream; the words follow the JSON
+        'streams': [[name, streams[name][0], streams[name][2]] for name in names],
+    }
+    text = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    words = b''.join(MT_STATE.pack(*streams[name][1]) for name in names)
+    return STATE_HEAD.pack(len(text), len(names)) + text + words
+
+def _decode_state(blob):
+    """
+    Return (state dict, {stream name: Random state}) from _encode_state output.
+    """
+    length, count = STATE_HEAD.unpack_from(blob)
+    data = json.loads(blob[STATE_HEAD.size:STATE_HEAD.size + length].decode('utf-8'))
+    offset = STATE_HEAD.size + length
+    streams = {}
+    for name, version, gauss in data['streams'][:count]:
+        streams[name] = (version, MT_STATE.unpack_from(blob, offset), gauss)
+        offset += MT_STATE.size
+    return data, streams
+
+class SessionStore:
+    """
+    Save/restore of one game in a directory holding two files:
+        snapshot.bin - two alternating slots with the latest state (rewritten in place),
+        journal.bin  - append-only records of commands, events and travel memories.
+    A save writes one snapshot slot plus only the history records added since the last save,
+    so its cost does not grow with the length of the session.
+    Saves come from both the tick thread and the command loop, so every method that touches
+    the files or the counters holds one lock.
+    """
+    # Journal size that triggers an automatic compaction on save
+    COMPACT_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.snapshot_path = os.path.join(directory, 'snapshot.bin')
+        self.journal_path = os.path.join(directory, 'journal.bin')
+        self._journal = open(self.journal_path, 'ab')
+        self._snapshot = None
+        self._capacity = 0
+        self._lock = threading.RLock()
+        self._seq = 0
+        # (kind, pet index) -> sequence number in that pet's LogBook up to which it is journaled
+        self._saved = {}
+        # (kind, pet index) -> number of records of that pet the journal holds
+        self._recorded = {}
+
+    def close(self):
+        with self._lock:
+            self._journal.close()
+            if self._snapshot:
+                self._snapshot.close()
+                self._snapshot = None
+
+    def reset(self):
+        """
+        Start a new game here, dropping whatever an earlier game left that cannot be resumed.
+        """
+        with self._lock:
+            self._journal.truncate(0)
+            if self._snapshot:
+                self._snapshot.close()
+                self._snapshot = None
+            if os.path.exists(self.snapshot_path):
+                os.remove(self.snapshot_path)
+            self._seq = 0
+            self._saved.clear()
+            self._recorded.clear()
+
+    # ---- snapshot ----
+
+    def read_snapshot(self):
+        """
+        Return the newest valid Snapshot, or None if nothing has been saved yet.
+        """
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        start = len(SNAPSHOT_MAGIC) + CAPACITY.size
+        if not data.startswith(SNAPSHOT_MAGIC) or len(data) < start:
+            return None
+        (capacity,) = CAPACITY.unpack_from(data, len(SNAPSHOT_MAGIC))
+        size = SNAPSHOT.size + capacity + CRC.size
+        best = None
+        for i in range(2):
+            chunk = data[start + i * size:start + (i + 1) * size]
+            if len(chunk) < size:
+                continue
+            fields = SNAPSHOT.unpack_from(chunk)
+            length = fields[-1]
+            if length > capacity:
+                continue
+            (crc,) = CRC.unpack_from(chunk, SNAPSHOT.size + length)
+            if zlib.crc32(chunk[:SNAPSHOT.size + length]) != crc:
+                continue  # torn or never written slot
+            if best is None or fields[0] > best[0][0]:
+                best = fields, chunk[SNAPSHOT.size:SNAPSHOT.size + length]
+        if best is None:
+            return None
+        (seq, coins, feed, price, journal_size, diff, name, _), state = best
+        return Snapshot(seq, coins, feed, price, journal_size, diff.rstrip(b'\0').decode(),
+                        name.rstrip(b'\0').decode('utf-8', errors='ignore'), _decode_state(state))
+
+    def _write_snapshot(self, ui):
+        """
+        Overwrite the older of the two slots, so a crash mid-write leaves the other one intact.
+        """
+        self._seq += 1
+        economy = ui.economy
+        state = _encode_state(ui, self._recorded)
+        head = SNAPSHOT.pack(
+            self._seq, economy.coins, economy.feed_stock, economy.buy_price, self._journal.tell(),
+            _encode_text(ui.difficulty, 8), _encode_text(ui.household.members[0].pet.name, 48),
+            len(state))
+        if self._snapshot is None:
+            self._open()
+        if self._snapshot is None or len(state) > self._capacity:
+            self._grow(head, state)
+            return
+        size = SNAPSHOT.size + self._capacity + CRC.size
+        self._snapshot.seek(len(SNAPSHOT_MAGIC) + CAPACITY.size + (self._seq % 2) * size)
+        # Only the used part of the slot is written
+        self._snapshot.write(head + state + CRC.pack(zlib.crc32(head + state)))
+        self._snapshot.flush()
+
+    def _open(self):
+        """
+        Open an existing snapshot file for rewriting its slots in place, and read its capacity.
+        """
+        try:
+            f = open(self.snapshot_path, 'r+b')
+        except FileNotFoundError:
+            return
+        header = f.read(len(SNAPSHOT_MAGIC) + CAPACITY.size)
+        if not header.startswith(SNAPSHOT_MAGIC) or len(header) < len(SNAPSHOT_MAGIC) + CAPACITY.size:
+            f.close()   # Not a file this version wrote: _grow replaces it
+            return
+        (self._capacity,) = CAPACITY.unpack_from(header, len(SNAPSHOT_MAGIC))
+        self._snapshot = f
+
+    def _grow(self, head, state):
+        """
+        Rewrite the snapshot file with slots that fit state, holding this save, through a
+        temporary file and an atomic rename.
+        """
+        if self._snapshot:
+            self._snapshot.close()
+        self._capacity = capacity = max(MIN_CAPACITY, 2 * len(state))
+        slot = (head + state + CRC.pack(zlib.crc32(head + state))).ljust(SNAPSHOT.size + capacity + CRC.size, b'\0')
+        empty = bytes(len(slot))
+        slots = (slot, empty) if self._seq % 2 == 0 else (empty, slot)
+        tmp = self.snapshot_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC + CAPACITY.pack(capacity) + b''.join(slots))
+        os.replace(tmp, self.snapshot_path)
+        self._snapshot = open(self.snapshot_path, 'r+b')
+
+    # ---- journal ----
+
+    def _append(self, kind, payload, when=None):
+        head = RECORD_HEAD.pack(len(payload), kind, time.time() if when is None else when)
+        self._journal.write(head + payload + RECORD_TAIL.pack(len(payload)))
+
+    def log_command(self, line):
+        """
+        Journal one command line typed by the player.
+        """
+        with self._lock:
+            self._append(COMMAND, line.encode('utf-8'))
+
+    def save(self, ui):
+        """
+        Append the history of every pet added since the last save, then write the snapshot.
+        """
+        with self._lock:
+            for i, member in enumerate(ui.household):
+                self._append_history(EVENT, i, member.events.event_log)
+                self._append_history(TRAVEL, i, member.travel.memories)
+            self._journal.flush()
+            if self._journal.tell() > self.COMPACT_BYTES:
+                self.compact(ui)
+            else:
+                self._write_snapshot(ui)
+
+    def _append_history(self, kind, pet, logbook):
+        """
+        Journal the records of one pet's LogBook that are newer than the last save (records
+        appended while this runs are left for the next save).
+        """
+        key = (kind, pet)
+        written = 0
+        for seq, when, label, values in logbook.since(self._saved.get(key, 0)):
+            padded = values + (0,) * (DELTA_FIELDS - len(values))
+            self._append(kind, DELTAS.pack(pet, *padded) + label.encode('utf-8'), when)
+            written += 1
+            self._saved[key] = seq + 1
+        self._recorded[key] = self._recorded.get(key, 0) + written
+
+    def records(self, kinds=None, newest_first=False):
+        """
+        Iterate (kind, epoch, payload) over the journal through a memory map.
+        With newest_first the journal is walked backwards using the trailing lengths,
+        so reading the last few records does not depend on the journal size.
+        Saves wait until the iteration is finished, so no half-written record is seen.
+        """
+        with self._lock:
+            self._journal.flush()
+            if os.path.getsize(self.journal_path) == 0:
+                return
+            with open(self.journal_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for kind, when, start, end in (_backwards(mm) if newest_first else _forwards(mm)):
+                    if kinds is None or kind in kinds:
+                        yield kind, when, mm[start:end]
+
+    def restore(self, ui, history_limit=1000):
+        """
+        Load the saved state into a freshly built game whose first pet is the saved first pet:
+        the other pets are adopted again, and every pet gets back its stats, pending event
+        timers, deadlines and cooldowns; the game time and the random streams continue where
+        they were. Only the newest history_limit events and memories of each pet are read back
+        into memory; the complete history stays in the journal.
+        Returns the Member that was active, or None if there was nothing to restore.
+        """
+        with self._lock:
+            snap = self.read_snapshot()
+            if snap is None:
+                return None
+            state, streams = snap.state
+            self._seq = snap.seq
+            economy = ui.economy
+            economy.coins, economy.feed_stock, economy.buy_price = snap.coins, snap.feed_stock, snap.buy_price
+            household = ui.household
+            for saved in state['pets'][len(household):]:
+                household.adopt(saved['name'])
+            ui.random.setstate((state['seed'], streams))
+            household.now = state['now']
+            # Anything appended after the snapshot was not part of a completed save
+            if os.path.getsize(self.journal_path) > snap.journal_size:
+                self._journal.truncate(snap.journal_size)
+
+            logbooks = {}
+            wanted = {}
+            for i, (member, saved) in enumerate(zip(household, state['pets'])):
+                pet = member.pet
+                for field, value in zip(PET_FIELDS, saved['stats']):
+                    setattr(pet, field, value)
+                pet.failure_reason = saved['failure_reason']
+                member.events.load_state(saved['pending'])
+                for kind, logbook, count in ((EVENT, member.events.event_log, saved['events']),
+                                             (TRAVEL, member.travel.memories, saved['memories'])):
+                    logbooks[kind, i] = logbook
+                    wanted[kind, i] = min(history_limit, count, logbook.capacity)
+                    self._recorded[kind, i] = count
+            found = {key: [] for key in logbooks}
+            missing = sum(wanted.values())
+            for kind, when, payload in self.records((EVENT, TRAVEL), newest_first=True):
+                if not missing:
+                    break
+                key = (kind, DELTAS.unpack_from(payload)[0])
+                if len(found.get(key, ())) < wanted.get(key, 0):
+                    found[key].append((when, payload))
+                    missing -= 1
+            for key, logbook in logbooks.items():
+                width = len(logbook.fields)
+                logbook.clear()
+                for when, payload in reversed(found[key]):
+                    values = DELTAS.unpack_from(payload)[1:width + 1]
+                    logbook.append(payload[DELTAS.size:].decode('utf-8'), *values, when=when)
+                # The logbooks now hold only the tail; count from there for future saves
+                self._saved[key] = logbook.total
+            return household.members[state['active']]
+
+    def compact(self, ui, keep=10000):
+        """
+        Fold the journal into the snapshot: command records (already reflected in the snapshot)
+        are dropped and only the newest keep history records are kept. Rewrites via a temporary
+        file and an atomic rename.
+        """
+        with self._lock:
+            tail = []
+            for record in self.records((EVENT, TRAVEL), newest_first=True):
+                if len(tail) >= keep:
+                    break
+                tail.append(record)
+            tmp = self.journal_path + '.tmp'
+            with open(tmp, 'wb') as f:
+                for kind, when, payload in reversed(tail):
+                    f.write(RECORD_HEAD.pack(len(payload), kind, when) + payload
+                            + RECORD_TAIL.pack(len(payload)))
+            self._journal.close()
+            os.replace(tmp, self.journal_path)
+            self._journal = open(self.journal_path, 'ab')
+            self._recorded.clear()
+            for kind, _, payload in tail:
+                key = (kind, DELTAS.unpack_from(payload)[0])
+                self._recorded[key] = self._recorded.get(key, 0) + 1
+            self._write_snapshot(ui)
+
+def _forwards(mm):
+    pos, size = 0, len(mm)
+    while pos + RECORD_HEAD.size <= size:
+        length, kind, when = RECORD_HEAD.unpack_from(mm, pos)
+        start = pos + RECORD_HEAD.size
+        yield kind, when, start, start + length
+        pos = start + length + RECORD_TAIL.size
+
+def _backwards(mm):
+    pos = len(mm)
+    while pos >= RECORD_HEAD.size + RECORD_TAIL.size:
+        (length,) = RECORD_TAIL.unpack_from(mm, pos - RECORD_TAIL.size)
+        start = pos - RECORD_TAIL.size - length
+        head = start - RECORD_HEAD.size
+        _, kind, when = RECORD_HEAD.unpack_from(mm, head)
+        yield kind, when, start, start + length
+        pos = head
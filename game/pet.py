@@ -1,3 +1,5 @@
+from game.effects import StatEffect
+
 class Pet:
     """
     Tracks your pet's hunger, happiness, energy, and health, letting you know how your pet is doing at all times.
@@ -5,6 +7,20 @@ class Pet:
     giving you a chance to intervene before the situation gets worse.
     If the time limit is exceeded, it records exactly why the game was lost.
     """
+    __slots__ = ('name', 'hunger', 'happiness', 'energy', 'health',
+                 'hunger_timer', 'unhappy_timer', 'neglect_timer', 'failure_reason')
+
+    # Attribute and exact value reached at each threshold crossing used by advance()
+    _CROSSING_TARGETS = {
+        'hunger_full': ('hunger', 100),
+        'energy_empty': ('energy', 0),
+        'hunger_high': ('hunger', 80),
+        'happiness_low': ('happiness', 20),
+        'hunger_timer': ('hunger_timer', 30),
+        'unhappy_timer': ('unhappy_timer', 30),
+        'neglect_timer': ('neglect_timer', 20),
+    }
+
     def __init__(self, name: str):
         """
         Initialize a new pet with default attribute levels.
@@ -67,14 +83,86 @@ class Pet:
         else:
             self.neglect_timer = 0
 
+    def advance(self, seconds: float) -> float:
+        """
+        Fast-forward the pet's status by the given number of seconds in closed form.
+        Between threshold crossings every stat changes linearly, so instead of many small
+        update() steps we jump straight to the next crossing (hunger 80, happiness 20,
+        a timer limit, or hunger 100 / energy 0), apply the failure rules there, and repeat.
+        The result matches update() in the limit of very small steps.
+        Returns the number of seconds actually simulated (less than requested if the pet fails).
+        """
+        elapsed = 0.0
+        while elapsed < seconds and self.is_alive():
+            step, hits = self._next_crossing(seconds - elapsed)
+            self._drift(step, hits)
+            elapsed += step
+            if self._check_failure():
+                break
+        return elapsed
+
+    def _next_crossing(self, limit):
+        """
+        Return (time until the next threshold crossing capped at limit, names of the crossings at that time).
+        """
+        crossings = {
+            'hunger_full': 100 - self.hunger,
+            'energy_empty': self.energy / 0.5,
+        }
+        if self.hunger < 80:
+            crossings['hunger_high'] = 80 - self.hunger
+        else:
+            crossings['hunger_timer'] = 30 - self.hunger_timer
+        if self.happiness > 20:
+            crossings['happiness_low'] = (self.happiness - 20) / 0.5
+        else:
+            crossings['unhappy_timer'] = 30 - self.unhappy_timer
+        if self.health < 30:
+            crossings['neglect_timer'] = 20 - self.neglect_timer
+        step = max(0.0, min(limit, min(crossings.values())))
+        return step, [name for name, t in crossings.items() if t == step]
+
+    def _drift(self, step, hits):
+        """
+        Apply step seconds of linear decay and timer accumulation within the current regime,
+        snapping any quantity that reached its threshold exactly onto it.
+        """
+        self.hunger_timer = self.hunger_timer + step if self.hunger >= 80 else 0
+        self.unhappy_timer = self.unhappy_timer + step if self.happiness <= 20 else 0
+        self.neglect_timer = self.neglect_timer + step if self.health < 30 else 0
+        self.hunger = min(100, self.hunger + step * 1.0)
+        self.happiness = max(0, self.happiness - step * 0.5)
+        self.energy = max(0, self.energy - step * 0.5)
+
+        # Avoid floating point drift leaving a value just short of its threshold
+        for name in hits:
+            attr, value = self._CROSSING_TARGETS[name]
+            setattr(self, attr, value)
+
+    def _check_failure(self) -> bool:
+        """
+        Apply the failure rules of update() to the current state, in the same order.
+        """
+        if self.hunger >= 100 or self.energy <= 0:
+            self.failure_reason = 'neglect'
+        elif self.hunger >= 80 and self.hunger_timer >= 30:
+            self.failure_reason = 'protection'
+        elif self.happiness <= 20 and self.unhappy_timer >= 30:
+            self.failure_reason = 'protection'
+        elif self.health < 30 and self.neglect_timer >= 20:
+            self.failure_reason = 'death'
+        else:
+            return False
+        self.health = 0
+        return True
+
     def play(self, duration=1):
         """
         Interact with the pet, Increase pleasure while decreasing energy.
         """
         happiness_gain = 15 * duration
         energy_cost = 10 * duration
-        self.happiness = min(100, self.happiness + happiness_gain)
-        self.energy = max(0, self.energy - energy_cost)
+        StatEffect(happiness=happiness_gain, energy=-energy_cost).apply(self)
         return happiness_gain, energy_cost
 
     def is_alive(self) -> bool:
@@ -0,0 +1,286 @@
+import numpy as np
+
+from game.effects import StatEffect
+from game.pet import Pet
+
+# Rows of the shared stat block, in storage order
+STAT_FIELDS = ('hunger', 'happiness', 'energy', 'health',
+               'hunger_timer', 'unhappy_timer', 'neglect_timer')
+# failure_reason is stored as a small integer code, index 0 means "no failure yet"
+FAILURE_REASONS = (None, 'neglect', 'protection', 'death')
+
+NO_FAILURE = 0
+NEGLECT = 1
+PROTECTION = 2
+DEATH = 3
+
+
+class PetPopulation:
+    """
+    Struct-of-arrays storage for many pets at once.
+    Every stat and failure timer lives in one contiguous float64 block (one row per field),
+    and failure reasons live in an int8 array, so a whole population can be stepped
+    with a handful of NumPy operations instead of one Pet.update call per pet.
+    step(delta) applies exactly the same rules as Pet.update, in the same order.
+    """
+    def __init__(self, names=(), capacity=None, stats=None, reasons=None):
+        """
+        Create a population holding the given pet names.
+        stats / reasons may be supplied to place the arrays in external memory
+        (e.g. shared memory); they must have shapes (7, capacity) and (capacity,).
+        """
+        names = list(names)
+        capacity = max(capacity or 0, len(names), 1)
+        # Only storage we allocated ourselves may be reallocated when full
+        self._growable = stats is None and reasons is None
+        if stats is None:
+            stats = np.empty((len(STAT_FIELDS), capacity), dtype=np.float64)
+        if reasons is None:
+            reasons = np.zeros(capacity, dtype=np.int8)
+        self._stats = stats
+        self._reasons = reasons
+        self.names = []
+        self.size = 0
+        for name in names:
+            self.add(name)
+
+    @classmethod
+    def attach(cls, stats, reasons, names):
+        """
+        Wrap external storage that already holds len(names) pets (e.g. shared memory filled in
+        by another process) without resetting their values.
+        """
+        population = cls(capacity=stats.shape[1], stats=stats, reasons=reasons)
+        population.names = list(names)
+        population.size = len(population.names)
+        return population
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        """
+        Return a Pet-like view of the pet at the given index.
+        """
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("pet index out of range")
+        return PetView(self, index)
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield PetView(self, i)
+
+    @property
+    def capacity(self):
+        return self._stats.shape[1]
+
+    # Live views of the used part of each array; writes go straight to storage
+    @property
+    def hunger(self):
+        return self._stats[0, :self.size]
+
+    @property
+    def happiness(self):
+        return self._stats[1, :self.size]
+
+    @property
+    def energy(self):
+        return self._stats[2, :self.size]
+
+    @property
+    def health(self):
+        return self._stats[3, :self.size]
+
+    @property
+    def hunger_timer(self):
+        return self._stats[4, :self.size]
+
+    @property
+    def unhappy_timer(self):
+        return self._stats[5, :self.size]
+
+    @property
+    def neglect_timer(self):
+        return self._stats[6, :self.size]
+
+    @property
+    def failure_codes(self):
+        return self._reasons[:self.size]
+
+    def add(self, name: str) -> 'PetView':
+        """
+        Append a new pet with the same default attribute levels as Pet.__init__.
+        """
+        if self.size == self.capacity:
+            self._grow()
+        i = self.size
+        self._stats[:, i] = (0, 100, 100, 100, 0, 0, 0)
+        self._reasons[i] = NO_FAILURE
+        self.names.append(name)
+        self.size += 1
+        return PetView(self, i)
+
+    def _grow(self):
+        """
+        Double the storage capacity, keeping existing values.
+        """
+        if not self._growable:
+            raise ValueError("Population storage is external and cannot grow.")
+        new_cap = self.capacity * 2
+        stats = np.empty((len(STAT_FIELDS), new_cap), dtype=np.float64)
+        stats[:, :self.size] = self._stats[:, :self.size]
+        reasons = np.zeros(new_cap, dtype=np.int8)
+        reasons[:self.size] = self._reasons[:self.size]
+        self._stats = stats
+        self._reasons = reasons
+
+    def step(self, delta: float, mask=None):
+        """
+        Advance every pet by delta seconds, or only the pets selected by a boolean mask
+        (e.g. alive_mask(), so that pets already gone keep their final state).
+        Equivalent to calling Pet.update(delta) on each pet: an "active" mask plays
+        the role of the early returns, so later rules only touch pets that earlier
+        rules did not already fail in this step.
+        """
+        if mask is not None:
+            # Step a gathered copy of the selected pets, then scatter it back
+            index = np.flatnonzero(mask)
+            part = PetPopulation(capacity=index.size, stats=self._stats[:, index],
+                                 reasons=self._reasons[index])
+            part.size = index.size
+            part.step(delta)
+            self._stats[:, index] = part._stats
+            self._reasons[index] = part._reasons
+            return
+        hunger, happiness, energy, health = (self.hunger, self.happiness,
+                                             self.energy, self.health)
+        reasons = self.failure_codes
+
+        # Base attribute decay and growth
+        np.minimum(hunger + delta * 1.0, 100, out=hunger)
+        np.maximum(happiness - delta * 0.5, 0, out=happiness)
+        np.maximum(energy - delta * 0.5, 0, out=energy)
+
+        # Death occurs immediately when starvation or energy deficiency occurs
+        failed = (hunger >= 100) | (energy <= 0)
+        reasons[failed] = NEGLECT
+        health[failed] = 0
+        active = ~failed
+
+        # Hunger ≥80 for 30 seconds -> animal protection
+        failed = self._threshold_timer(self.hunger_timer, hunger >= 80, active, delta, 30)
+        reasons[failed] = PROTECTION
+        health[failed] = 0
+        active &= ~failed
+
+        # Happiness ≤20 for 30 seconds -> animal protection
+        failed = self._threshold_timer(self.unhappy_timer, happiness <= 20, active, delta, 30)
+        reasons[failed] = PROTECTION
+        health[failed] = 0
+        active &= ~failed
+
+        # Health <30 for 20 seconds -> death
+        failed = self._threshold_timer(self.neglect_timer, health < 30, active, delta, 20)
+        reasons[failed] = DEATH
+        health[failed] = 0
+
+    @staticmethod
+    def _threshold_timer(timer, condition, active, delta, limit):
+        """
+        Accumulate timer where condition holds, reset it elsewhere (active pets only),
+        and return the mask of pets whose timer reached limit.
+        """
+        counting = active & condition
+        timer[counting] += delta
+        timer[active & ~condition] = 0
+        return counting & (timer >= limit)
+
+    def apply_effects(self, effects, mask=None):
+        """
+        Apply stat effects to the population in one vectorized pass with one clamp:
+        either a single StatEffect for every pet (or the pets selected by a boolean mask),
+        or a sequence holding one StatEffect or None per pet.
+        Coin and feed changes belong to an economy, not a pet, and are ignored here.
+        """
+        stats = self._stats[:len(StatEffect.STATS), :self.size]
+        if isinstance(effects, StatEffect):
+            deltas = np.array([getattr(effects, f) for f in StatEffect.STATS], dtype=np.float64)
+            if mask is None:
+                stats += deltas[:, None]
+            else:
+                stats[:, mask] += deltas[:, None]
+        else:
+            if len(effects) != self.size:
+                raise ValueError("Expected one effect per pet.")
+            deltas = np.zeros_like(stats)
+            for i, effect in enumerate(effects):
+                if effect is not None:
+                    deltas[:, i] = (effect.hunger, effect.happiness, effect.energy, effect.health)
+            stats += deltas
+        np.clip(stats, 0, 100, out=stats)
+
+    def alive_mask(self):
+        """
+        Boolean array of pets that are still alive (health > 0).
+        """
+        return self.health > 0
+
+    def failure_reasons(self):
+        """
+        Return failure_reason for every pet as a list of strings / None.
+        """
+        return [FAILURE_REASONS[c] for c in self.failure_codes]
+
+
+class PetView(Pet):
+    """
+    A lightweight handle onto one slot of a PetPopulation.
+    Reads and writes go directly to the population arrays, so a view can be passed to
+    any subsystem that expects a Pet (events, travel, interaction, veterinary).
+    The properties defined below take precedence over Pet's slots, which stay unused.
+    """
+    __slots__ = ('_pop', '_index')
+
+    def __init__(self, population, index):
+        self._pop = population
+        self._index = index
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def name(self):
+        return self._pop.names[self._index]
+
+    @name.setter
+    def name(self, value):
+        self._pop.names[self._index] = value
+
+    @property
+    def failure_reason(self):
+        return FAILURE_REASONS[self._pop._reasons[self._index]]
+
+    @failure_reason.setter
+    def failure_reason(self, value):
+        self._pop._reasons[self._index] = FAILURE_REASONS.index(value)
+
+    def __repr__(self):
+        return f"<PetView {self.name!r} #{self._index}>"
+
+
+def _stat_property(row):
+    def fget(self):
+        return float(self._pop._stats[row, self._index])
+
+    def fset(self, value):
+        self._pop._stats[row, self._index] = value
+
+    return property(fget, fset)
+
+
+for _row, _field in enumerate(STAT_FIELDS):
+    setattr(PetView, _field, _stat_property(_row))
+del _row, _field
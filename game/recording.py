@@ -0,0 +1,103 @@
+import json
+import threading
+import time
+
+from game.scheduler import VirtualClock
+
+# Recording format: JSON lines. The first line is a header with the format version, session
+# seed, pet name and difficulty; every further line is one entry [kind, time, ...]:
+#     ["tick", t, delta]              a game tick of delta seconds
+#     ["command", t, line]            a command line as typed
+#     ["input", t, reply, seconds]    an answer to a minigame prompt and how long it took
+#     ["end", t, state]               the final state (see session_state), checked by replays
+# t is the wall-clock time in seconds since recording started; it is informative only, the
+# order of the entries is what a replay follows.
+VERSION = 1
+
+def session_state(ui):
+    """
+    The state a replay must reproduce: pet stats, economy and history counts, as a dict.
+    A household of several pets also lists every pet's stats.
+    """
+    pet, economy = ui.pet, ui.economy
+    state = {
+        'hunger': pet.hunger,
+        'happiness': pet.happiness,
+        'energy': pet.energy,
+        'health': pet.health,
+        'failure_reason': pet.failure_reason,
+        'coins': economy.coins,
+        'feed': economy.feed_stock,
+        'events': ui.events.event_log.total,
+        'memories': ui.travel.memories.total,
+    }
+    if len(ui.household) > 1:
+        state['household'] = [[m.pet.name, m.pet.hunger, m.pet.happiness, m.pet.energy,
+                               m.pet.health, m.pet.failure_reason] for m in ui.household]
+    return state
+
+class Recorder:
+    """
+    Writes the command, tick and minigame input stream of a live session to a file, so that
+    ui.replay.ReplayUI can re-execute it with the same seed and get identical results.
+    Minigames of a recorded session run on the recorder's VirtualClock, which only moves by
+    the recorded waits and answer times, so timed games (e.g. reaction speed) replay exactly.
+    Entries come from the input loop and the tick thread, so writes are serialized by a lock.
+    """
+    def __init__(self, path, seed, name, difficulty):
+        self.path = path
+        self.clock = VirtualClock()
+        self.entries = 0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        # Line buffered, so a crashed session still leaves everything up to the crash
+        self._file = open(path, 'w', encoding='utf-8', buffering=1)
+        header = {'version': VERSION, 'seed': seed, 'name': name, 'difficulty': difficulty}
+        self._file.write(json.dumps(header) + '\n')
+
+    def _entry(self, kind, *values):
+        with self._lock:
+            if self._file is None:
+                return
+            when = round(time.monotonic() - self._started, 6)
+            self._file.write(json.dumps([kind, when, *values]) + '\n')
+            self.entries += 1
+
+    def tick(self, delta):
+        self._entry('tick', delta)
+
+    def command(self, line):
+        self._entry('command', line)
+
+    def answer(self, reply, seconds):
+        """
+        Record a reply to a minigame prompt that took the player seconds to type.
+        """
+        self.clock.time += seconds
+        self._entry('input', reply, seconds)
+
+    def waited(self, seconds):
+        """
+        A minigame waited for seconds; move the minigame clock along with it.
+        """
+        self.clock.time += seconds
+
+    def close(self, state):
+        """
+        Write the final state and close the file.
+        """
+        self._entry('end', state)
+        with self._lock:
+            self._file.close()
+            self._file = None
+
+def read_recording(path):
+    """
+    Return (header dict, list of entries) of a recording file.
+    """
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('version') != VERSION:
+            raise ValueError(f"{path}: unsupported recording version {header.get('version')}")
+        entries = [json.loads(line) for line in f if line.strip()]
+    return header, entries
@@ -0,0 +1,38 @@
+import random
+
+class RandomStreams:
+    """
+    Independent random generators for the subsystems of one game session, all derived from
+    a single session seed. Each subsystem (events, travel, every minigame) draws from its own
+    stream, so one subsystem drawing more or fewer numbers never shifts another's sequence,
+    and two sessions never share hidden state through the global random module.
+    The same seed always gives the same streams (see game.recording for replays).
+    """
+    def __init__(self, seed=None):
+        # Without a seed, take one from the global generator: fresh per run, but still
+        # reproducible for callers that seed the random module (e.g. the balance lab)
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self._streams = {}
+
+    def stream(self, name):
+        """
+        Return the generator of the named subsystem, created on first use.
+        """
+        rng = self._streams.get(name)
+        if rng is None:
+            # String seeds are hashed with SHA-512, so this does not depend on PYTHONHASHSEED
+            rng = self._streams[name] = random.Random(f"{self.seed}:{name}")
+        return rng
+
+    def getstate(self):
+        """
+        Return (seed, {name: Random.getstate()} of every stream created so far), e.g. for a
+        saved game, so that a resumed game continues the same sequences (see setstate).
+        """
+        return self.seed, {name: rng.getstate() for name, rng in self._streams.items()}
+
+    def setstate(self, state):
+        seed, streams = state
+        self.seed = seed
+        for name, value in streams.items():
+            self.stream(name).setstate(value)
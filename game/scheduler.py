@@ -0,0 +1,191 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class MonotonicClock:
+    """
+    Real clock based on time.monotonic, unaffected by system clock changes.
+    """
+    virtual = False
+
+    def now(self) -> float:
+        return time.monotonic()
+
+
+class VirtualClock:
+    """
+    Manually advanced clock for tests and simulations: time only moves when the
+    scheduler is told to advance it, so nothing ever sleeps.
+    """
+    virtual = True
+
+    def __init__(self, start: float = 0.0):
+        self.time = start
+
+    def now(self) -> float:
+        return self.time
+
+
+class Job:
+    """
+    A scheduled callback. Periodic jobs have an interval; one-shot jobs have interval None.
+    policy decides what a late periodic job does:
+        'catchup' runs every missed period back to back,
+        'skip' runs once and moves on to the next period boundary after now.
+    """
+    def __init__(self, deadline, callback, args, interval=None, policy='catchup'):
+        if policy not in ('catchup', 'skip'):
+            raise ValueError(f"Unknown late policy: {policy}")
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.policy = policy
+        self.cancelled = False
+        self.lateness = 0.0     # How far behind its deadline the latest run started (seconds)
+
+    def cancel(self):
+        """
+        Cancel the job; it will not run again even if it is already due.
+        """
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    Deadline scheduler over a heap of jobs.
+    Periodic deadlines are computed from the previous deadline rather than from when the
+    callback finished, so callback time does not make the tick rate drift.
+    It can run on a background thread (start/stop, stop wakes it immediately), be pumped
+    manually with run_pending(), or be driven by a VirtualClock with advance().
+    """
+    def __init__(self, clock=None):
+        self.clock = clock or MonotonicClock()
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def call_later(self, delay: float, callback, *args) -> Job:
+        """
+        Run callback(*args) once, delay seconds from now.
+        """
+        return self._push(Job(self.clock.now() + delay, callback, args))
+
+    def call_every(self, interval: float, callback, *args, policy='catchup', first=None) -> Job:
+        """
+        Run callback(*args) every interval seconds; the first run is after first seconds
+        (defaults to one interval).
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        delay = interval if first is None else first
+        return self._push(Job(self.clock.now() + delay, callback, args, interval, policy))
+
+    def _push(self, job):
+        with self._cond:
+            heapq.heappush(self._heap, (job.deadline, next(self._seq), job))
+            self._cond.notify()
+        return job
+
+    def next_deadline(self):
+        """
+        Return the deadline of the earliest live job, or None when nothing is scheduled.
+        """
+        with self._cond:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self):
+        """
+        Run every job that is due now, in deadline order.
+        Returns the number of seconds until the next job is due, or None if nothing is scheduled.
+        """
+        now = self.clock.now()
+        while True:
+            with self._cond:
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, _, job = heapq.heappop(self._heap)
+            if job.cancelled:
+                continue
+            job.lateness = now - job.deadline
+            self._reschedule(job, now)
+            job.callback(*job.args)
+        deadline = self.next_deadline()
+        return None if deadline is None else max(0.0, deadline - self.clock.now())
+
+    def _reschedule(self, job, now):
+        """
+        Compute the next deadline of a periodic job that is about to run.
+        """
+        if job.interval is None:
+            return
+        job.deadline += job.interval
+        if job.policy == 'skip' and job.deadline <= now:
+            missed = int((now - job.deadline) // job.interval) + 1
+            job.deadline += missed * job.interval
+        self._push(job)
+
+    def advance(self, seconds: float):
+        """
+        Move a virtual clock forward, running each job at its own deadline along the way.
+        """
+        if not self.clock.virtual:
+            raise ValueError("advance() requires a VirtualClock")
+        target = self.clock.now() + seconds
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > target:
+                break
+            self.clock.time = max(self.clock.time, deadline)
+            self.run_pending()
+        self.clock.time = target
+
+    def start(self):
+        """
+        Start a background daemon thread that runs jobs as they become due.
+        """
+        if self.clock.virtual:
+            raise ValueError("A virtual clock scheduler is driven with advance(), not a thread")
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """
+        Runs on the background thread: sleep until the next deadline (or until woken by
+        a new job / stop()), then run whatever is due.
+        """
+        while True:
+            self.run_pending()
+            with self._cond:
+                if not self._running:
+                    return
+                # Re-check under the lock so a job added meanwhile is not missed
+                deadline = self._heap[0][0] if self._heap else None
+                if deadline is None:
+                    self._cond.wait()
+                else:
+                    delay = deadline - self.clock.now()
+                    if delay > 0:
+                        self._cond.wait(delay)
+
+    def stop(self):
+        """
+        Stop the background thread promptly, even if it is waiting for a far deadline.
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        thread = self._thread
+        if thread and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
@@ -1,36 +1,45 @@
-import threading
-import time
+from game.scheduler import Scheduler
 
 class GameTimer:
     """
     A repeating timer that invokes a callback function every interval seconds.
+    Ticks are scheduled on monotonic deadlines, so time spent inside the callback
+    does not delay later ticks, and stop() takes effect immediately.
     """
 
-    def __init__(self, interval: float, callback):
+    def __init__(self, interval: float, callback, scheduler=None, metrics=None):
         """
-        Initialize the GameTimer.
+        Initialize the GameTimer. A shared scheduler may be passed in (e.g. one driven by
+        a VirtualClock); otherwise the timer owns a scheduler with its own thread.
+        With metrics, how late each tick starts is recorded as 'tick_lag'.
         """
         self.interval = interval
         self.callback = callback
-        self._running = False
-
-    def _run(self):
-        """
-        Runs on a separate thread: waits for the interval, then calls the callback repeatedly until stopped.
-        """
-        while self._running:
-            time.sleep(self.interval)
-            self.callback(self.interval)
+        self.metrics = metrics
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler or Scheduler()
+        self._job = None
 
     def start(self):
         """
-        Starts the timer, launching a background thread that triggers the callback at each interval.
+        Starts the timer: the callback is called with the interval every interval seconds,
+        catching up on missed ticks if the process falls behind.
         """
-        self._running = True
-        threading.Thread(target=self._run, daemon=True).start()
+        callback = self._timed_callback if self.metrics else self.callback
+        self._job = self.scheduler.call_every(self.interval, callback, self.interval)
+        if self._owns_scheduler:
+            self.scheduler.start()
+
+    def _timed_callback(self, delta):
+        self.metrics.observe('tick_lag', self._job.lateness)
+        self.callback(delta)
 
     def stop(self):
         """
         Stops the timer, preventing any further callback executions.
         """
-        self._running = False
+        if self._job:
+            self._job.cancel()
+            self._job = None
+        if self._owns_scheduler:
+            self.scheduler.stop()
@@ -0,0 +1,125 @@
+import math
+
+class Timer:
+    """
+    A callback scheduled on a TimingWheel; cancel() stops it from firing.
+    """
+    __slots__ = ('expires', 'callback', 'args', 'cancelled')
+
+    def __init__(self, expires, callback, args):
+        self.expires = expires
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel driven by game time (the delta of each tick).
+    Time is counted in slots of `resolution` seconds. Level 0 has one bucket per slot for the
+    next `size` slots, and every higher level covers `size` times the span of the one below;
+    a timer sits in the bucket of the coarsest level it fits, and is moved down a level when
+    that bucket comes up. Scheduling and cancelling are O(1), and advancing costs the number of
+    slots passed plus the timers that expire or move, however many timers are pending.
+    """
+    def __init__(self, resolution=0.5, size=64, levels=4):
+        self.resolution = resolution
+        self.size = size
+        self.levels = levels
+        # Bucket index -> timers, per level; only buckets holding timers exist, so an idle
+        # wheel (e.g. one per pet of a large world) costs a few empty dicts
+        self.buckets = [{} for _ in range(levels)]
+        self.overflow = []  # Timers beyond the span of the top level
+        self.slot = 0       # Current slot; timers due at or before it have fired
+        self.elapsed = 0.0  # Game seconds advanced so far
+        self.pending = 0    # Timers scheduled and not yet fired (including cancelled ones)
+
+    @property
+    def now(self):
+        return self.elapsed
+
+    def schedule(self, delay, callback, *args):
+        """
+        Call callback(*args) once `delay` game seconds have passed; returns a Timer.
+        Delays are rounded up to whole slots, and a timer never fires in the slot it was added.
+        """
+        target = self.elapsed + max(0.0, delay)
+        return self.at(max(self.slot + 1, math.ceil(target / self.resolution - 1e-9)), callback, *args)
+
+    def at(self, expires, callback, *args):
+        """
+        Call callback(*args) when slot expires comes up (a later slot than the current one);
+        e.g. to restore a saved Timer. Returns a Timer.
+        """
+        timer = Timer(expires, callback, args)
+        self._insert(timer)
+        self.pending += 1
+        return timer
+
+    def timers(self):
+        """
+        Return the timers still to fire (not cancelled), in the order they will fire.
+        """
+        pending = [timer for level in self.buckets for bucket in level.values() for timer in bucket]
+        pending += self.overflow
+        # Stable: timers of one slot keep the order in which they would fire
+        return sorted((timer for timer in pending if not timer.cancelled), key=lambda timer: timer.expires)
+
+    def _insert(self, timer):
+        distance = timer.expires - self.slot
+        span = self.size
+        for level in range(self.levels):
+            if distance < span:
+                index = (timer.expires // (span // self.size)) % self.size
+                self.buckets[level].setdefault(index, []).append(timer)
+                return
+            span *= self.size
+        self.overflow.append(timer)
+
+    def _cascade(self):
+        """
+        At a level 0 wrap-around, move the timers of the next bucket of each higher level down.
+        """
+        span = 1
+        for level in range(1, self.levels):
+            span *= self.size
+            if self.slot % span:
+                return
+            index = (self.slot // span) % self.size
+            for timer in self.buckets[level].pop(index, ()):
+                self._insert(timer)
+        if self.slot % (span * self.size) == 0 and self.overflow:
+            overflow, self.overflow = self.overflow, []
+            for timer in overflow:
+                self._insert(timer)
+
+    def advance(self, seconds):
+        """
+        Move game time forward and fire every timer that came due, in order of expiry.
+        While a timer fires, now is its slot's time, so callbacks may schedule new timers
+        relative to it; those due within the same advance fire too.
+        """
+        end = self.elapsed + seconds
+        target = math.floor(end / self.resolution + 1e-9)
+        while self.slot < target:
+            if not self.pending:
+                # Nothing to fire: jump straight to the target slot
+                self.slot = target
+                break
+            self.slot += 1
+            self.elapsed = self.slot * self.resolution
+            if self.slot % self.size == 0:
+                self._cascade()
+            bucket = self.buckets[0].pop(self.slot % self.size, None)
+            if not bucket:
+                continue
+            for timer in bucket:
+                self.pending -= 1
+                if not timer.cancelled:
+                    timer.callback(*timer.args)
+        self.elapsed = end
+
+    def __len__(self):
+        return self.pending
@@ -1,82 +1,91 @@
 import random
 from datetime import datetime
 
+from game.effects import StatEffect
+from game.logbook import LogBook
+
 class TravelSystem:
     """
     Travel system: provides a variety of location options, scene templates,
     attribute adjustments, and records travel memories.
     """
-    def __init__(self, pet):
+    # Define available travel locations and their scenario templates
+    locations = {
+        'beach': {
+            'name': 'A golden beach where you can pick up small shells and crabs',
+            'scenarios': [
+                {
+                    'text': '{name} runs along the shoreline, listening to the waves crash, feeling completely relaxed.',
+                    'happiness': +10,
+                    'energy': -5
+                },
+                {
+                    'text': 'An unexpected storm forces {name} to return to you in a hurry.',
+                    'happiness': -5,
+                    'energy': -10
+                }
+            ]
+        },
+        'forest': {
+            'name': 'A misty forest where wild animals may roam',
+            'scenarios': [
+                {
+                    'text': 'Birdsong surrounds {name} in the woods, making it feel one with nature.',
+                    'happiness': +8,
+                    'energy': -8
+                },
+                {
+                    'text': 'A confusing path makes {name} anxious, and it rushes back.',
+                    'happiness': -7,
+                    'energy': -5
+                }
+            ]
+        },
+        'mountain': {
+            'name': 'A majestic mountain with a view of the clouds',
+            'scenarios': [
+                {
+                    'text': '{name} conquers the summit and looks out over the horizon, filled with a sense of accomplishment.',
+                    'happiness': +12,
+                    'energy': -12
+                },
+                {
+                    'text': 'Sudden altitude sickness makes {name} dizzy, forcing a premature descent.',
+                    'happiness': -4,
+                    'energy': -15
+                }
+            ]
+        },
+        'city': {
+            'name': 'A bustling city with tall buildings and shopping malls everywhere',
+            'scenarios': [
+                {
+                    'text': 'The neon lights of the city dazzle {name}, quickening its heartbeat.',
+                    'happiness': +6,
+                    'energy': -6
+                },
+                {
+                    'text': 'Crowds tire out {name}, who returns with mixed feelings.',
+                    'happiness': -6,
+                    'energy': -8
+                }
+            ]
+        }
+    }
+    # The stat changes of each scenario, built once
+    effects = {key: [StatEffect.from_spec(s) for s in loc['scenarios']]
+               for key, loc in locations.items()}
+
+    def __init__(self, pet, memory_capacity=500, memory_spill=None, rng=None):
         """
         Initialize the TravelSystem with a reference to the pet.
+        rng picks the scenarios (the global random module unless a session stream is given).
         """
         self.pet = pet
-
-        # Define available travel locations and their scenario templates
-        self.locations = {
-            'beach': {
-                'name': 'A golden beach where you can pick up small shells and crabs',
-                'scenarios': [
-                    {
-                        'text': '{name} runs along the shoreline, listening to the waves crash, feeling completely relaxed.',
-                        'happiness': +10,
-                        'energy': -5
-                    },
-                    {
-                        'text': 'An unexpected storm forces {name} to return to you in a hurry.',
-                        'happiness': -5,
-                        'energy': -10
-                    }
-                ]
-            },
-            'forest': {
-                'name': 'A misty forest where wild animals may roam',
-                'scenarios': [
-                    {
-                        'text': 'Birdsong surrounds {name} in the woods, making it feel one with nature.',
-                        'happiness': +8,
-                        'energy': -8
-                    },
-                    {
-                        'text': 'A confusing path makes {name} anxious, and it rushes back.',
-                        'happiness': -7,
-                        'energy': -5
-                    }
-                ]
-            },
-            'mountain': {
-                'name': 'A majestic mountain with a view of the clouds',
-                'scenarios': [
-                    {
-                        'text': '{name} conquers the summit and looks out over the horizon, filled with a sense of accomplishment.',
-                        'happiness': +12,
-                        'energy': -12
-                    },
-                    {
-                        'text': 'Sudden altitude sickness makes {name} dizzy, forcing a premature descent.',
-                        'happiness': -4,
-                        'energy': -15
-                    }
-                ]
-            },
-            'city': {
-                'name': 'A bustling city with tall buildings and shopping malls everywhere',
-                'scenarios': [
-                    {
-                        'text': 'The neon lights of the city dazzle {name}, quickening its heartbeat.',
-                        'happiness': +6,
-                        'energy': -6
-                    },
-                    {
-                        'text': 'Crowds tire out {name}, who returns with mixed feelings.',
-                        'happiness': -6,
-                        'energy': -8
-                    }
-                ]
-            }
-        }
-        # Store memories of each trip
-        self.memories = []
+        self.rng = rng or random
+        # Store memories of each trip: location key, scenario index and stat changes
+        self.memories = LogBook(('scenario', 'happiness', 'energy'),
+                                capacity=memory_capacity, spill_path=memory_spill)
 
     def travel(self, choice_key):
         """
@@ -86,30 +95,37 @@ class TravelSystem:
         if not loc:
             raise ValueError(f"Unknown travel location: {choice_key}")
 
-        scenario = random.choice(loc['scenarios'])
+        index = self.rng.randrange(len(loc['scenarios']))
+        scenario = loc['scenarios'][index]
 
-        # Format the scenario text with the pet's name
-        text = scenario['text'].format(name=self.pet.name)
         happ = scenario['happiness']
         energy = scenario['energy']
 
         # Update the pet's attributes, clamping between 0 and 100
-        self.pet.happiness = max(0, min(100, self.pet.happiness + happ))
-        self.pet.energy    = max(0, min(100, self.pet.energy + energy))
+        self.effects[choice_key][index].apply(self.pet)
 
         # Create a memory entry
-        record = {
-            'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        seq = self.memories.append(choice_key, index, happ, energy)
+        return self.format_memory(self.memories.get(seq))
+
+    def get_memories(self, page=1, per_page=10, location=None):
+        """
+        Return (memories, page_count) for one page of travel memories for UI display,
+        newest first, optionally only trips to the given location key.
+        """
+        records, pages = self.memories.query(location, page, per_page)
+        return [self.format_memory(r) for r in records], pages
+
+    def format_memory(self, record):
+        """
+        Turn a compact memory record into the dict shown to the player.
+        """
+        _, when, key, (index, happ, energy) = record
+        loc = self.locations[key]
+        return {
+            'time': datetime.fromtimestamp(when).strftime('%Y-%m-%d %H:%M:%S'),
             'location': loc['name'],
-            'text': text,
+            'text': loc['scenarios'][index]['text'].format(name=self.pet.name),
             'happiness_change': happ,
             'energy_change': energy
         }
-        self.memories.append(record)
-        return record
-
-    def get_memories(self):
-        """
-        Return a list of all travel memories for UI display.
-        """
-        return list(self.memories)
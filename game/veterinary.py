@@ -1,3 +1,6 @@
+from game.effects import StatEffect
+from utils.output import emit
+
 class Veterinary:
     """
     Veterinary treatment system for pet games.
@@ -12,14 +15,14 @@ class Veterinary:
 
     def visit(self):
         """
-        Costs 15 coins and fully restores health and energy.
+        Costs 15 coins and fully restores health and energy. Returns whether the visit happened.
         """
         cost = 15
         # Spend coins for treatment
         if self.economy.spend(cost):
-            # Fully restore health and energy
-            self.pet.health = 100
-            self.pet.energy = 100
-            print(f"Treatment successful: Health fully restored, Energy fully restored, Coins spent: {cost}.")
-        else:
-            print("Insufficient coins for treatment.")
+            # Fully restore health and energy: a full-scale delta clamps to 100
+            StatEffect(health=100, energy=100).apply(self.pet)
+            emit(f"Treatment successful: Health fully restored, Energy fully restored, Coins spent: {cost}.")
+            return True
+        emit("Insufficient coins for treatment.")
+        return False
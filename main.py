@@ -1,14 +1,79 @@
 # Please run this file!
 
+import argparse
+import asyncio
+import sys
+
 from ui.text_ui import TextUI
+from ui.async_ui import AsyncTextUI
+from ui.replay import ReplayUI
+from ui.script import ScriptedUI
+from ui.server import GameServer
+from utils.metrics import Metrics, TimedStream
 
 def main():
     """
     Program entry: Start text interface
     """
-    ui = TextUI()
-    ui.run()
+    parser = argparse.ArgumentParser(description="Parrot pet game")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="run input, ticks and minigames on a single asyncio loop instead of a timer thread")
+    parser.add_argument('--serve', metavar='[HOST:]PORT',
+                        help="host games for many players over TCP instead of playing locally")
+    parser.add_argument('--save', metavar='DIR',
+                        help="save the game to DIR while playing, resuming it if a save already exists")
+    parser.add_argument('--script', metavar='FILE',
+                        help="run the commands in FILE ('-' for stdin) against a virtual clock, "
+                             "without prompts; exits with status 1 if an expect line fails")
+    parser.add_argument('--name', help="pet name (asked for interactively if omitted)")
+    parser.add_argument('--difficulty', choices=['easy', 'normal', 'hard'],
+                        help="game difficulty (asked for interactively if omitted)")
+    parser.add_argument('--quiet', action='store_true',
+                        help="with --script or --replay, only show failed expectations and the summary")
+    parser.add_argument('--seed', type=int,
+                        help="session seed for events, travel and minigames (random if omitted)")
+    parser.add_argument('--record', metavar='FILE',
+                        help="record the session's commands, ticks and minigame answers to FILE")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="re-run a recorded session at full speed and check that it ends the same; "
+                             "exits with status 1 if it does not")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="profile ticks, commands and minigames and export the results to FILE "
+                             "(.prom for Prometheus text, otherwise JSON) on exit")
+    args = parser.parse_args()
+    if args.serve:
+        host, _, port = args.serve.rpartition(':')
+        try:
+            asyncio.run(GameServer(host or '127.0.0.1', int(port)).serve_forever())
+        except KeyboardInterrupt:
+            print("Server stopped.")
+        return
+    metrics = Metrics() if args.metrics else None
+    if metrics:
+        sys.stdout = TimedStream(sys.stdout, metrics)
+    try:
+        if args.replay:
+            if not ReplayUI(args.replay, metrics=metrics, quiet=args.quiet).run():
+                sys.exit(1)
+            return
+        if args.script:
+            ui = ScriptedUI(args.name or 'Polly', args.difficulty or 'normal', save_dir=args.save,
+                            metrics=metrics, quiet=args.quiet, seed=args.seed)
+            if ui.run(args.script):
+                sys.exit(1)
+            return
+        ui_class = AsyncTextUI if args.use_async else TextUI
+        ui = ui_class(args.name, args.difficulty, save_dir=args.save, metrics=metrics, seed=args.seed)
+        if args.record:
+            try:
+                ui.record(args.record)
+            except ValueError as e:
+                parser.error(str(e))
+            print(f"Recording to {args.record} (seed {ui.random.seed}).")
+        ui.run()
+    finally:
+        if metrics:
+            metrics.export(args.metrics)
 
 if __name__ == "__main__":
     main()
-
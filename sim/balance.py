@@ -0,0 +1,240 @@
+import argparse
+import math
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game.minigames import MathQuizGame, Bot, BOTS, run_headless
+from game.scheduler import VirtualClock
+from ui.text_ui import TextUI, DIFFICULTY_INTERVALS
+from utils.helpers import silence
+
+# Coins a policy keeps in hand for a bag of feed and a vet visit
+RESERVE = 20
+# The bot that plays a policy's 'money' command, at the math quiz
+EARNER = 'casual'
+
+def policy_idle(pet, economy):
+    """
+    Never does anything: measures how long a neglected pet lasts.
+    """
+    return []
+
+def policy_feeder(pet, economy):
+    """
+    Feeds when hunger passes 50 and buys feed when the stock runs out.
+    """
+    commands = []
+    if economy.feed_stock == 0 and economy.coins >= economy.buy_price:
+        commands.append('buyfeed 1')
+    if pet.hunger >= 50:
+        commands.append('feed')
+    return commands
+
+def policy_attentive(pet, economy):
+    """
+    Feeder, plus keeps happiness up by petting and goes to the vet when health is low.
+    """
+    commands = policy_feeder(pet, economy)
+    if pet.health < 30 and economy.coins >= 15:
+        commands.append('vet')
+    if pet.happiness < 40:
+        commands.append('interact head')
+    return commands
+
+def policy_earner(pet, economy):
+    """
+    Attentive, plus earns coins with a minigame ('money') while they are below RESERVE.
+    """
+    commands = policy_attentive(pet, economy)
+    if economy.coins < RESERVE:
+        commands.insert(0, 'money')
+    return commands
+
+POLICIES = {
+    'idle': policy_idle,
+    'feeder': policy_feeder,
+    'attentive': policy_attentive,
+    'earner': policy_earner,
+}
+
+class Stats:
+    """
+    Streaming count / mean / variance / min / max (Welford), mergeable across workers.
+    """
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, x):
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+        self.low = min(self.low, x)
+        self.high = max(self.high, x)
+
+    def merge(self, other):
+        if not other.n:
+            return
+        n = self.n + other.n
+        d = other.mean - self.mean
+        self.mean += d * other.n / n
+        self.m2 += other.m2 + d * d * self.n * other.n / n
+        self.n = n
+        self.low = min(self.low, other.low)
+        self.high = max(self.high, other.high)
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+class Summary:
+    """
+    Aggregated results of many games for one (difficulty, policy) pair.
+    Failure times are kept as per-tick histograms, so memory does not grow with the game count.
+    """
+    def __init__(self, difficulty, policy, max_ticks):
+        self.difficulty = difficulty
+        self.policy = policy
+        self.max_ticks = max_ticks
+        self.games = 0
+        self.failures = {}              # failure_reason -> Counter(tick of failure)
+        self.coins = Stats()            # final coins - starting coins
+        self.feed_bought = Stats()
+        self.vet_visits = Stats()
+        self.minigames = Stats()
+
+    def merge(self, other):
+        self.games += other.games
+        for reason, hist in other.failures.items():
+            self.failures.setdefault(reason, Counter()).update(hist)
+        self.coins.merge(other.coins)
+        self.feed_bought.merge(other.feed_bought)
+        self.vet_visits.merge(other.vet_visits)
+        self.minigames.merge(other.minigames)
+
+    def survival(self, tick):
+        """
+        Fraction of games whose pet was still alive after the given number of ticks.
+        """
+        dead = sum(n for hist in self.failures.values() for t, n in hist.items() if t <= tick)
+        return 1 - dead / self.games if self.games else 0.0
+
+def play_game(difficulty, policy, max_ticks):
+    """
+    Run one headless game through the normal TextUI commands and tick. 'money' plays a
+    math quiz with the EARNER bot instead of asking for a game and answers.
+    Returns (failure_reason, tick of failure or None, coin change, feed bought, vet visits,
+    minigames played).
+    """
+    ui = TextUI('Polly', difficulty)
+    ui.running = True
+    clock = VirtualClock()
+    quiz = MathQuizGame(ui.economy, clock=clock, rng=ui.random.stream('math'))
+    bot = Bot(*BOTS[EARNER], ui.random.stream('bot'))
+    start_coins = ui.economy.coins
+    bought = visits = played = 0
+    for tick in range(1, max_ticks + 1):
+        for command in policy(ui.pet, ui.economy):
+            if command == 'money':
+                run_headless(quiz.steps(), bot, clock)
+                played += 1
+                continue
+            coins = ui.economy.coins
+            ui.dispatch(command)
+            if ui.economy.coins < coins:
+                bought += command.startswith('buyfeed')
+                visits += command == 'vet'
+        ui.tick(ui.interval)
+        if not ui.pet.is_alive():
+            return ui.pet.failure_reason, tick, ui.economy.coins - start_coins, bought, visits, played
+    return None, None, ui.economy.coins - start_coins, bought, visits, played
+
+def run_chunk(difficulty, policy_name, max_ticks, games, seed):
+    """
+    Worker entry point: play a chunk of games with its own seed and return their Summary.
+    """
+    random.seed(seed)
+    summary = Summary(difficulty, policy_name, max_ticks)
+    policy = POLICIES[policy_name]
+    for _ in range(games):
+        reason, tick, coins, bought, visits, played = play_game(difficulty, policy, max_ticks)
+        summary.games += 1
+        if tick is not None:
+            # Health knocked to 0 by events ends the game without a failure_reason
+            summary.failures.setdefault(reason or 'health_zero', Counter())[tick] += 1
+        summary.coins.add(coins)
+        summary.feed_bought.add(bought)
+        summary.vet_visits.add(visits)
+        summary.minigames.add(played)
+    return summary
+
+def run_lab(games, difficulties, policies, max_seconds=1800, seed=0, workers=None, chunk=500):
+    """
+    Play games for every (difficulty, policy) pair across a process pool.
+    Each chunk of games gets a seed derived from (seed, difficulty, policy, chunk index), so results
+    are reproducible regardless of the number of workers; summaries are merged as chunks finish.
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=silence) as pool:
+        futures = []
+        for d_index, difficulty in enumerate(difficulties):
+            max_ticks = int(max_seconds // DIFFICULTY_INTERVALS[difficulty])
+            for p_index, policy in enumerate(policies):
+                results[difficulty, policy] = Summary(difficulty, policy, max_ticks)
+                for c_index, start in enumerate(range(0, games, chunk)):
+                    chunk_seed = random.Random(f"{seed}:{d_index}:{p_index}:{c_index}").getrandbits(32)
+                    futures.append(pool.submit(run_chunk, difficulty, policy, max_ticks,
+                                               min(chunk, games - start), chunk_seed))
+        for future in as_completed(futures):
+            part = future.result()
+            results[part.difficulty, part.policy].merge(part)
+    return results
+
+def _percentile(hist, q):
+    total = sum(hist.values())
+    seen = 0
+    for t in sorted(hist):
+        seen += hist[t]
+        if seen >= q * total:
+            return t
+    return None
+
+def print_report(results):
+    """
+    Print survival curves, time-to-failure by reason and coin flow for every lab result.
+    """
+    for (difficulty, policy), s in results.items():
+        interval = DIFFICULTY_INTERVALS[difficulty]
+        print(f"=== {difficulty} (tick {interval}s) / {policy}: {s.games} games ===")
+        marks = [m for m in (60, 300, 600, 1800) if m // interval <= s.max_ticks]
+        curve = ", ".join(f"{m // 60}min {s.survival(int(m // interval)):.1%}" for m in marks)
+        print(f"  Survival: {curve}")
+        for reason, hist in sorted(s.failures.items()):
+            count = sum(hist.values())
+            p50, p90 = _percentile(hist, 0.5), _percentile(hist, 0.9)
+            print(f"  {reason:<11} {count / s.games:6.1%} of games | time to failure "
+                  f"p50 {p50 * interval:.0f}s, p90 {p90 * interval:.0f}s")
+        print(f"  Coins: {s.coins.mean:+.1f} ± {s.coins.stdev:.1f} (min {s.coins.low}, max {s.coins.high}) | "
+              f"feed bought {s.feed_bought.mean:.1f} | vet visits {s.vet_visits.mean:.2f} | "
+              f"minigames {s.minigames.mean:.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo balance lab for the parrot pet game")
+    parser.add_argument('--games', type=int, default=10000, help="games per difficulty and policy")
+    parser.add_argument('--difficulty', nargs='+', default=list(DIFFICULTY_INTERVALS),
+                        choices=list(DIFFICULTY_INTERVALS))
+    parser.add_argument('--policy', nargs='+', default=list(POLICIES), choices=list(POLICIES))
+    parser.add_argument('--max-seconds', type=float, default=1800, help="game time cap per game")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+    results = run_lab(args.games, args.difficulty, args.policy, args.max_seconds, args.seed, args.workers)
+    print_report(results)
+
+if __name__ == "__main__":
+    main()
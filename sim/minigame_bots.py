@@ -0,0 +1,79 @@
+import argparse
+import contextlib
+import random
+import time
+
+from game.arithmetic import TIERS, generate_arrays
+from game.economy import Economy
+from game.minigames import (ReactionGame, MemoryGame, MathQuizGame, WordScrambleGame,
+                            Bot, BOTS, run_headless)
+from game.scheduler import VirtualClock
+from sim.balance import Stats
+from utils.helpers import NullOutput
+
+GAMES = {
+    'reaction': ReactionGame,
+    'memory': MemoryGame,
+    'math': MathQuizGame,
+    'scramble': WordScrambleGame,
+}
+
+def tune(rounds, games, bots, seed=0):
+    """
+    Play rounds of every (game, bot) pair headlessly and return {(game, bot): Stats of coins
+    earned per round}, plus the number of rounds played per second.
+    """
+    results = {}
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(NullOutput()):
+        for game_name in games:
+            for bot_name in bots:
+                rng = random.Random(f"{seed}:{game_name}:{bot_name}")
+                clock = VirtualClock()
+                economy = Economy()
+                game = GAMES[game_name](economy, clock=clock, rng=rng)
+                bot = Bot(*BOTS[bot_name], rng)
+                stats = results[game_name, bot_name] = Stats()
+                for _ in range(rounds):
+                    coins = economy.coins
+                    run_headless(game.steps(), bot, clock)
+                    stats.add(economy.coins - coins)
+    elapsed = time.perf_counter() - started
+    return results, rounds * len(results) / elapsed
+
+def grade_quiz(tier, count, accuracy, seed=0):
+    """
+    Generate count math questions of a tier in one batch, answer them with a bot of the given
+    accuracy and grade the answers, all vectorized (requires numpy).
+    Returns (fraction correct, questions per second).
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    _, _, answers = generate_arrays(tier, count, rng)
+    replies = answers + (rng.random(count) >= accuracy)
+    correct = np.count_nonzero(replies == answers)
+    return correct / count, count / (time.perf_counter() - started)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Minigame payouts per round for bots of different skill")
+    parser.add_argument('--rounds', type=int, default=10000, help="rounds per game and bot")
+    parser.add_argument('--game', nargs='+', default=list(GAMES), choices=list(GAMES))
+    parser.add_argument('--bot', nargs='+', default=list(BOTS), choices=list(BOTS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quiz', type=int, default=1_000_000,
+                        help="math questions per tier to generate and grade in batch (0 to skip)")
+    args = parser.parse_args(argv)
+    results, rate = tune(args.rounds, args.game, args.bot, args.seed)
+    print(f"{'game':<10}{'bot':<8}{'mean':>8}{'stdev':>8}{'min':>6}{'max':>6}")
+    for (game, bot), s in results.items():
+        print(f"{game:<10}{bot:<8}{s.mean:>8.2f}{s.stdev:>8.2f}{s.low:>6}{s.high:>6}")
+    print(f"{rate:,.0f} rounds/s")
+    for tier in TIERS if args.quiz else ():
+        for bot in args.bot:
+            score, speed = grade_quiz(tier, args.quiz, BOTS[bot][0], args.seed)
+            print(f"math {tier:<7}{bot:<8}{score:>7.1%} correct, {speed:,.0f} questions/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+import argparse
+import contextlib
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.arithmetic import TIERS
+from game.catalog import load_catalog
+from game.conditions import ATTRIBUTES, compile_condition, game_state
+from game.economy import Economy
+from game.effects import FEED, StatEffect
+from game.interaction import InteractionSystem
+from game.events import RandomEventSystem
+from game.pet import Pet
+from game.veterinary import Veterinary
+from ui.script import ScriptedUI
+from ui.text_ui import DIFFICULTY_INTERVALS
+from utils.helpers import NullOutput, silence
+
+# The TextUI commands a plan is made of, in the order they run within a tick: earn first,
+# then spend, then care. 'money' is one math quiz played by the expert bot.
+COMMANDS = ('money', 'buyfeed 1', 'vet', 'feed', 'interact head', 'play 1')
+# Questions in one math quiz and their tier (MathQuizGame's defaults)
+QUIZ_QUESTIONS = 5
+QUIZ_TIER = 'normal'
+# Pet stats and timers, then coins and feed stock: the fields of a search state
+STATE_FIELDS = ('hunger', 'happiness', 'energy', 'health',
+                'hunger_timer', 'unhappy_timer', 'neglect_timer', 'coins', 'feed')
+
+def _attributes(cond):
+    """
+    The attributes a condition (see conditions.validate_condition) tests.
+    """
+    tested = {key.split('_', 1)[1] for key in cond if key.startswith(('min_', 'max_'))}
+    for sub in cond.get('all', []) + cond.get('any', []):
+        tested |= _attributes(sub)
+    if 'not' in cond:
+        tested |= _attributes(cond['not'])
+    return tested
+
+class EventModel:
+    """
+    The random events of a catalog reduced to their expected stat change per tick in a
+    given game state: the chance that an event fires (RandomEventSystem.CHANCE) times the
+    weighted mean, over the events whose condition holds, of everything an event does:
+    its own effect, all repeats of its scheduled effects, its follow-up event and the event
+    its deadline fires if not cleared (assumed never cleared, which errs on the safe side).
+    Coin and feed changes and cooldowns are left out. Results are cached on the attributes
+    the catalog's conditions actually test, so states differing elsewhere share an entry.
+    """
+    # Follow-up chains are followed this many events deep
+    DEPTH = 4
+
+    def __init__(self, config_path='data/events.json'):
+        catalog = load_catalog(config_path).current
+        self.by_key = catalog.index.by_key
+        self.entries = []
+        tested = set()
+        for ev in catalog.events:
+            weight = ev.get('weight', 1)
+            if weight > 0:
+                condition = ev.get('condition', {})
+                tested |= _attributes(condition)
+                self.entries.append((compile_condition(condition), weight, self._total(ev)))
+        self.tested = [i for i, attr in enumerate(ATTRIBUTES) if attr in tested]
+        self.cache = {}
+
+    def _total(self, ev, depth=0):
+        total = StatEffect().add(ev['stat_effect'])
+        if depth >= self.DEPTH:
+            return total
+        for effect in ev.get('effects', ()):
+            for _ in range(effect.get('times', 1)):
+                total.add(effect['stat_effect'])
+        chained = [ev.get('followup'), ev.get('deadline')]
+        for link in chained:
+            follow = self.by_key.get(link['event']) if link else None
+            if follow is not None:
+                total.add(self._total(follow, depth + 1))
+        return total
+
+    def expected(self, state):
+        """
+        Expected (hunger, happiness, energy, health) change from events in a game_state() tuple.
+        """
+        key = tuple([state[i] for i in self.tested])
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        weights = 0
+        sums = [0.0, 0.0, 0.0, 0.0]
+        for predicate, weight, total in self.entries:
+            if predicate is None or predicate(state):
+                weights += weight
+                sums[0] += weight * total.hunger
+                sums[1] += weight * total.happiness
+                sums[2] += weight * total.energy
+                sums[3] += weight * total.health
+        scale = RandomEventSystem.CHANCE / weights if weights else 0
+        result = self.cache[key] = tuple(s * scale for s in sums)
+        return result
+
+class Solution:
+    """
+    The cheapest plan found for one difficulty: one tuple of commands per tick, how many
+    ticks the pet survives it in the model, its coin cost and minigames, and search counts.
+    """
+    def __init__(self, difficulty, horizon, plans, survived, spent, games, stats):
+        self.difficulty = difficulty
+        self.horizon = horizon
+        self.plans = plans
+        self.survived = survived
+        self.spent = spent
+        self.games = games
+        self.stats = stats
+        self.evaluation = None      # (games, survived the whole plan, mean ticks) once evaluated
+
+    def counts(self):
+        """
+        How often each command occurs in the plan.
+        """
+        counts = {}
+        for plan in self.plans:
+            for command in plan:
+                counts[command] = counts.get(command, 0) + 1
+        return counts
+
+    def script(self, interval):
+        """
+        The plan as a ScriptedUI script: each tick's commands, then a wait of one tick.
+        """
+        lines = []
+        for plan in self.plans:
+            lines += ['money 3' if command == 'money' else command for command in plan]
+            lines.append(f'wait {interval:g}')
+        return '\n'.join(lines) + '\n'
+
+class CareOptimizer:
+    """
+    Searches for the cheapest command schedule that keeps a pet alive longest.
+    The game is made deterministic by replacing random events with their expected effect
+    (see EventModel) and a minigame with its full payout, and stats are rounded to
+    resolution after every tick, so a search state is a small tuple of numbers
+    (see STATE_FIELDS). The search is dynamic programming forward in time: each layer
+    holds the states reachable after t ticks, each with the cheapest (coins spent,
+    minigames) way found to reach it, so paths that meet in one state are merged
+    (a transposition table). Layers wider than beam keep their cheapest, safest states.
+    Expected events are smooth while real ones come in lumps (a wire chew costs 40 health
+    at once), so a state only counts as surviving while health, happiness and energy stay
+    margin above their failure thresholds; a plan then has room to absorb bad luck.
+    Tick transitions run the real Pet.update, Economy, Veterinary and InteractionSystem
+    code, and are memoized per (state, command) and per pre-tick state, since many paths
+    and plans revisit the same states.
+    """
+    def __init__(self, difficulty='normal', config_path='data/events.json', minigames=True,
+                 resolution=1.0, beam=64, margin=40, per_tick=3):
+        self.difficulty = difficulty
+        self.interval = DIFFICULTY_INTERVALS[difficulty]
+        self.payout = TIERS[QUIZ_TIER].reward * QUIZ_QUESTIONS
+        self.events = EventModel(config_path)
+        # 'money' is left out when the player only has the starting coins
+        self.options = COMMANDS if minigames else COMMANDS[1:]
+        self.per_tick = per_tick
+        self.resolution = resolution
+        self.beam = beam
+        self.margin = margin
+        self.commands = {}      # (state, command) -> see command()
+        self.ticks = {}         # pre-tick state -> see tick()
+        self.hits = 0
+
+    def start(self):
+        pet, economy = Pet('Polly'), Economy()
+        return self._state(pet, economy)
+
+    def _state(self, pet, economy):
+        r = self.resolution
+        return (round(pet.hunger / r) * r, round(pet.happiness / r) * r,
+                round(pet.energy / r) * r, round(pet.health / r) * r,
+                pet.hunger_timer, pet.unhappy_timer, pet.neglect_timer,
+                economy.coins, economy.feed_stock)
+
+    def _run(self, command, pet, economy):
+        """
+        Apply one command as TextUI does; returns False when it would change nothing.
+        """
+        before = (pet.hunger, pet.happiness, pet.energy, pet.health, economy.coins, economy.feed_stock)
+        if command == 'money':
+            economy.earn(self.payout)
+        elif command == 'buyfeed 1':
+            economy.buy_feed(1)
+        elif command == 'vet':
+            Veterinary(pet, economy).visit()
+        elif command == 'feed':
+            if economy.feed_stock > 0:
+                FEED.apply(pet, economy)
+        elif command == 'interact head':
+            InteractionSystem(pet, economy).action('head')
+        elif command == 'play 1':
+            pet.play(1)
+        return before != (pet.hunger, pet.happiness, pet.energy, pet.health, economy.coins, economy.feed_stock)
+
+    def _load(self, state):
+        pet, economy = Pet('Polly'), Economy()
+        (pet.hunger, pet.happiness, pet.energy, pet.health,
+         pet.hunger_timer, pet.unhappy_timer, pet.neglect_timer, economy.coins, economy.feed_stock) = state
+        return pet, economy
+
+    def command(self, state, command):
+        """
+        Apply one command to a state. Returns None if it would do nothing, else
+        (the state after it, coins spent).
+        """
+        key = (state, command)
+        if key in self.commands:
+            self.hits += 1
+            return self.commands[key]
+        pet, economy = self._load(state)
+        coins = economy.coins
+        result = None
+        if self._run(command, pet, economy):
+            result = ((pet.hunger, pet.happiness, pet.energy, pet.health, pet.hunger_timer,
+                       pet.unhappy_timer, pet.neglect_timer, economy.coins, economy.feed_stock),
+                      max(0, coins - economy.coins))
+        self.commands[key] = result
+        return result
+
+    def tick(self, state):
+        """
+        One tick from a state: Pet.update, then the expected events. Returns the rounded next
+        state, or None if the pet died or is no longer safe (see _safe).
+        """
+        if state in self.ticks:
+            self.hits += 1
+            return self.ticks[state]
+        pet, economy = self._load(state)
+        pet.update(self.interval)
+        if pet.is_alive():
+            hunger, happiness, energy, health = self.events.expected(game_state(pet, economy))
+            StatEffect(hunger, happiness, energy, health).apply(pet)
+        result = self.ticks[state] = self._state(pet, economy) if self._safe(pet) else None
+        return result
+
+    def plans(self, state):
+        """
+        The distinct states that up to per_tick commands (repeats allowed, in COMMANDS order)
+        lead to from state before the tick, each with its cheapest plan:
+        {pre-tick state: (coins spent, minigames, plan)}. Plans are expanded depth first, so
+        a plan reuses the result of its prefix, and a command that would do nothing cuts
+        off every longer plan starting with it.
+        """
+        found = {}
+        stack = [(state, 0, 0, 0, ())]
+        while stack:
+            state, first, spent, games, plan = stack.pop()
+            known = found.get(state)
+            if known is None or (spent, games) < known[:2]:
+                found[state] = (spent, games, plan)
+            if len(plan) == self.per_tick:
+                continue
+            for i in range(first, len(self.options)):
+                command = self.options[i]
+                result = self.command(state, command)
+                if result is not None:
+                    stack.append((result[0], i, spent + result[1], games + (command == 'money'),
+                                  plan + (command,)))
+        return found
+
+    def _safe(self, pet):
+        """
+        Whether the pet is alive and its event-driven stats are at least margin away from
+        where their failure timers start (the plan must absorb an unlucky event or two).
+        """
+        m = self.margin
+        return pet.is_alive() and pet.health >= 30 + m and pet.happiness >= 20 + m and pet.energy >= m
+
+    @staticmethod
+    def _safety(state):
+        # Distance of each stat from where its failure timer starts, capped so one very
+        # safe stat cannot hide another close to failing
+        hunger, happiness, energy, health = state[:4]
+        return (min(30, 80 - hunger) + min(30, happiness - 20) + min(30, energy) +
+                min(30, health - 30))
+
+    def _prune(self, layer):
+        if len(layer) <= self.beam:
+            return layer
+        ranked = sorted(layer.items(), key=lambda item: (item[1][0] - self._safety(item[0]), item[1][1]))
+        return dict(ranked[:self.beam])
+
+    def _search(self, horizon):
+        """
+        Run the layers of the search. Returns (the last layer, ticks survived, the cheapest
+        path that died in the tick after it, states expanded).
+        """
+        # state -> (coins spent, minigames, path); a path is (plan, previous path) or None
+        frontier = {self.start(): (0, 0, None)}
+        best_death = None
+        survived = states = 0
+        for t in range(horizon):
+            layer = {}
+            best_death = None
+            for state, (spent, games, path) in frontier.items():
+                for before, (cost, played, plan) in self.plans(state).items():
+                    nxt = self.tick(before)
+                    total = (spent + cost, games + played)
+                    if nxt is None:
+                        if best_death is None or total < best_death[:2]:
+                            best_death = (*total, (plan, path))
+                        continue
+                    known = layer.get(nxt)
+                    if known is None or total < known[:2]:
+                        layer[nxt] = (*total, (plan, path))
+            if not layer:
+                break
+            states += len(layer)
+            frontier = self._prune(layer)
+            survived = t + 1
+        return frontier, survived, best_death, states
+
+    def solve(self, horizon):
+        """
+        Search horizon ticks ahead from a new game and return the best Solution: the longest
+        survival, then the fewest coins spent, then the fewest minigames.
+        """
+        started = time.perf_counter()
+        # The vet and interactions print; the search has no console
+        with contextlib.redirect_stdout(NullOutput()):
+            frontier, survived, best_death, states = self._search(horizon)
+        if survived == horizon:
+            spent, games, path = min(frontier.values(), key=lambda node: node[:2])
+        else:
+            # Every path died in the tick after the last layer: the cheapest of those
+            spent, games, path = best_death
+        plans = []
+        while path is not None:
+            plan, path = path
+            plans.append(plan)
+        plans.reverse()
+        stats = {'states': states, 'transitions': len(self.commands) + len(self.ticks),
+                 'memo_hits': self.hits, 'event_states': len(self.events.cache),
+                 'seconds': time.perf_counter() - started}
+        return Solution(self.difficulty, horizon, plans, survived, spent, games, stats)
+
+def play_plan(plans, difficulty, seed):
+    """
+    Play a plan in the real game (random events, the math quiz played by the expert bot)
+    through ScriptedUI commands. Returns the number of ticks the pet survived.
+    """
+    with contextlib.redirect_stdout(NullOutput()):
+        ui = ScriptedUI('Polly', difficulty, quiet=True, seed=seed)
+        ui.running = True
+        for tick, plan in enumerate(plans):
+            for command in plan:
+                ui.dispatch('money 3' if command == 'money' else command)
+            ui.tick(ui.interval)
+            if not ui.pet.is_alive():
+                return tick
+        return len(plans)
+
+def _solve(difficulty, horizon, config_path, minigames, resolution, beam, margin, per_tick):
+    optimizer = CareOptimizer(difficulty, config_path, minigames, resolution, beam, margin, per_tick)
+    return optimizer.solve(horizon)
+
+def _evaluate(plans, difficulty, seeds):
+    return [play_plan(plans, difficulty, seed) for seed in seeds]
+
+def optimize(difficulties, max_seconds=1800, config_path='data/events.json', minigames=True,
+             resolution=1.0, beam=64, margin=40, per_tick=3, games=100, seed=0, workers=None):
+    """
+    Solve every difficulty in its own process, then play each plan games times in the real
+    game across the pool. Returns {difficulty: Solution} with evaluation filled in.
+    """
+    solutions = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=silence) as pool:
+        futures = {}
+        for difficulty in difficulties:
+            horizon = int(max_seconds // DIFFICULTY_INTERVALS[difficulty])
+            futures[difficulty] = pool.submit(_solve, difficulty, horizon, config_path, minigames,
+                                              resolution, beam, margin, per_tick)
+        for difficulty, future in futures.items():
+            solutions[difficulty] = future.result()
+        if games:
+            chunk = max(1, games // (os.cpu_count() or 1))
+            runs = {}
+            for d_index, (difficulty, solution) in enumerate(solutions.items()):
+                seeds = [random.Random(f"{seed}:{d_index}:{g}").getrandbits(32) for g in range(games)]
+                runs[difficulty] = [pool.submit(_evaluate, solution.plans, difficulty, seeds[i:i + chunk])
+                                    for i in range(0, games, chunk)]
+            for difficulty, chunks in runs.items():
+                ticks = [t for future in chunks for t in future.result()]
+                full = len(solutions[difficulty].plans)
+                solutions[difficulty].evaluation = (len(ticks), sum(t == full for t in ticks),
+                                                    sum(ticks) / len(ticks))
+    return solutions
+
+def print_report(solutions):
+    for difficulty, s in solutions.items():
+        interval = DIFFICULTY_INTERVALS[difficulty]
+        print(f"=== {difficulty} (tick {interval}s): {s.horizon} ticks searched ===")
+        print(f"  Model: survives {s.survived} ticks ({s.survived * interval:.0f}s), "
+              f"spends {s.spent} coins, plays {s.games} minigames")
+        print("  Plan: " + ", ".join(f"{command} x{n}" for command, n in sorted(s.counts().items())))
+        st = s.stats
+        print(f"  Search: {st['states']:,} states, {st['transitions']:,} transitions memoized "
+              f"({st['memo_hits']:,} hits), {st['event_states']:,} event states, {st['seconds']:.2f}s")
+        if s.evaluation:
+            games, full, mean = s.evaluation
+            print(f"  Real game: {full / games:.1%} of {games} games survive the whole plan, "
+                  f"mean {mean:.1f} ticks ({mean * interval:.0f}s)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search for the cheapest care schedule that keeps a pet "
+                                                 "alive longest, per difficulty")
+    parser.add_argument('--difficulty', nargs='+', default=list(DIFFICULTY_INTERVALS),
+                        choices=list(DIFFICULTY_INTERVALS))
+    parser.add_argument('--max-seconds', type=float, default=1800, help="game time to plan for")
+    parser.add_argument('--config', default='data/events.json', help="event catalog")
+    parser.add_argument('--no-minigames', action='store_true',
+                        help="no coins beyond the starting ones: how long can the pet last?")
+    parser.add_argument('--resolution', type=float, default=1.0, help="stat rounding of search states")
+    parser.add_argument('--beam', type=int, default=64, help="states kept per tick")
+    parser.add_argument('--margin', type=float, default=40,
+                        help="keep health, happiness and energy this far above where they start failing")
+    parser.add_argument('--per-tick', type=int, default=3, help="most commands a plan has per tick")
+    parser.add_argument('--games', type=int, default=100, help="real games played per plan (0 to skip)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--export', metavar='DIR', help="write each plan as a ScriptedUI script")
+    args = parser.parse_args(argv)
+    solutions = optimize(args.difficulty, args.max_seconds, args.config, not args.no_minigames,
+                         args.resolution, args.beam, args.margin, args.per_tick, args.games, args.seed, args.workers)
+    print_report(solutions)
+    if args.export:
+        os.makedirs(args.export, exist_ok=True)
+        for difficulty, s in solutions.items():
+            path = os.path.join(args.export, f'{difficulty}.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(s.script(DIFFICULTY_INTERVALS[difficulty]))
+            print(f"Wrote {path}")
+
+if __name__ == "__main__":
+    main()
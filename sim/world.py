@@ -0,0 +1,343 @@
+import argparse
+import contextlib
+import multiprocessing
+import os
+import random
+import time
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from game.economy import Economy
+from game.effects import FEED
+from game.events import RandomEventSystem
+from game.interaction import InteractionSystem
+from game.population import PetPopulation, STAT_FIELDS, FAILURE_REASONS
+from game.veterinary import Veterinary
+from utils.helpers import NullOutput
+
+# Rows of the shared economy block, one column per pet
+ECONOMY_FIELDS = ('coins', 'feed_stock', 'buy_price')
+# Commands a world pet accepts (see run_command)
+COMMANDS = ('feed', 'buyfeed', 'vet', 'play', 'interact')
+
+class EconomyView(Economy):
+    """
+    The Economy of one world pet, read from and written to the shared economy block,
+    so any subsystem that expects an Economy (events, the vet, interactions) can use it.
+    """
+    __slots__ = ('_block', '_index')
+
+    def __init__(self, block, index):
+        self._block = block
+        self._index = index
+
+def _economy_property(row):
+    def fget(self):
+        return int(self._block[row, self._index])
+
+    def fset(self, value):
+        self._block[row, self._index] = value
+
+    return property(fget, fset)
+
+for _row, _field in enumerate(ECONOMY_FIELDS):
+    setattr(EconomyView, _field, _economy_property(_row))
+del _row, _field
+
+def _layout(count):
+    """
+    Return [(name, dtype, shape, offset)] of the arrays in a world's shared block, and its size.
+    8-byte arrays come first, so every array is aligned.
+    """
+    arrays = [('stats', np.float64, (len(STAT_FIELDS), count)),
+              ('economy', np.int64, (len(ECONOMY_FIELDS), count)),
+              ('events', np.int64, (count,)),
+              ('reasons', np.int8, (count,))]
+    layout = []
+    offset = 0
+    for name, dtype, shape in arrays:
+        layout.append((name, dtype, shape, offset))
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return layout, offset
+
+def _arrays(buffer, count):
+    """
+    Map the shared block of a world of count pets to {name: numpy array}.
+    """
+    layout, _ = _layout(count)
+    return {name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+            for name, dtype, shape, offset in layout}
+
+def run_command(pet, economy, events, line):
+    """
+    Apply one player command to a world pet, with the same rules as the TextUI commands.
+    Returns False if the command is not one of COMMANDS.
+    """
+    cmd, *args = line.split()
+    amount = int(args[0]) if args and args[0].isdigit() else 1
+    if cmd == 'feed':
+        if economy.feed_stock > 0:
+            FEED.apply(pet, economy)
+            events.resolve('feed')
+    elif cmd == 'buyfeed':
+        economy.buy_feed(amount)
+    elif cmd == 'vet':
+        if Veterinary(pet, economy).visit():
+            events.resolve('vet')
+    elif cmd == 'play':
+        pet.play(amount)
+    elif cmd == 'interact' and args:
+        try:
+            InteractionSystem(pet, economy).action(args[0])
+        except ValueError:
+            pass
+    else:
+        return False
+    return True
+
+def _worker(conn, block_name, count, start, names, seed, config_path):
+    """
+    Worker process entry point: attach the shared block, serve ticks, report any failure.
+    """
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        _serve(conn, block.buf, count, start, names, seed, config_path)
+    except Exception:
+        conn.send(('error', traceback.format_exc()))
+    finally:
+        # _serve has returned, so no array views of the block are left
+        block.close()
+
+def _serve(conn, buffer, count, start, names, seed, config_path):
+    """
+    Own the pets [start, start + len(names)) of the world. For every tick message, apply the
+    routed commands, step the living pets and run their events, all in place in shared memory,
+    and reply with (seconds taken, events fired).
+    """
+    arrays = _arrays(buffer, count)
+    end = start + len(names)
+    population = PetPopulation.attach(arrays['stats'][:, start:end], arrays['reasons'][start:end], names)
+    counts = arrays['events'][start:end]
+    # One random stream per pet, derived from the world seed and the pet's index, so a
+    # world plays out the same however it is split across workers
+    systems = [RandomEventSystem(population[i], EconomyView(arrays['economy'], start + i), config_path,
+                                 log_capacity=16, rng=random.Random(f"{seed}:pet:{start + i}"))
+               for i in range(len(names))]
+    conn.send(('ready', None))
+    # Game code prints; a world has no console
+    with contextlib.redirect_stdout(NullOutput()):
+        while True:
+            message = conn.recv()
+            if message is None:
+                return
+            delta, commands = message
+            started = time.perf_counter()
+            for i, line in commands:
+                system = systems[i - start]
+                run_command(system.pet, system.economy, system, line)
+            alive = population.alive_mask()
+            population.step(delta, alive)
+            living = np.flatnonzero(alive)
+            RandomEventSystem.tick_many([systems[i] for i in living], delta)
+            fired = 0
+            for i in living:
+                total = systems[i].event_log.total
+                fired += total - counts[i]
+                counts[i] = total
+            conn.send(('done', (time.perf_counter() - started, int(fired))))
+
+class World:
+    """
+    Many pets sharded across worker processes.
+    All stats, failure reasons, economies and event counts live in one shared memory block:
+    each worker steps its own slice in place (population rules plus per-pet random events),
+    and the coordinator reads status and aggregates straight from the arrays, so pets are
+    never pickled. Commands are routed to the owning worker with the next tick message, and
+    a tick is one message to and one reply from each worker, so throughput grows with the
+    number of cores. Use as a context manager, or call close().
+    """
+    def __init__(self, count, workers=None, seed=0, names=None, config_path='data/events.json'):
+        names = list(names) if names is not None else [f"Polly{i}" for i in range(count)]
+        if len(names) != count:
+            raise ValueError("Expected one name per pet.")
+        workers = max(1, min(workers or os.cpu_count() or 1, count))
+        _, size = _layout(count)
+        self.count = count
+        self._block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self._arrays = _arrays(self._block.buf, count)
+        # Coordinator-side views of the whole world; workers only write their own slice
+        self.population = PetPopulation(capacity=count, stats=self._arrays['stats'],
+                                        reasons=self._arrays['reasons'])
+        for name in names:
+            self.population.add(name)
+        defaults = Economy()
+        for row, field in enumerate(ECONOMY_FIELDS):
+            self._arrays['economy'][row] = getattr(defaults, field)
+        self._arrays['events'][:] = 0
+
+        # Contiguous shards of nearly equal size
+        bounds = [count * i // workers for i in range(workers + 1)]
+        self.shards = list(zip(bounds[:-1], bounds[1:]))
+        self._pending = [[] for _ in self.shards]
+        self._connections = []
+        self._processes = []
+        self.ticks = 0
+        self.shard_seconds = [0.0] * workers
+        self.events_fired = 0
+        context = multiprocessing.get_context()
+        try:
+            for start, end in self.shards:
+                parent, child = context.Pipe()
+                process = context.Process(target=_worker, daemon=True,
+                                          args=(child, self._block.name, count, start,
+                                                names[start:end], seed, config_path))
+                process.start()
+                child.close()
+                self._connections.append(parent)
+                self._processes.append(process)
+            for conn in self._connections:
+                self._receive(conn)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _receive(conn):
+        kind, value = conn.recv()
+        if kind == 'error':
+            raise RuntimeError(f"World worker failed:\n{value}")
+        return value
+
+    def _shard(self, index):
+        for shard, (start, end) in enumerate(self.shards):
+            if start <= index < end:
+                return shard
+        raise IndexError("pet index out of range")
+
+    def command(self, index, line):
+        """
+        Queue a command (see COMMANDS) for pet index; it runs at the start of the next tick.
+        """
+        words = line.split()
+        if not words or words[0] not in COMMANDS:
+            raise ValueError(f"Unknown world command: {line!r} (expected one of {', '.join(COMMANDS)})")
+        self._pending[self._shard(index)].append((index, line))
+
+    def tick(self, delta):
+        """
+        Advance every pet by delta seconds on all workers in parallel; returns the wall time taken.
+        """
+        started = time.perf_counter()
+        for conn, commands in zip(self._connections, self._pending):
+            conn.send((delta, commands))
+        self._pending = [[] for _ in self.shards]
+        for shard, conn in enumerate(self._connections):
+            seconds, fired = self._receive(conn)
+            self.shard_seconds[shard] += seconds
+            self.events_fired += fired
+        self.ticks += 1
+        return time.perf_counter() - started
+
+    def pet(self, index):
+        """
+        Pet-like view of one pet (valid between ticks, while the workers are idle).
+        """
+        return self.population[index]
+
+    def economy(self, index):
+        return EconomyView(self._arrays['economy'], index)
+
+    def status(self, index):
+        """
+        One pet's status line, in the format of the game's status command.
+        """
+        pet, economy = self.pet(index), self.economy(index)
+        return (f"{pet.name} | Hunger={pet.hunger:.1f} | Happiness={pet.happiness:.1f} | "
+                f"Energy={pet.energy:.1f} | Health={pet.health:.1f} | "
+                f"Coins={economy.coins} | Feed={economy.feed_stock}")
+
+    def summary(self):
+        """
+        Aggregate state of the world, computed over the shared arrays.
+        """
+        population = self.population
+        alive = population.alive_mask()
+        codes = np.bincount(population.failure_codes, minlength=len(FAILURE_REASONS))
+        summary = {
+            'pets': self.count,
+            'alive': int(alive.sum()),
+            'failures': {reason: int(n) for reason, n in zip(FAILURE_REASONS[1:], codes[1:]) if n},
+            'coins': int(self._arrays['economy'][0].sum()),
+            'events': int(self._arrays['events'].sum()),
+            'ticks': self.ticks,
+        }
+        for field in ('hunger', 'happiness', 'energy', 'health'):
+            values = getattr(population, field)[alive]
+            summary[f'mean_{field}'] = float(values.mean()) if values.size else 0.0
+        return summary
+
+    def close(self):
+        """
+        Stop the workers and release the shared memory.
+        """
+        for conn in self._connections:
+            with contextlib.suppress(OSError):
+                conn.send(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+        self._processes = []
+        if self._block is not None:
+            self._arrays = None
+            self.population = None
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+def measure(pets, workers, ticks, delta, seed=0):
+    """
+    Run a world of pets on workers processes for ticks ticks, feeding every hungry pet,
+    and return (pet ticks per second, summary).
+    """
+    with World(pets, workers, seed) as world:
+        elapsed = 0.0
+        for _ in range(ticks):
+            hungry = np.flatnonzero(world.population.hunger >= 50)
+            for index in hungry:
+                world.command(int(index), 'feed')
+            elapsed += world.tick(delta)
+        return pets * ticks / elapsed, world.summary()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tick throughput of a world of pets sharded across processes")
+    parser.add_argument('--pets', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help="worker counts to compare (default: 1 and every power of two up to the core count)")
+    parser.add_argument('--ticks', type=int, default=20)
+    parser.add_argument('--delta', type=float, default=8.0, help="seconds of game time per tick")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    cores = os.cpu_count() or 1
+    counts = args.workers or sorted({1, cores} | {2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores})
+    base = None
+    for workers in counts:
+        rate, summary = measure(args.pets, workers, args.ticks, args.delta, args.seed)
+        base = base or rate
+        print(f"{workers:>3} workers: {rate:>12,.0f} pet ticks/s  (x{rate / base:.2f}) | "
+              f"alive {summary['alive']:,}/{summary['pets']:,}, events {summary['events']:,}, "
+              f"failures {summary['failures']}")
+
+if __name__ == "__main__":
+    main()
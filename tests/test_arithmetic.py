@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from game.arithmetic import SYMBOLS, TIERS, evaluate, generate, generate_arrays, render
+
+@pytest.mark.parametrize('operands, ops, answer', [
+    ([3, 4, 2], ['+', '*'], 11),
+    ([3, 4, 2], ['*', '-'], 10),
+    ([2, 3, 4, 5], ['-', '*', '+'], -5),
+    ([7], [], 7),
+])
+def test_evaluate_binds_multiplication_tighter(operands, ops, answer):
+    assert evaluate(operands, ops) == answer
+
+@pytest.mark.parametrize('tier', TIERS)
+def test_generated_answers_match_the_rendered_question(tier):
+    for question in generate(tier, 500, random.Random(tier)):
+        assert question.answer == eval(question.text)
+
+@pytest.mark.parametrize('tier', TIERS)
+def test_generate_arrays_matches_evaluate(tier):
+    np = pytest.importorskip('numpy')
+    operands, ops, answers = generate_arrays(tier, 2000, np.random.default_rng(7))
+    for row, codes, answer in zip(operands.tolist(), ops.tolist(), answers.tolist()):
+        symbols = [SYMBOLS[code] for code in codes]
+        assert answer == evaluate(row, symbols), render(row, symbols)
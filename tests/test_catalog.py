@@ -0,0 +1,67 @@
+import json
+import os
+
+import pytest
+
+from game.catalog import EventCatalog
+
+EVENTS = [
+    {'key': 'snail_chase', 'condition': {'max_health': 100}, 'weight': 5, 'happiness': 2,
+     'text': "{pet_name} follows a tiny snail."},
+    {'key': 'nap', 'weight': 2, 'energy': 10, 'followup': {'event': 'snail_chase', 'delay': 5}},
+]
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    home = tmp_path / 'cache'
+    monkeypatch.setenv('XDG_CACHE_HOME', str(home))
+    return home
+
+def write(path, events, version=1):
+    path.write_text(json.dumps(events))
+    # Give each version its own mtime, whatever the file system's resolution
+    os.utime(path, (1_600_000_000 + version, 1_600_000_000 + version))
+
+def test_invalid_definitions_are_skipped(tmp_path, cache_home, capsys):
+    path = tmp_path / 'events.json'
+    write(path, EVENTS + [
+        {'key': 'bad_weight', 'weight': -1},
+        {'key': 'orphan', 'followup': {'event': 'missing'}},
+        {'key': 'nap'},
+    ])
+    catalog = EventCatalog(str(path))
+    assert [ev['key'] for ev in catalog.current.events] == ['snail_chase', 'nap']
+    out = capsys.readouterr().out
+    assert 'bad_weight: weight must be a non-negative integer' in out
+    assert 'orphan: refers to unknown event missing' in out
+    assert 'nap: duplicate key' in out
+
+def test_compiled_catalog_is_cached_outside_the_data_directory(tmp_path, cache_home, monkeypatch):
+    data = tmp_path / 'data'
+    data.mkdir()
+    path = data / 'events.json'
+    write(path, EVENTS)
+    first = EventCatalog(str(path))
+    assert os.path.dirname(first.cache_path).startswith(str(cache_home))
+    assert os.listdir(data) == ['events.json']
+
+    def no_compile(*args):
+        raise AssertionError("the cached catalog should be used")
+
+    monkeypatch.setattr(EventCatalog, '_compile', no_compile)
+    second = EventCatalog(str(path))
+    assert [ev['key'] for ev in second.current.events] == ['snail_chase', 'nap']
+    assert second.current.digest == first.current.digest
+
+def test_poll_swaps_in_edits_and_keeps_the_catalog_on_errors(tmp_path, cache_home, capsys):
+    path = tmp_path / 'events.json'
+    write(path, EVENTS)
+    catalog = EventCatalog(str(path))
+    assert not catalog.poll()
+    write(path, EVENTS[:1], version=2)
+    assert catalog.poll()
+    assert [ev['key'] for ev in catalog.current.events] == ['snail_chase']
+    assert '[Catalog] Reloaded 1 events from events.json.' in capsys.readouterr().out
+    path.write_text('[{"key": ')
+    assert not catalog.poll()
+    assert [ev['key'] for ev in catalog.current.events] == ['snail_chase']
@@ -0,0 +1,56 @@
+import random
+
+from game.conditions import ATTRIBUTES, compile_condition, split_hunger, validate_condition
+
+def holds(cond, state):
+    # Reference semantics, straight from the condition's definition
+    values = dict(zip(ATTRIBUTES, state))
+    for attr in ATTRIBUTES:
+        if f'min_{attr}' in cond and values[attr] < cond[f'min_{attr}']:
+            return False
+        if f'max_{attr}' in cond and values[attr] > cond[f'max_{attr}']:
+            return False
+    if not all(holds(sub, state) for sub in cond.get('all', ())):
+        return False
+    if 'any' in cond and not any(holds(sub, state) for sub in cond['any']):
+        return False
+    return not ('not' in cond and holds(cond['not'], state))
+
+def random_condition(rng, depth=0):
+    cond = {}
+    for attr in rng.sample(ATTRIBUTES, rng.randint(0, 2)):
+        bound = rng.randint(0, 100)
+        if rng.random() < 0.5:
+            cond[f'min_{attr}'] = bound
+        else:
+            cond[f'max_{attr}'] = bound
+    if depth < 2:
+        for key in ('all', 'any'):
+            if rng.random() < 0.3:
+                cond[key] = [random_condition(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+        if rng.random() < 0.3:
+            cond['not'] = random_condition(rng, depth + 1)
+    return cond
+
+def test_compiled_conditions_match_their_definition():
+    rng = random.Random(12)
+    for _ in range(500):
+        cond = random_condition(rng)
+        assert validate_condition(cond) == []
+        predicate = compile_condition(cond)
+        for _ in range(20):
+            state = tuple(rng.randint(0, 100) for _ in ATTRIBUTES)
+            assert (predicate is None or predicate(state)) == holds(cond, state), cond
+
+def test_invalid_conditions_are_reported():
+    assert validate_condition([]) == ["condition must be an object"]
+    assert validate_condition({'min_mood': 3}) == ["unknown condition 'min_mood' in condition"]
+    assert validate_condition({'any': {}}) == ["condition.any must be a list of conditions"]
+    assert validate_condition({'not': {'max_coins': True}}) == [
+        "condition.not.max_coins must be a number, not True"]
+    assert validate_condition({'min_energy': 50, 'max_energy': 10}) == [
+        "condition: min_energy 50 is above max_energy 10"]
+
+def test_split_hunger_leaves_the_rest_to_the_predicate():
+    assert split_hunger({'min_hunger': 30, 'max_coins': 5}) == (30, 100, {'max_coins': 5})
+    assert split_hunger({}) == (0, 100, {})
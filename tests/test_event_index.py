@@ -0,0 +1,73 @@
+import pickle
+import random
+from collections import Counter
+
+import pytest
+
+from game.conditions import ATTRIBUTES, compile_condition
+from game.event_index import EventIndex
+
+def random_events(rng, count):
+    events = []
+    for n in range(count):
+        lo = rng.choice((0, 10, 30, 50, 80, rng.randint(0, 100)))
+        hi = rng.choice((lo, 50, 80, 100, rng.randint(lo, 100)))
+        condition = {'min_hunger': lo, 'max_hunger': max(lo, hi)}
+        if rng.random() < 0.3:
+            condition['min_coins'] = rng.randint(0, 30)
+        events.append({'key': f"ev{n}", 'weight': rng.randint(0, 5), 'condition': condition})
+    return events
+
+def eligible(events, state):
+    found = []
+    for ev in events:
+        predicate = compile_condition(ev['condition'])
+        if ev['weight'] > 0 and (predicate is None or predicate(state)):
+            found.append(ev)
+    return found
+
+def state(hunger, coins=10):
+    values = dict.fromkeys(ATTRIBUTES, 50)
+    values.update(hunger=hunger, coins=coins)
+    return tuple(values[attr] for attr in ATTRIBUTES)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_total_weight_matches_a_scan(seed):
+    rng = random.Random(seed)
+    events = random_events(rng, 60)
+    index = EventIndex(events)
+    for hunger in [h / 2 for h in range(-2, 204)]:
+        in_range = [ev for ev in events if ev['condition']['min_hunger'] <= hunger <= ev['condition']['max_hunger']]
+        assert index.total_weight(hunger) == sum(ev['weight'] for ev in in_range), hunger
+
+def test_choices_follow_the_weights_of_eligible_events():
+    rng = random.Random(2)
+    events = random_events(rng, 40)
+    index = EventIndex(events)
+    for hunger, coins in ((0, 0), (50, 5), (80, 40), (100, 20)):
+        game = state(hunger, coins)
+        allowed = eligible(events, game)
+        counts = Counter(index.choose(game, rng)['key'] for _ in range(20000))
+        assert set(counts) <= {ev['key'] for ev in allowed}
+        total = sum(ev['weight'] for ev in allowed)
+        for ev in allowed:
+            assert counts[ev['key']] / 20000 == pytest.approx(ev['weight'] / total, abs=0.02)
+
+def test_nothing_eligible_gives_none():
+    index = EventIndex([{'key': 'rich', 'weight': 3, 'condition': {'min_coins': 100}},
+                        {'key': 'full', 'weight': 3, 'condition': {'max_hunger': 20}}])
+    assert index.choose(state(50, 0)) is None
+    assert index.choose(state(50, 500)) is index.by_key['rich']
+    assert index.choose(state(10, 0)) is index.by_key['full']
+    assert index.choose(state(10, 0), allow=lambda ev: ev['key'] != 'full') is None
+
+def test_choose_many_and_a_pickled_index_choose_like_choose():
+    events = random_events(random.Random(9), 50)
+    index = EventIndex(events)
+    copy = pickle.loads(pickle.dumps(index))
+    states = [state(h, c) for h in (0, 25, 50, 50, 90) for c in (0, 20)]
+    expected = [index.choose(s, random.Random(i)) for i, s in enumerate(states)]
+    many = index.choose_many(states, [random.Random(i) for i in range(len(states))])
+    assert [ev and ev['key'] for ev in many] == [ev and ev['key'] for ev in expected]
+    assert [ev and ev['key'] for ev in (copy.choose(s, random.Random(i)) for i, s in enumerate(states))] == \
+        [ev and ev['key'] for ev in expected]
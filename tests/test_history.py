@@ -0,0 +1,52 @@
+import contextlib
+import csv
+
+import pytest
+
+from game.history import FIELDS, StatHistory
+from ui.script import ScriptedUI
+from utils.helpers import NullOutput
+
+class Sample:
+    def __init__(self, hunger, happiness=50, energy=50, health=50, failure_reason=None):
+        self.hunger, self.happiness, self.energy, self.health = hunger, happiness, energy, health
+        self.failure_reason = failure_reason
+
+def test_series_covers_the_samples_without_overlap():
+    history = StatHistory(raw=4, buckets=4, factor=2, levels=2)
+    for tick in range(1, 101):
+        history.append(tick * 8.0, Sample(tick % 7))
+    rows = history.series()
+    assert all(a[1] < b[0] for a, b in zip(rows, rows[1:]))
+    # Raw samples, then buckets of 2 and of 4 ticks further back
+    assert [samples for _, _, samples, _ in rows] == [4] * 2 + [2] * 2 + [1] * 4
+    assert rows[-1][:2] == (800.0, 800.0)
+    for start, end, samples, values in rows:
+        ticks = range(round(start / 8), round(end / 8) + 1)
+        hungers = [tick % 7 for tick in ticks]
+        assert len(hungers) == samples
+        assert values[:3] == pytest.approx((min(hungers), sum(hungers) / samples, max(hungers)))
+    assert history.series(since=790.0) == rows[-2:]
+
+def test_alerts_log_entering_a_danger_zone_and_the_failure():
+    history = StatHistory()
+    for when, sample in enumerate([Sample(70), Sample(85), Sample(90), Sample(60), Sample(81, happiness=10),
+                                   Sample(95, health=0, failure_reason='protection'), Sample(95)]):
+        history.append(float(when), sample)
+    assert [(when, label) for _, when, label, _ in history.alerts.since(0)] == [
+        (1.0, 'hunger_high'), (4.0, 'hunger_high'), (4.0, 'happiness_low'), (5.0, 'failed:protection')]
+
+def test_exports_stay_in_the_export_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with contextlib.redirect_stdout(NullOutput()):
+        ui = ScriptedUI('Polly', 'normal', seed=1)
+        ui.running = True
+        ui.timer.start()
+        ui.dispatch('wait 80')
+        ui.dispatch('history export ../../stats.csv')
+        ui.dispatch('history export notes.txt')
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['exports']
+    with open(tmp_path / 'exports' / 'stats.csv', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:4] == ['start', 'end', 'samples', f'{FIELDS[0]}_min']
+    assert len(rows) == 11
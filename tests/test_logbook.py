@@ -0,0 +1,26 @@
+from game.logbook import LogBook
+
+def test_ring_keeps_the_newest_records():
+    log = LogBook(('happiness', 'energy'), capacity=3)
+    for n in range(5):
+        log.append(f"event{n % 2}", n, -n, when=float(n))
+    assert len(log) == 3 and log.total == 5
+    assert list(log.since(0)) == [(2, 2.0, 'event0', (2, -2)), (3, 3.0, 'event1', (3, -3)),
+                                  (4, 4.0, 'event0', (4, -4))]
+    records, pages = log.query('event0', per_page=1)
+    assert pages == 2 and records == [(4, 4.0, 'event0', (4, -4))]
+    assert log.query('missing') == ([], 0)
+
+def test_overwritten_records_are_archived(tmp_path):
+    path = tmp_path / 'spill.bin'
+    log = LogBook(('coins',), capacity=4, spill_path=str(path))
+    for n in range(10):
+        log.append(f"place{n}", n, when=float(n))
+    # Readable while the logbook still holds its file open
+    assert list(log.archived()) == [(float(n), f"place{n}", (n,)) for n in range(6)]
+    log.append('place10', 10, when=10.0)
+    log.close()
+    assert [label for _, label, _ in log.archived()] == [f"place{n}" for n in range(7)]
+    log.append('place11', 11, when=11.0)
+    assert len(list(log.archived())) == 8
+    log.close()
@@ -0,0 +1,99 @@
+import contextlib
+
+from game.persistence import SNAPSHOT_MAGIC, SessionStore
+from game.recording import session_state
+from ui.script import ScriptedUI
+from utils.helpers import NullOutput
+
+CARE = ['feed all', 'money 3', 'buyfeed 6', 'feed all', 'wait 8', 'vet', 'feed all', 'wait 8',
+        'interact head all', 'travel beach Kiwi', 'wait 8']
+
+def play(ui, lines):
+    ui.running = True
+    ui.timer.start()
+    for line in lines:
+        ui.dispatch(line)
+    ui.timer.stop()
+
+def pending(ui):
+    return [(member.pet.name, [(t.expires, t.callback.__name__, t.args) for t in member.events.wheel.timers()],
+             dict(member.events.cooldowns), sorted(member.events.deadlines)) for member in ui.household]
+
+def test_resumed_game_continues_like_an_uninterrupted_one(tmp_path):
+    first, second = ['adopt Kiwi'] + CARE * 8, CARE * 8
+    for seed in range(1, 7):
+        with contextlib.redirect_stdout(NullOutput()):
+            whole = ScriptedUI('Polly', 'normal', seed=seed)
+            play(whole, first)
+            expected = pending(whole)
+            play(whole, second)
+            directory = str(tmp_path / str(seed))
+            saved = ScriptedUI('Polly', 'normal', save_dir=directory, seed=seed)
+            play(saved, first + ['select Kiwi'])
+            saved._shutdown()
+            resumed = ScriptedUI(save_dir=directory)
+        assert resumed.resumed
+        assert [m.pet.name for m in resumed.household] == ['Polly', 'Kiwi']
+        assert resumed.pet.name == saved.pet.name
+        assert pending(resumed) == expected
+        assert resumed.household.now == saved.household.now
+        for before, after in zip(saved.household, resumed.household):
+            assert list(after.events.event_log.since(0))[-3:] == list(before.events.event_log.since(0))[-3:]
+            assert len(after.travel.memories) == len(before.travel.memories)
+        with contextlib.redirect_stdout(NullOutput()):
+            resumed.dispatch('select Polly')
+            play(resumed, second)
+        assert session_state(resumed) == session_state(whole)
+
+def save_game(directory, commands):
+    with contextlib.redirect_stdout(NullOutput()):
+        ui = ScriptedUI('Polly', 'normal', save_dir=directory, seed=5)
+        play(ui, commands)
+    return ui
+
+def test_torn_snapshot_slot_falls_back_to_the_other(tmp_path):
+    ui = save_game(str(tmp_path), ['feed', 'wait 16'])
+    store = ui.store
+    newest = store.read_snapshot()
+    coins = ui.economy.coins
+    ui.economy.coins += 7
+    store.save(ui)
+    store.close()
+    assert store.read_snapshot().seq == newest.seq + 1
+    # Damage the slot just written, as a crash in the middle of writing it would
+    with open(store.snapshot_path, 'r+b') as f:
+        data = bytearray(f.read())
+        size = (len(data) - len(SNAPSHOT_MAGIC) - 4) // 2
+        start = len(SNAPSHOT_MAGIC) + 4 + ((newest.seq + 1) % 2) * size
+        data[start + 40] ^= 0xFF
+        f.seek(0)
+        f.write(data)
+    snap = SessionStore(str(tmp_path)).read_snapshot()
+    assert snap.seq == newest.seq
+    assert snap.coins == coins
+
+def test_half_written_journal_record_is_dropped_on_restore(tmp_path):
+    ui = save_game(str(tmp_path), ['wait 60', 'travel beach', 'travel forest'])
+    events = list(ui.events.event_log.since(0))
+    memories = list(ui.travel.memories.since(0))
+    ui._shutdown()
+    with open(ui.store.journal_path, 'ab') as f:
+        f.write(b'\x40\x00\x00\x00\x02partial')
+    with contextlib.redirect_stdout(NullOutput()):
+        resumed = ScriptedUI(save_dir=str(tmp_path))
+    assert list(resumed.events.event_log.since(0)) == events
+    assert list(resumed.travel.memories.since(0)) == memories
+    # The journal is usable again: later saves append after the last complete record
+    with contextlib.redirect_stdout(NullOutput()):
+        resumed.dispatch('travel city')
+        resumed._shutdown()
+        again = ScriptedUI(save_dir=str(tmp_path))
+    assert len(again.travel.memories) == len(memories) + 1
+
+def test_unreadable_save_starts_a_new_game(tmp_path):
+    (tmp_path / 'snapshot.bin').write_bytes(b'PPSNAP1\n' + bytes(200))
+    (tmp_path / 'journal.bin').write_bytes(b'old records')
+    ui = save_game(str(tmp_path), ['feed'])
+    assert not ui.resumed
+    ui._shutdown()
+    assert SessionStore(str(tmp_path)).read_snapshot().name == 'Polly'
@@ -0,0 +1,36 @@
+import pytest
+
+from game.pet import Pet
+
+STATS = ('hunger', 'happiness', 'energy', 'health',
+         'hunger_timer', 'unhappy_timer', 'neglect_timer', 'failure_reason')
+
+@pytest.mark.parametrize('hunger, happiness, energy, health, seconds', [
+    (0, 100, 100, 100, 300),    # protection after 30 s of hunger >= 80
+    (50, 15, 100, 100, 60),     # protection after 30 s of happiness <= 20
+    (0, 100, 100, 20, 60),      # death after 20 s of health < 30
+    (10, 90, 15, 100, 60),      # neglect when energy runs out
+    (0, 100, 100, 100, 45),     # no failure yet
+])
+def test_advance_matches_fine_steps(hunger, happiness, energy, health, seconds):
+    fast, fine = Pet('fast'), Pet('fine')
+    for pet in (fast, fine):
+        pet.hunger, pet.happiness, pet.energy, pet.health = hunger, happiness, energy, health
+    fast.advance(seconds)
+    step = 0.001
+    for _ in range(round(seconds / step)):
+        if not fine.is_alive():
+            break
+        fine.update(step)
+    assert fast.failure_reason == fine.failure_reason
+    for stat in STATS[:-1]:
+        assert getattr(fast, stat) == pytest.approx(getattr(fine, stat), abs=0.01), stat
+
+def test_advance_returns_the_time_simulated():
+    pet = Pet('short')
+    assert pet.advance(20) == 20
+    pet.hunger, pet.energy = 10, 5
+    # Energy runs out after 10 s, and the pet dies of neglect there
+    assert pet.advance(60) == pytest.approx(10)
+    assert pet.failure_reason == 'neglect'
+    assert pet.advance(60) == 0
@@ -0,0 +1,33 @@
+import random
+
+from game.pet import Pet
+from game.population import PetPopulation
+
+STATS = ('hunger', 'happiness', 'energy', 'health',
+         'hunger_timer', 'unhappy_timer', 'neglect_timer', 'failure_reason')
+
+def random_pet(rng, name):
+    pet = Pet(name)
+    pet.hunger = rng.uniform(0, 100)
+    pet.happiness = rng.uniform(0, 100)
+    pet.energy = rng.uniform(0, 100)
+    pet.health = rng.uniform(1, 100)
+    return pet
+
+def test_population_step_matches_pet_update():
+    rng = random.Random(1)
+    pets = [random_pet(rng, f"pet{i}") for i in range(300)]
+    population = PetPopulation(pet.name for pet in pets)
+    for pet, view in zip(pets, population):
+        for stat in STATS[:4]:
+            setattr(view, stat, getattr(pet, stat))
+    for _ in range(60):
+        delta = rng.choice((0.5, 1.0, 6.0, 8.0))
+        mask = population.alive_mask()
+        population.step(delta, mask)
+        for pet in pets:
+            if pet.is_alive():
+                pet.update(delta)
+    for pet, view in zip(pets, population):
+        for stat in STATS:
+            assert getattr(view, stat) == getattr(pet, stat), (pet.name, stat)
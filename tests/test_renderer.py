@@ -0,0 +1,51 @@
+import io
+
+from utils.output import Renderer
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_renderer(ansi=True):
+    out, clock = io.StringIO(), Clock()
+    return Renderer(out, ansi=ansi, clock=clock), out, clock
+
+def test_tick_frame_redraws_prompt_and_typed_input():
+    renderer, out, _ = make_renderer()
+    renderer.prompt = '> '
+    renderer.typed = lambda: 'feed Ki'
+    renderer.post('[Event] Polly found a coin.', 'event')
+    assert renderer.render(redraw=True)
+    assert out.getvalue() == '\r\x1b[K[Event] Polly found a coin.\n> feed Ki'
+
+def test_typed_input_is_not_erased_when_it_cannot_be_redrawn():
+    renderer, out, _ = make_renderer()
+    renderer.prompt = '> '
+    renderer.post('[Event] Polly found a coin.', 'event')
+    renderer.render(redraw=True)
+    assert out.getvalue() == '\n[Event] Polly found a coin.\n> '
+
+def test_repeated_warning_is_shown_once_per_interval():
+    renderer, out, clock = make_renderer(ansi=False)
+    for second in range(0, 40, 8):
+        clock.now = second
+        renderer.post('[Warning] Hunger is too high!', 'warning')
+        renderer.render()
+    assert out.getvalue() == ('[Warning] Hunger is too high!\n'
+                              '[Warning] Hunger is too high! (repeated 3 more times)\n')
+    assert renderer.hidden == 3
+
+def test_forgotten_warning_shows_again_at_once():
+    renderer, out, clock = make_renderer(ansi=False)
+    renderer.post('[Warning] Hunger is too high!', 'warning', 'hunger')
+    renderer.render()
+    clock.now = 8
+    renderer.forget('hunger')
+    clock.now = 16
+    renderer.post('[Warning] Hunger is too high!', 'warning', 'hunger')
+    renderer.render()
+    assert out.getvalue() == '[Warning] Hunger is too high!\n' * 2
+    assert renderer._shown['hunger'] == [16, 0]
@@ -0,0 +1,58 @@
+import contextlib
+import itertools
+import time
+
+from game.recording import read_recording
+from ui.replay import ReplayUI
+from ui.script import ScriptedUI
+from ui.text_ui import TextUI
+from utils.helpers import NullOutput
+
+COMMANDS = ['feed', 'buyfeed 2', 'interact head', 'play 1', 'vet', 'adopt Kiwi', 'feed all',
+            'select Kiwi', 'interact wing', 'buyfeed 1', 'feed Polly']
+
+def replay(path):
+    with contextlib.redirect_stdout(NullOutput()):
+        ui = ReplayUI(str(path), quiet=True)
+        matched, _ = ui.replay()
+    return matched, ui
+
+def test_scripted_session_replays_identically(tmp_path):
+    path = tmp_path / 'session.jsonl'
+    with contextlib.redirect_stdout(NullOutput()):
+        ui = ScriptedUI('Polly', 'normal', seed=7)
+        ui.record(str(path))
+        ui.running = True
+        ui.timer.start()
+        for command in COMMANDS * 3:
+            ui.dispatch(command)
+            ui.dispatch('wait 20')
+        ui.timer.stop()
+        ui._shutdown()
+    _, entries = read_recording(str(path))
+    ticks = sum(1 for entry in entries if entry[0] == 'tick')
+    assert ticks > 0
+    matched, replayed = replay(path)
+    assert matched
+    assert replayed.counts['tick'] == ticks
+
+def test_threaded_session_replays_identically(tmp_path):
+    # Ticks come from the timer thread while commands run on this one
+    path = tmp_path / 'session.jsonl'
+    with contextlib.redirect_stdout(NullOutput()):
+        ui = TextUI('Polly', 'hard', seed=3)
+        ui.record(str(path))
+        ui.timer.interval = 0.001
+        ui.running = True
+        ui.timer.start()
+        deadline = time.monotonic() + 0.5
+        for command in itertools.cycle(COMMANDS):
+            if time.monotonic() > deadline:
+                break
+            ui.dispatch(command)
+            time.sleep(0.0005)
+        ui.timer.stop()
+        ui._shutdown()
+    matched, replayed = replay(path)
+    assert matched
+    assert replayed.counts['tick'] > 20
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from game.scheduler import Scheduler, VirtualClock
+
+def virtual():
+    clock = VirtualClock()
+    return Scheduler(clock), clock
+
+def test_jobs_run_in_deadline_order_at_their_deadlines():
+    scheduler, clock = virtual()
+    runs = []
+    scheduler.call_later(5, lambda name: runs.append((name, clock.now())), 'late')
+    scheduler.call_every(2, lambda: runs.append(('tick', clock.now())))
+    cancelled = scheduler.call_later(3, runs.append, 'cancelled')
+    cancelled.cancel()
+    scheduler.advance(6)
+    assert runs == [('tick', 2), ('tick', 4), ('late', 5), ('tick', 6)]
+    assert clock.now() == 6
+
+def test_periodic_deadlines_do_not_drift():
+    scheduler, clock = virtual()
+    deadlines = []
+    job = scheduler.call_every(1.5, lambda: deadlines.append(job.deadline))
+    # Pumped late each time, like a busy loop would be
+    for now in (1.7, 3.4, 4.6):
+        clock.time = now
+        scheduler.run_pending()
+    assert deadlines == [3.0, 4.5, 6.0]
+
+@pytest.mark.parametrize('policy, runs', [('catchup', 4), ('skip', 1)])
+def test_late_policy(policy, runs):
+    scheduler, clock = virtual()
+    calls = []
+    job = scheduler.call_every(1, calls.append, None, policy=policy)
+    clock.time = 4.2
+    assert scheduler.run_pending() == pytest.approx(0.8)
+    assert len(calls) == runs
+    assert job.deadline == 5
+    assert job.lateness == pytest.approx(0.2 if policy == 'catchup' else 3.2)
+
+def test_stop_wakes_the_thread_waiting_for_a_far_deadline():
+    scheduler = Scheduler()
+    fired = threading.Event()
+    scheduler.call_later(0.01, fired.set)
+    scheduler.call_later(3600, fired.clear)
+    scheduler.start()
+    assert fired.wait(2)
+    started = time.monotonic()
+    scheduler.stop()
+    assert time.monotonic() - started < 1
+    assert fired.is_set()
+
+def test_invalid_arguments():
+    scheduler, _ = virtual()
+    with pytest.raises(ValueError):
+        scheduler.call_every(0, print)
+    with pytest.raises(ValueError):
+        scheduler.call_every(1, print, policy='later')
+    with pytest.raises(ValueError):
+        scheduler.start()
+    with pytest.raises(ValueError):
+        Scheduler().advance(1)
@@ -0,0 +1,56 @@
+import asyncio
+import socket
+
+from ui.server import GameServer
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+async def play(port, lines):
+    for _ in range(100):
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            break
+        except OSError:
+            await asyncio.sleep(0.02)
+    writer.write(''.join(line + '\n' for line in lines).encode())
+    await writer.drain()
+    output = await asyncio.wait_for(reader.read(), 10)
+    writer.close()
+    return output.decode()
+
+async def sessions(*games):
+    port = free_port()
+    server = GameServer('127.0.0.1', port)
+    task = asyncio.create_task(server.serve_forever())
+    try:
+        return await asyncio.gather(*(play(port, lines) for lines in games)), server
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+def test_sessions_keep_their_own_game_and_output():
+    (kiwi, mango), server = asyncio.run(sessions(
+        ['Kiwi', 'hard', 'feed', 'status', 'exit'],
+        ['Mango', '', 'buyfeed 2', 'status', 'exit'],
+    ))
+    assert "Welcome, pet owner of Kiwi!" in kiwi
+    assert "Difficulty set to hard" in kiwi
+    assert "Welcome, pet owner of Mango!" in mango
+    assert "Difficulty set to normal" in mango
+    assert "Mango" not in kiwi and "Kiwi" not in mango
+    assert "Coins=20 | Feed=4" in kiwi
+    assert "Coins=10 | Feed=7" in mango
+    assert kiwi.rstrip().endswith("Game over. Goodbye!")
+    assert not server.sessions
+    # Their timers left the shared scheduler when they ended
+    assert server.scheduler.next_deadline() is None
+
+def test_history_export_is_disabled():
+    (output,), _ = asyncio.run(sessions(['Polly', '', 'history export stats.csv', 'exit']))
+    assert "Exporting is not available in this game." in output
@@ -0,0 +1,45 @@
+import math
+import random
+
+import pytest
+
+from game.timing_wheel import TimingWheel
+
+@pytest.mark.parametrize('seed', range(5))
+def test_timers_fire_in_order_at_their_slot(seed):
+    # A small wheel, so timers cascade between levels and pass through the overflow list
+    rng = random.Random(seed)
+    wheel = TimingWheel(resolution=0.5, size=4, levels=2)
+    fired, expected = [], []
+    for n in range(300):
+        delay = rng.choice((0, 0.2, 1, 7.5, 30, 90)) * rng.random()
+        timer = wheel.schedule(delay, lambda n: fired.append((n, wheel.now)), n)
+        if rng.random() < 0.2:
+            timer.cancel()
+        else:
+            expected.append((timer.expires, n))
+    assert [t.args[0] for t in wheel.timers()] == [n for _, n in sorted(expected)]
+    while wheel.pending:
+        wheel.advance(rng.choice((0.25, 0.5, 3.0, 20.0)))
+    assert [n for n, _ in fired] == [n for _, n in sorted(expected)]
+    assert all(now == expires * 0.5 for (_, now), (expires, _) in zip(fired, sorted(expected)))
+
+def test_delay_rounds_up_to_a_later_slot():
+    wheel = TimingWheel(resolution=0.5)
+    wheel.advance(1.2)
+    assert wheel.schedule(0, print).expires == 3
+    assert wheel.schedule(1.0, print).expires == math.ceil(2.2 / 0.5)
+
+def test_callbacks_can_schedule_timers_due_in_the_same_advance():
+    wheel = TimingWheel(resolution=1.0)
+    fired = []
+
+    def repeat(n):
+        fired.append((n, wheel.now))
+        if n < 3:
+            wheel.schedule(2, repeat, n + 1)
+
+    wheel.schedule(1, repeat, 0)
+    wheel.advance(10)
+    assert fired == [(0, 1.0), (1, 3.0), (2, 5.0), (3, 7.0)]
+    assert wheel.now == 10 and len(wheel) == 0
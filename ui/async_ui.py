@@ -0,0 +1,233 @@
+import asyncio
+import io
+import os
+import sys
+import threading
+import traceback
+
+from game.minigames import Wait, Clear, clear_screen
+from ui.text_ui import TextUI
+from utils.output import Renderer
+
+async def watch_catalog(catalog, interval=2.0):
+    """
+    Poll an event catalog for edits from the event loop until cancelled: a cheap stat
+    per interval, and a reload (on the loop) only when the file has changed.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        catalog.poll()
+
+class AsyncTextUI(TextUI):
+    """
+    Single-threaded variant of the text interface:
+    reading stdin, periodic pet ticks and minigame waits are all coroutines on one asyncio loop.
+    Ticks stay on schedule while the player is typing, and since pet and economy state are only
+    touched from the loop, no locks are needed.
+    """
+
+    def __init__(self, name=None, difficulty=None, save_dir=None, metrics=None, scheduler=None,
+                 seed=None):
+        super().__init__(name, difficulty, save_dir, metrics, scheduler, seed)
+        self._lines = None
+        self._eof = False
+        self._pending = b''
+        self._watching = False
+
+    def run(self):
+        """
+        Start the game UI on a new asyncio event loop.
+        """
+        asyncio.run(self.run_async())
+
+    async def run_async(self):
+        """
+        Main coroutine: read commands while the tick coroutine updates the pet on schedule.
+        """
+        loop = asyncio.get_running_loop()
+        self._lines = asyncio.Queue()
+        self._start_reader(loop)
+        console = sys.stdout
+        self.renderer = Renderer(console)
+        sys.stdout = self.renderer
+        print(f"Welcome, pet owner of {self.pet.name}! Let's start the game ~")
+        self._cmd_help()
+        self.running = True
+        ticker = asyncio.create_task(self._tick_loop())
+        watcher = asyncio.create_task(watch_catalog(self.events.catalog))
+        try:
+            while self.running and self.pet.is_alive():
+                line = await self._ainput(self.PROMPT)
+                if line is None:
+                    print("Exiting game.")
+                    break
+                result = self.dispatch(line)
+                if asyncio.iscoroutine(result):
+                    await result
+        finally:
+            ticker.cancel()
+            watcher.cancel()
+            self._stop_reader(loop)
+            self._shutdown()
+            sys.stdout = console
+            self.renderer.render()
+            self.renderer = None
+        print("Game over. Goodbye!")
+
+    def dispatch(self, line):
+        """
+        TextUI.dispatch; a command that is a coroutine (earn) is wrapped so the game is
+        saved once it has finished rather than when it starts.
+        """
+        result = super().dispatch(line)
+        if asyncio.iscoroutine(result):
+            return self._finish(result)
+        return result
+
+    async def _finish(self, command):
+        result = await command
+        if self.store:
+            self.store.save(self)
+        return result
+
+    async def _tick_loop(self):
+        """
+        Call _tick every interval seconds against loop-time deadlines, so the time spent
+        in a tick does not push later ticks back. A tick that raises is reported on stderr
+        and the pet keeps ticking.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.interval
+        while self.running:
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            if self.metrics:
+                self.metrics.observe('tick_lag', loop.time() - deadline)
+            deadline += self.interval
+            try:
+                self._tick(self.interval)
+            except Exception:
+                print("[Tick error] the pet will keep ticking:", file=sys.stderr)
+                traceback.print_exc()
+            self._show_tick()
+            if not self.running:
+                # Wake the command loop so it notices the game is over
+                self._lines.put_nowait('')
+
+    def _show_tick(self):
+        """
+        Show a tick's messages as one frame on their own line, then redraw the prompt being
+        answered. A frame held back by the renderer's rate limit is shown a moment later.
+        """
+        renderer = self.renderer
+        over = not self.running
+        if not renderer.render(redraw=True, force=over, final=over) and renderer.pending():
+            asyncio.get_running_loop().call_later(renderer.min_interval, renderer.render, True)
+
+    async def _ainput(self, prompt):
+        """
+        Coroutine version of input(): returns the next line without its newline, or None at end of input.
+        The prompt goes out in one write with the output of the previous command.
+        """
+        if self._eof:
+            return None
+        self.renderer.prompt = prompt
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        line = await self._lines.get()
+        if line is None:
+            self._eof = True
+        return line
+
+    async def _aread(self, prompt):
+        """
+        Read a minigame answer ('' at end of input), recorded like TextUI._read.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        reply = await self._ainput(prompt) or ''
+        if self.recorder:
+            self.recorder.answer(reply, loop.time() - started)
+        return reply
+
+    def _start_reader(self, loop):
+        """
+        Watch a terminal stdin on the event loop. Piped input (which input() may already have
+        buffered ahead) and loops that cannot watch a console handle (e.g. on Windows) fall back
+        to a helper thread that only reads lines and hands them to the loop.
+        """
+        try:
+            if not sys.stdin.isatty():
+                raise io.UnsupportedOperation("stdin is not a terminal")
+            loop.add_reader(sys.stdin.fileno(), self._on_stdin)
+            self._watching = True
+        except (NotImplementedError, ValueError, OSError, io.UnsupportedOperation):
+            self._watching = False
+            threading.Thread(target=self._read_lines, args=(loop,), daemon=True).start()
+
+    def _stop_reader(self, loop):
+        if self._watching:
+            loop.remove_reader(sys.stdin.fileno())
+            self._watching = False
+
+    def _on_stdin(self):
+        """
+        Reader callback: split whatever is available on stdin into lines and queue them.
+        Reads the raw descriptor so no lines get stuck in Python's own stdin buffer.
+        """
+        data = os.read(sys.stdin.fileno(), 4096)
+        if not data:
+            if self._pending:
+                self._lines.put_nowait(self._pending.decode(errors='replace'))
+            self._lines.put_nowait(None)
+            self._stop_reader(asyncio.get_running_loop())
+            return
+        *lines, self._pending = (self._pending + data).split(b'\n')
+        for line in lines:
+            self._lines.put_nowait(line.decode(errors='replace').rstrip('\r'))
+
+    def _read_lines(self, loop):
+        for line in sys.stdin:
+            loop.call_soon_threadsafe(self._lines.put_nowait, line.rstrip('\r\n'))
+        loop.call_soon_threadsafe(self._lines.put_nowait, None)
+
+    async def _cmd_earn(self, *args):
+        """
+        Choose a mini-game to earn coins.
+        """
+        print("Please select a mini-game to earn coins:")
+        for key, (name, _) in self.minigames.items():
+            print(f"  {key}. {name}")
+        choice = (await self._aread("Enter number to choose: ")).strip()
+        if choice in self.minigames:
+            _, game = self.minigames[choice]
+            await self._play(game)
+        else:
+            print("Invalid choice. Type help to view commands.")
+
+    async def _play(self, game):
+        """
+        Drive a minigame's steps() generator on the loop: waits become asyncio.sleep and
+        prompts read from the shared line queue, so pet ticks keep running during the game.
+        """
+        steps = game.steps()
+        reply = None
+        started = asyncio.get_running_loop().time()
+        try:
+            while True:
+                request = steps.send(reply)
+                reply = None
+                if isinstance(request, Wait):
+                    # Show what the minigame printed before the pause
+                    sys.stdout.flush()
+                    await asyncio.sleep(request.seconds)
+                    if self.recorder:
+                        self.recorder.waited(request.seconds)
+                elif isinstance(request, Clear):
+                    clear_screen()
+                else:
+                    reply = await self._aread(request.prompt)
+        except StopIteration:
+            pass
+        if self.metrics:
+            self.metrics.observe(f'minigame_{type(game).__name__}',
+                                 asyncio.get_running_loop().time() - started)
@@ -0,0 +1,95 @@
+import contextlib
+import sys
+import time
+
+from game.recording import read_recording, session_state
+from game.scheduler import Scheduler, VirtualClock
+from ui.text_ui import TextUI
+from utils.helpers import NullOutput
+
+class ReplayUI(TextUI):
+    """
+    Re-executes a session recorded with TextUI.record: the same seed, pet and difficulty,
+    then every tick, command and minigame answer in recorded order, at full speed.
+    Minigame waits and answer times move a VirtualClock, so nothing sleeps. At the end the
+    final state is compared with the one stored in the recording.
+    Useful for reproducing a bug report step by step, and as a fixed workload for profiling
+    (with metrics) or benchmarking (with quiet).
+    """
+    def __init__(self, path, metrics=None, quiet=False):
+        self.header, self.entries = read_recording(path)
+        super().__init__(self.header['name'], self.header['difficulty'], metrics=metrics,
+                         scheduler=Scheduler(VirtualClock()), seed=self.header['seed'])
+        self.quiet = quiet
+        self.clock = VirtualClock()
+        for _, game in self.minigames.values():
+            game.clock = self.clock
+        self._stream = iter(self.entries)
+        self.expected = None
+        self.counts = {'tick': 0, 'command': 0, 'input': 0}
+
+    def _replay_tick(self, entry):
+        self.counts['tick'] += 1
+        self._tick(entry[2])
+
+    def _read(self, prompt):
+        """
+        Answer a prompt with the next recorded input, running the ticks recorded before it.
+        """
+        for entry in self._stream:
+            kind = entry[0]
+            if kind == 'input':
+                self.counts['input'] += 1
+                self.clock.time += entry[3]
+                return entry[2]
+            if kind != 'tick':
+                raise ValueError(f"Replay diverged: a minigame prompt was answered by {entry}")
+            self._replay_tick(entry)
+        raise EOFError("end of recording")
+
+    def _sleep(self, seconds):
+        self.clock.time += seconds
+
+    def replay(self):
+        """
+        Run the whole recording. Returns (True if the final state matches, seconds taken).
+        """
+        self.running = True
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(NullOutput() if self.quiet else sys.stdout):
+            try:
+                for entry in self._stream:
+                    kind = entry[0]
+                    if kind == 'tick':
+                        self._replay_tick(entry)
+                    elif kind == 'command':
+                        self.counts['command'] += 1
+                        self.dispatch(entry[2])
+                    elif kind == 'end':
+                        self.expected = entry[2]
+                    else:
+                        raise ValueError(f"Replay diverged: unexpected {entry}")
+            except EOFError:
+                pass
+        elapsed = time.perf_counter() - started
+        self._shutdown()
+        return self.expected is None or session_state(self) == self.expected, elapsed
+
+    def run(self):
+        """
+        Replay the recording and print a summary; returns True if the result matched.
+        """
+        matched, elapsed = self.replay()
+        self._display_status()
+        events = sum(self.counts.values())
+        rate = events / elapsed if elapsed else 0
+        print(f"Replayed {self.counts['command']} commands, {self.counts['tick']} ticks and "
+              f"{self.counts['input']} minigame answers in {elapsed:.3f}s ({rate:,.0f} entries/s).")
+        if self.expected is None:
+            print("The recording has no final state (the session did not end cleanly); nothing to compare.")
+        elif matched:
+            print("Final state matches the recording.")
+        else:
+            print(f"Final state differs from the recording:\n  recorded {self.expected}\n"
+                  f"  replayed {session_state(self)}")
+        return matched
@@ -0,0 +1,186 @@
+import contextlib
+import operator
+import re
+import sys
+import time
+
+from game.minigames import Bot, BOTS, run_headless
+from game.scheduler import Scheduler, VirtualClock
+from ui.text_ui import TextUI
+from utils.helpers import NullOutput
+
+# "feed x10": run a command (or macro) ten times
+_REPEAT = re.compile(r'^(.*?)\s+x(\d+)$')
+
+_COMPARISONS = {
+    '<': operator.lt, '<=': operator.le, '>': operator.gt,
+    '>=': operator.ge, '==': operator.eq, '!=': operator.ne,
+}
+
+class ScriptedUI(TextUI):
+    """
+    Non-interactive TextUI that runs a command script against a virtual clock.
+    Script lines are the usual commands, plus:
+        <command> x<n>         repeat a command or macro n times, e.g. "feed x10"
+        a; b; c                several commands on one line
+        macro <name> ... end   define a macro, then run it by name
+        wait <seconds>         let game time pass; ticks run as they come due
+        expect <stat> <op> <n> check hunger/happiness/energy/health/coins/feed, e.g. "expect coins >= 10"
+        # ...                  comment
+    Minigames ("money <number> [novice|casual|expert]") are played by a bot with its own
+    random stream, so with a seed the whole run is reproducible.
+    Nothing sleeps and nothing is asked, so scripts run as fast as the commands themselves.
+    With quiet, command output is discarded and only failed expectations and the final
+    summary are shown.
+    """
+    def __init__(self, name='Polly', difficulty='normal', save_dir=None, metrics=None,
+                 bot='expert', quiet=False, seed=None):
+        self.scheduler = Scheduler(VirtualClock())
+        super().__init__(name, difficulty, save_dir, metrics, scheduler=self.scheduler, seed=seed)
+        self.bot = bot
+        self.quiet = quiet
+        self.macros = {}
+        self.failures = 0
+        self.executed = 0
+        self._console = sys.stdout   # Where failed expectations go, even when quiet
+        self.commands['wait'] = self._cmd_wait
+        self.commands['expect'] = self._cmd_expect
+        for _, game in self.minigames.values():
+            game.clock = self.scheduler.clock
+
+    def _cmd_wait(self, *args):
+        """
+        Let game time pass: wait <seconds>
+        """
+        try:
+            seconds = float(args[0])
+        except (IndexError, ValueError):
+            print("Usage: wait <seconds>")
+            return
+        self.scheduler.advance(seconds)
+
+    def _cmd_expect(self, *args):
+        """
+        Check a stat: expect <hunger|happiness|energy|health|coins|feed> <op> <value>
+        """
+        try:
+            stat, op, value = args
+            compare = _COMPARISONS[op]
+            value = float(value)
+        except (ValueError, KeyError):
+            print("Usage: expect <stat> <|<=|>|>=|==|!= <value>")
+            self.failures += 1
+            return
+        if stat == 'coins':
+            actual = self.economy.coins
+        elif stat == 'feed':
+            actual = self.economy.feed_stock
+        elif stat in ('hunger', 'happiness', 'energy', 'health'):
+            actual = getattr(self.pet, stat)
+        else:
+            print(f"Unknown stat: {stat}")
+            self.failures += 1
+            return
+        if not compare(actual, value):
+            message = f"[Expect failed] {stat} is {actual}, expected {op} {value:g}"
+            print(message, file=self._console)
+            self.failures += 1
+
+    def _cmd_earn(self, *args):
+        """
+        Play a mini-game with a bot: money <number> [novice|casual|expert]
+        """
+        game = self.minigames.get(args[0]) if args else None
+        skill = args[1] if len(args) > 1 else self.bot
+        if game is None or skill not in BOTS:
+            print(f"Usage: money <{'|'.join(self.minigames)}> [{'|'.join(BOTS)}]")
+            return
+        _, game = game
+        run_headless(game.steps(), Bot(*BOTS[skill], self.random.stream('bot')), self.scheduler.clock)
+        # Ticks that came due while the bot was playing
+        self.scheduler.advance(0)
+
+    def expand(self, lines):
+        """
+        Turn script lines into single commands: strip comments, split on ';',
+        collect macro definitions and expand repeats and macro calls.
+        """
+        recording = None
+        for line in lines:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            if recording is not None:
+                if line == 'end':
+                    recording = None
+                else:
+                    recording.append(line)
+                continue
+            if line.startswith('macro '):
+                recording = self.macros[line.split(None, 1)[1].strip()] = []
+                continue
+            for command in line.split(';'):
+                yield from self._expand_command(command.strip())
+
+    def _expand_command(self, command, calls=()):
+        """
+        Expand one command; calls are the macros being expanded around it.
+        """
+        count = 1
+        match = _REPEAT.match(command)
+        if match:
+            command, count = match.group(1), int(match.group(2))
+        body = self.macros.get(command)
+        if body is None:
+            for _ in range(count):
+                yield command
+            return
+        if command in calls:
+            self._script_error(f"macro {command} calls itself ({' -> '.join(calls + (command,))}), skipped")
+            return
+        for _ in range(count):
+            for line in body:
+                for part in line.split(';'):
+                    yield from self._expand_command(part.strip(), calls + (command,))
+
+    def _script_error(self, message):
+        # Shown and counted like a failed expectation, even when quiet
+        print(f"[Script error] {message}", file=self._console)
+        self.failures += 1
+
+    def run_script(self, lines):
+        """
+        Run a script (any iterable of lines, read lazily) until it ends, the game is over or
+        an exit command. Returns the number of failed expectations and script errors.
+        """
+        print(f"Running script for {self.pet.name} ({self.difficulty}).")
+        self.timer.start()
+        self.running = True
+        started = time.perf_counter()
+        self._console = sys.stdout
+        with contextlib.redirect_stdout(NullOutput() if self.quiet else sys.stdout):
+            for command in self.expand(lines):
+                if not (self.running and self.pet.is_alive()):
+                    break
+                if command:
+                    self.dispatch(command)
+                    self.executed += 1
+        elapsed = time.perf_counter() - started
+        self.timer.stop()
+        self._shutdown()
+        if not self.pet.is_alive():
+            print("Game over.")
+        self._display_status()
+        rate = self.executed / elapsed if elapsed else 0
+        print(f"Script done: {self.executed} commands in {elapsed:.3f}s ({rate:,.0f}/s), "
+              f"{self.scheduler.clock.now():.0f}s of game time, {self.failures} failed expectation(s).")
+        return self.failures
+
+    def run(self, path='-'):
+        """
+        Run the script in the given file, or from stdin for '-'.
+        """
+        if path == '-':
+            return self.run_script(sys.stdin)
+        with open(path, encoding='utf-8') as f:
+            return self.run_script(f)
@@ -0,0 +1,230 @@
+import asyncio
+import contextvars
+import functools
+import sys
+
+from game.history import StatHistory
+from game.scheduler import Scheduler
+from game.catalog import load_catalog
+from ui.async_ui import AsyncTextUI, watch_catalog
+from ui.text_ui import DIFFICULTY_INTERVALS
+from utils.output import Renderer
+
+# Renderer of the session whose code is running in the current asyncio task
+_session_output = contextvars.ContextVar('session_output', default=None)
+
+class SessionStdout:
+    """
+    Stand-in for sys.stdout while the server runs: print() calls and messages made by the
+    game subsystems are routed to the renderer of the session that is currently running,
+    anything else goes to the real console.
+    """
+    def __init__(self, console):
+        self.console = console
+
+    def write(self, text):
+        renderer = _session_output.get()
+        return (renderer if renderer is not None else self.console).write(text)
+
+    def post(self, text, kind='info', key=None):
+        renderer = _session_output.get()
+        if renderer is not None:
+            renderer.post(text, kind, key)
+        else:
+            print(text, file=self.console)
+
+    def forget(self, key):
+        renderer = _session_output.get()
+        if renderer is not None:
+            renderer.forget(key)
+
+    def flush(self):
+        renderer = _session_output.get()
+        (renderer if renderer is not None else self.console).flush()
+
+class SocketOutput:
+    """
+    File-like writer of text to a client connection, the target of a session's Renderer.
+    """
+    def __init__(self, writer):
+        self.writer = writer
+
+    def write(self, text):
+        if not self.writer.is_closing():
+            self.writer.write(text.encode())
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+class Session(AsyncTextUI):
+    """
+    One player's game over a TCP connection: the usual commands table, pet, economy and
+    event system, with input read from the socket and output written back to it.
+    The game timer runs on the server's shared scheduler instead of a thread of its own.
+    """
+    # Stop queueing tick messages for a client that is not reading once this much is unsent
+    WRITE_HIGH_WATER = 64 * 1024
+    # A server holds many sessions: keep about 17 KB of history per pet (the last 60 ticks
+    # exactly, summaries going back 30,000 ticks, about three days) instead of the default
+    HISTORY = functools.partial(StatHistory, raw=60, buckets=30, levels=3)
+    # Remote players must not write files on the server
+    EXPORT_DIR = None
+
+    def __init__(self, server, reader, writer, name, difficulty):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.dropped = 0
+        # Route this connection task's prints to the session before any game code runs
+        _session_output.set(Renderer(SocketOutput(writer)))
+        super().__init__(name, difficulty, scheduler=server.scheduler)
+        self.renderer = _session_output.get()
+
+    def _on_timer(self, delta):
+        """
+        Timer callback: update this session's pet and push any messages to the client.
+        """
+        token = _session_output.set(self.renderer)
+        try:
+            self._tick(delta)
+        finally:
+            _session_output.reset(token)
+        if self._write_buffer_size() > self.WRITE_HIGH_WATER:
+            # Slow reader: drop tick chatter rather than buffer it without bound
+            self.dropped += 1
+            if self.metrics:
+                self.metrics.incr('dropped_frames')
+            self.renderer.discard()
+        else:
+            self.renderer.render(redraw=True, final=not self.running)
+        if not self.running:
+            self.timer.stop()
+            self.writer.close()
+
+    def _write_buffer_size(self):
+        transport = self.writer.transport
+        return transport.get_write_buffer_size() if not transport.is_closing() else 0
+
+    async def _send(self):
+        """
+        Write the pending output to the client as one frame, waiting for the socket to drain
+        when its buffer is full.
+        """
+        self.renderer.render()
+        if self._write_buffer_size() > self.WRITE_HIGH_WATER:
+            await self.writer.drain()
+
+    async def _ainput(self, prompt):
+        """
+        Send pending output and the prompt, then read the next line from the client.
+        """
+        if self._eof or self.writer.is_closing():
+            return None
+        self.renderer.prompt = prompt
+        self.renderer.write(prompt)
+        await self._send()
+        try:
+            line = await self.reader.readline()
+        except ConnectionError:
+            line = b''
+        if not line:
+            self._eof = True
+            return None
+        return line.decode(errors='replace').rstrip('\r\n')
+
+    async def run_async(self):
+        """
+        Command loop for this connection; ticks are driven by the server scheduler.
+        """
+        print(f"Welcome, pet owner of {self.pet.name}! Let's start the game ~")
+        self._cmd_help()
+        self.running = True
+        self.timer.start()
+        self.server.wake()
+        try:
+            while self.running and self.pet.is_alive():
+                line = await self._ainput(self.PROMPT)
+                if line is None:
+                    break
+                result = self.dispatch(line)
+                if asyncio.iscoroutine(result):
+                    await result
+            if not self.writer.is_closing():
+                print("Game over. Goodbye!")
+                await self._send()
+        finally:
+            self.running = False
+            self.timer.stop()
+
+class GameServer:
+    """
+    Hosts many games in one process over a line-oriented TCP protocol.
+    All sessions share one Scheduler, pumped from the asyncio loop, so idle sessions
+    cost a heap entry and a parked connection rather than a thread each.
+    """
+    def __init__(self, host='127.0.0.1', port=7777):
+        self.host = host
+        self.port = port
+        self.scheduler = Scheduler()
+        self.sessions = set()
+        self._wakeup = None
+
+    def wake(self):
+        """
+        Let the scheduler loop recompute its sleep after a job was added.
+        """
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def _run_scheduler(self):
+        while True:
+            delay = self.scheduler.run_pending()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _handle(self, reader, writer):
+        """
+        Connection handler: ask for a pet name and difficulty, then run the session.
+        """
+        try:
+            writer.write(b"Pet name (default Polly): ")
+            name = (await reader.readline()).decode(errors='replace').strip() or "Polly"
+            writer.write(f"Difficulty ({'/'.join(DIFFICULTY_INTERVALS)}) [normal]: ".encode())
+            difficulty = (await reader.readline()).decode(errors='replace').strip().lower() or 'normal'
+            session = Session(self, reader, writer, name, difficulty)
+            self.sessions.add(session)
+            try:
+                await session.run_async()
+            finally:
+                self.sessions.discard(session)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve_forever(self):
+        """
+        Accept connections until cancelled.
+        """
+        self._wakeup = asyncio.Event()
+        console = sys.stdout
+        sys.stdout = SessionStdout(console)
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        ticker = asyncio.create_task(self._run_scheduler())
+        # One watcher for the catalog all sessions share
+        watcher = asyncio.create_task(watch_catalog(load_catalog()))
+        print(f"Parrot pet server listening on {self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            ticker.cancel()
+            watcher.cancel()
+            sys.stdout = console
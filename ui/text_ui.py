@@ -1,12 +1,37 @@
-from game.pet import Pet
+import inspect
+import os
+import sys
+import threading
+import time
+
 from game.economy import Economy
-from game.events import RandomEventSystem
-from game.travel import TravelSystem
-from game.interaction import InteractionSystem
-from game.veterinary import Veterinary
+from game.effects import FEED
+from game.history import StatHistory
+from game.household import Household
 from game.timer import GameTimer
 from game.minigames import ReactionGame, MemoryGame, MathQuizGame, WordScrambleGame
-from utils.helpers import print_banner
+from game.persistence import SessionStore
+from game.recording import Recorder, session_state
+from game.rng import RandomStreams
+from utils.helpers import print_banner, sparkline
+from utils.output import Renderer, emit, forget
+
+try:
+    # Line editing at the prompt, and the line typed so far for redrawing it after a tick
+    import readline
+except ImportError:
+    readline = None
+
+# Mapping difficulty to update interval (seconds between ticks)
+DIFFICULTY_INTERVALS = {'easy': 12.0, 'normal': 8.0, 'hard': 6.0}
+
+def _clock(seconds):
+    """
+    Format game time as h:mm:ss, or m:ss under an hour.
+    """
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{secs:02}" if hours else f"{minutes}:{secs:02}"
 
 class TextUI:
     """
@@ -15,36 +40,73 @@ class TextUI:
     event logs, minigames, status viewing and veterinary visits.
     """
     PROMPT = "[Command (type help to view commands)]> "
+    # Commands that act on one pet: a last argument of a pet name or 'all' picks the pets
+    TARGETED = ('feed', 'play', 'interact', 'travel', 'memories', 'events', 'vet', 'status', 'history')
+    # Targeted commands that only look, so they may also name pets no longer in your care
+    LOOK = ('status', 'history')
+    # Makes the stat history of each pet (see Household)
+    HISTORY = StatHistory
+    # Directory that history export writes into; None turns exporting off
+    EXPORT_DIR = 'exports'
+    EXPORT_TYPES = ('.csv', '.json')
 
-    def __init__(self):
+    def __init__(self, name=None, difficulty=None, save_dir=None, metrics=None, scheduler=None,
+                 seed=None):
+        """
+        Set up a new game. The pet name and difficulty are asked for interactively
+        unless they are passed in. With save_dir the game is saved there as it runs,
+        and a game already saved there is resumed. With a Metrics object, ticks, events,
+        commands and minigames are timed (see the stats command). Ticks run on the given
+        scheduler (e.g. one driven by a VirtualClock), or on a timer thread of their own.
+        Events, travel and each minigame draw from their own random stream derived from
+        seed (a fresh one by default), so a seeded game can be reproduced.
+        More pets can join the household with the adopt command; they all share the economy.
+        """
         print_banner()
+        self.store = SessionStore(save_dir) if save_dir else None
+        saved = self.store.read_snapshot() if self.store else None
+        if saved:
+            name, difficulty = saved.name, saved.difficulty
+            print(f"Resuming the saved game of {name}.")
         # Enter the pet name and game difficulty, the default difficulty is normal
-        name = input("Pet name (default Polly): ").strip() or "Polly"
-        diff_input = input("Difficulty (easy/normal/hard) [normal]: ").strip().lower()
-        if diff_input not in ('easy', 'normal', 'hard'):
-            print(f"Unknown difficulty '{diff_input}', defaulting to 'normal'.")
+        if name is None:
+            name = input("Pet name (default Polly): ").strip() or "Polly"
+        if difficulty is None:
+            difficulty = input("Difficulty (easy/normal/hard) [normal]: ").strip().lower()
+        if difficulty not in DIFFICULTY_INTERVALS:
+            print(f"Unknown difficulty '{difficulty}', defaulting to 'normal'.")
             diff = 'normal'
         else:
-            diff = diff_input
-        # Mapping difficulty to update interval
-        interval_map = {'easy': 12.0, 'normal': 8.0, 'hard': 6.0}
-        interval = interval_map.get(diff, 8.0)
+            diff = difficulty
+        interval = DIFFICULTY_INTERVALS[diff]
         print(f"Difficulty set to {diff}, update interval {interval}s.")
+        self.difficulty = diff
+        self.interval = interval
 
-        self.pet = Pet(name)
+        self.random = RandomStreams(seed)
+        stream = self.random.stream
         self.economy = Economy()
-        self.events = RandomEventSystem(self.pet, self.economy)
-        self.travel = TravelSystem(self.pet)
-        self.interact = InteractionSystem(self.pet, self.economy)
-        self.vet = Veterinary(self.pet, self.economy)
+        # Commands act on the active pet, whose systems are self.pet, self.events, ...
+        self.household = Household(self.economy, self.random, self.HISTORY)
+        self._focus(self.household.adopt(name))
         self.minigames = {
-            '1': ('Reaction Speed', ReactionGame(self.economy)),
-            '2': ('Sequence Memory', MemoryGame(self.economy)),
-            '3': ('Math Quiz', MathQuizGame(self.economy)),
-            '4': ('Word Scramble', WordScrambleGame(self.economy)),
+            '1': ('Reaction Speed', ReactionGame(self.economy, rng=stream('reaction'))),
+            '2': ('Sequence Memory', MemoryGame(self.economy, rng=stream('memory'))),
+            '3': ('Math Quiz', MathQuizGame(self.economy, rng=stream('math'))),
+            '4': ('Word Scramble', WordScrambleGame(self.economy, rng=stream('scramble'))),
         }
-        self.timer = GameTimer(interval, self._tick)
+        self.resumed = bool(saved)
+        if saved:
+            self._focus(self.store.restore(self))
+        elif self.store:
+            self.store.reset()
+        self.metrics = metrics
+        self.recorder = None
+        self.renderer = None    # Batches the console output while run() is in progress
         self.running = False
+        # Held while a command or a timer tick changes the game, so the two never interleave
+        # and the store and a recording see them in the order they took effect
+        self._turn = threading.RLock()
         self.commands = {
             'feed':     self._cmd_feed,
             'buyfeed':  self._cmd_buyfeed,
@@ -57,52 +119,163 @@ class TextUI:
             'money':    self._cmd_earn,
             'minigames': self._cmd_earn,
             'status':   self._cmd_status,
+            'history':  self._cmd_history,
+            'adopt':    self._cmd_adopt,
+            'select':   self._cmd_select,
+            'stats':    self._cmd_stats,
             'help':     self._cmd_help,
             'exit':     self._cmd_exit,
         }
+        if metrics:
+            self._instrument(metrics)
+        self.timer = GameTimer(interval, self._on_timer, scheduler=scheduler, metrics=metrics)
+
+    def _instrument(self, metrics):
+        """
+        Replace the hot callables of this game with timed wrappers.
+        Nothing is wrapped when profiling is off, so it costs nothing then.
+        """
+        self._tick = metrics.wrap('tick', self._tick)
+        # Per tick: the updates of all pets, and the events of all pets, each timed as one call
+        household = self.household
+        household.update_pets = metrics.wrap('pet_update', household.update_pets)
+        household.run_events = metrics.wrap('event_trigger', household.run_events)
+        # Counters: ticks and commands here, fired events by each pet's event system
+        household.metrics = metrics
+        for member in household:
+            member.events.metrics = metrics
+        for name, fn in self.commands.items():
+            self.commands[name] = metrics.wrap(f'cmd_{name}', fn)
+        for _, game in self.minigames.values():
+            game.play = metrics.wrap(f'minigame_{type(game).__name__}', game.play)
+
+    def tick(self, delta):
+        """
+        Advance the game by delta seconds now, as a timer tick does (for simulations and
+        tools that drive the game clock themselves).
+        """
+        with self._turn:
+            self._tick(delta)
 
     def _tick(self, delta):
         """
         Regular update callbacks: update pet status, trigger events, warnings, and handle game over.
         """
-        self.pet.update(delta)
-        self.events.trigger()
-        if self.pet.hunger >= 80:
-            print("[Warning] Hunger is too high! Remember to feed your pet.")
-        if self.pet.happiness <= 20:
-            print("[Warning] Happiness is too low! Consider interacting with your pet.")
+        if self.recorder:
+            self.recorder.tick(delta)
+        if self.metrics:
+            self.metrics.incr('ticks')
+        members = self.household.tick(delta)
+        if self.store:
+            self.store.save(self)
+        several = len(self.household) > 1
+        for member in members:
+            pet = member.pet
+            # In a household, say which pet a message is about
+            tag = f"[{pet.name}] " if several else ""
+            # Warnings repeat every tick while they hold; the renderer shows them now and then
+            hungry, unhappy = (pet.name, 'hunger'), (pet.name, 'happiness')
+            if pet.hunger >= 80:
+                emit(f"{tag}[Warning] Hunger is too high! Remember to feed your pet.", 'warning', hungry)
+            else:
+                forget(hungry)
+            if pet.happiness <= 20:
+                emit(f"{tag}[Warning] Happiness is too low! Consider interacting with your pet.", 'warning', unhappy)
+            else:
+                forget(unhappy)
+            if not pet.is_alive():
+                reason = getattr(pet, 'failure_reason', None)
+                if reason == 'protection':
+                    emit(f"{tag}We're sorry: Your pet has been taken by animal protection due to prolonged neglect.", 'game')
+                elif reason == 'death':
+                    emit(f"{tag}Regrettably: Your pet has passed away due to long-term health neglect.", 'game')
+                elif reason == 'neglect':
+                    emit(f"{tag}Sadly: Your pet has died due to extreme hunger or energy depletion.", 'game')
         if not self.pet.is_alive():
+            living = self.household.living()
+            if living:
+                self._focus(living[0])
+                print(f"{self.pet.name} is now the active pet.")
+                return
             self.timer.stop()
             self.running = False
-            reason = getattr(self.pet, 'failure_reason', None)
-            if reason == 'protection':
-                print("We're sorry: Your pet has been taken by animal protection due to prolonged neglect.")
-            elif reason == 'death':
-                print("Regrettably: Your pet has passed away due to long-term health neglect.")
-            elif reason == 'neglect':
-                print("Sadly: Your pet has died due to extreme hunger or energy depletion.")
             print("=== Final Pet Status ===")
             self._display_status()
+            self._display_history()
 
-    def _display_status(self):
+    def _on_timer(self, delta):
+        """
+        Timer callback: tick, then show the tick's messages as one frame over the prompt.
+        A frame held back by the renderer's rate limit is shown a moment later.
         """
-        Display the current status of the pet and economy.
+        self.tick(delta)
+        renderer = self.renderer
+        if renderer:
+            over = not self.running
+            if not renderer.render(redraw=True, force=over, final=over) and renderer.pending():
+                self.timer.scheduler.call_later(renderer.min_interval, renderer.render, True)
+
+    def _focus(self, member):
         """
-        print(f"{self.pet.name} | Hunger={self.pet.hunger:.1f} | Happiness={self.pet.happiness:.1f} | "
-              f"Energy={self.pet.energy:.1f} | Health={self.pet.health:.1f} | "
+        Make member the active pet that commands act on.
+        """
+        self.member = member
+        self.pet = member.pet
+        self.events = member.events
+        self.travel = member.travel
+        self.interact = member.interact
+        self.vet = member.vet
+        self.history = member.history
+
+    def _targets(self, cmd, args, active):
+        """
+        Split the arguments of a targeted command into the members it acts on and the rest.
+        A last argument of 'all' or a pet name picks the pets; otherwise it is the active one.
+        Only LOOK commands act on pets no longer in your care.
+        """
+        if not args:
+            return [active], args
+        last = args[-1]
+        look = cmd in self.LOOK
+        if last.lower() == 'all':
+            return (list(self.household) if look else self.household.living()), args[:-1]
+        member = self.household.get(last)
+        if member is None:
+            return [active], args
+        if not look and not member.pet.is_alive():
+            print(f"{member.pet.name} is no longer in your care.")
+            return [], args[:-1]
+        return [member], args[:-1]
+
+    def _for_each(self, members, fn, args, label):
+        """
+        Run a targeted command handler once per member, passing the member to act on.
+        The active pet is left alone, since the tick thread may change it meanwhile.
+        """
+        for member in members:
+            if label:
+                print(f"[{member.pet.name}]", end=' ')
+            fn(member, *args)
+
+    def _display_status(self, member=None):
+        """
+        Display the current status of the pet (the active one by default) and economy.
+        """
+        pet = (member or self.member).pet
+        print(f"{pet.name} | Hunger={pet.hunger:.1f} | Happiness={pet.happiness:.1f} | "
+              f"Energy={pet.energy:.1f} | Health={pet.health:.1f} | "
               f"Coins={self.economy.coins} | Feed={self.economy.feed_stock}")
 
-    def _cmd_feed(self, *args):
+    def _cmd_feed(self, member, *args):
         """
         Feed the pet: consume one feed unit and reduce hunger.
         """
         if self.economy.feed_stock <= 0:
             print("No feed left! Use buyfeed to purchase feed.")
             return
-        self.economy.feed_stock -= 1
-        self.pet.happiness = min(100, self.pet.happiness + 10)
-        self.pet.hunger = max(0, self.pet.hunger - 10)
+        FEED.apply(member.pet, self.economy)
         print(f"Feeding successful: Hunger -10, Happiness +10, Remaining feed {self.economy.feed_stock}")
+        member.events.resolve('feed')
 
     def _cmd_buyfeed(self, *args):
         """
@@ -117,17 +290,17 @@ class TextUI:
         else:
             print(f"Not enough coins to purchase {amount} feed unit(s) (requires {cost} coins)." )
 
-    def _cmd_play(self, *args):
+    def _cmd_play(self, member, *args):
         """
         Play with the pet: increases happiness at the cost of energy.
         """
         dur = 1
         if args and args[0].isdigit():
             dur = int(args[0])
-        gain, cost = self.pet.play(dur)
+        gain, cost = member.pet.play(dur)
         print(f"Played for {dur} hour(s): Happiness +{gain}, Energy -{cost}")
 
-    def _cmd_interact(self, *args):
+    def _cmd_interact(self, member, *args):
         """
         Interact with the pet: head / wing / belly / paw.
         """
@@ -136,62 +309,78 @@ class TextUI:
             return
         part = args[0]
         try:
-            self.interact.action(part)
+            member.interact.action(part)
         except ValueError as e:
             print(str(e))
 
-    def _cmd_travel(self, *args):
+    def _cmd_travel(self, member, *args):
         """
         Travel with the pet to a chosen location.
         """
         if not args:
             print("Available travel locations:")
-            for key, loc in self.travel.locations.items():
+            for key, loc in member.travel.locations.items():
                 print(f"  {key}: {loc['name']}")
             print("Example: travel beach")
             return
         choice = args[0]
         try:
-            record = self.travel.travel(choice)
+            record = member.travel.travel(choice)
             print(f"[Travel] {record['time']} - {record['location']}: {record['text']}")
             print(f"Happiness change: {record['happiness_change']}, Energy change: {record['energy_change']}")
         except ValueError as e:
             print(str(e))
 
-    def _cmd_memories(self, *args):
+    @staticmethod
+    def _page_args(args, filter_name):
         """
-        View the travel memories album.
+        Parse "[page] [<filter_name>=<value>]" arguments of the paged history commands.
         """
-        mems = self.travel.get_memories()
+        page, value = 1, None
+        for arg in args:
+            if arg.isdigit():
+                page = int(arg)
+            elif arg.startswith(filter_name + '='):
+                value = arg.split('=', 1)[1]
+        return page, value
+
+    def _cmd_memories(self, member, *args):
+        """
+        View the travel memories album: memories [page] [location=<beach|forest|mountain|city>]
+        """
+        page, location = self._page_args(args, 'location')
+        mems, pages = member.travel.get_memories(page, location=location)
         if not mems:
             print("No travel memories available.")
             return
-        print("=== Travel Memories ===")
+        print(f"=== Travel Memories (page {page}/{pages}, newest first) ===")
         for m in mems:
             print(f"{m['time']} | {m['location']} | {m['text']} | "
                   f"Happiness {m['happiness_change']} | Energy {m['energy_change']} | "
                   f"Health {m.get('health_change', 0)}")
 
-    def _cmd_events(self, *args):
+    def _cmd_events(self, member, *args):
         """
-        View the log of triggered random events.
+        View the log of triggered random events: events [page] [key=<event key>]
         """
-        logs = self.events.get_log()
+        page, key = self._page_args(args, 'key')
+        logs, pages = member.events.get_log(page, key=key)
         if not logs:
             print("No event records.")
             return
-        print("=== Event Log ===")
+        print(f"=== Event Log (page {page}/{pages}, newest first) ===")
         for e in logs:
             print(f"{e['time']} | {e['key']} | {e['text']} | "
                   f"Happiness {e.get('happiness_change', 0)} | "
                   f"Energy {e.get('energy_change', 0)} | "
                   f"Health {e.get('health_change', 0)}")
 
-    def _cmd_vet(self, *args):
+    def _cmd_vet(self, member, *args):
         """
         Take the pet to the veterinarian (restores health and energy to 100 at cost of coins).
         """
-        self.vet.visit()
+        if member.vet.visit():
+            member.events.resolve('vet')
 
     def _cmd_earn(self, *args):
         """
@@ -200,18 +389,173 @@ class TextUI:
         print("Please select a mini-game to earn coins:")
         for key, (name, _) in self.minigames.items():
             print(f"  {key}. {name}")
-        choice = input("Enter number to choose: ").strip()
+        choice = self._read("Enter number to choose: ").strip()
         if choice in self.minigames:
             _, game = self.minigames[choice]
-            game.play()
+            game.play(self._read, self._sleep)
         else:
             print("Invalid choice. Type help to view commands.")
 
-    def _cmd_status(self, *args):
+    def _read(self, prompt):
+        """
+        Read a minigame answer from the player (recorded when the session is being recorded).
+        Ticks may run while the player is typing.
+        """
+        started = time.monotonic()
+        self._turn.release()
+        try:
+            reply = self._input(prompt)
+        finally:
+            self._turn.acquire()
+        if self.recorder:
+            self.recorder.answer(reply, time.monotonic() - started)
+        return reply
+
+    def _input(self, prompt):
+        """
+        input(), letting ticks that print meanwhile redraw the prompt.
+        """
+        if not self.renderer:
+            return input(prompt)
+        self.renderer.prompt = prompt
+        try:
+            return input(prompt)
+        finally:
+            self.renderer.prompt = None
+
+    def _sleep(self, seconds):
+        # Show what the minigame printed before the pause
+        sys.stdout.flush()
+        time.sleep(seconds)
+        if self.recorder:
+            self.recorder.waited(seconds)
+
+    def _cmd_status(self, member, *args):
         """
         View current status of pet and economy.
         """
-        self._display_status()
+        self._display_status(member)
+
+    def _cmd_history(self, member, *args):
+        """
+        Show how the stats moved: history [minutes] [export <file.csv|file.json>]
+        """
+        history = member.history
+        if len(args) >= 2 and args[0] == 'export':
+            path = self._export_path(args[1])
+            if path is None:
+                return
+            try:
+                os.makedirs(self.EXPORT_DIR, exist_ok=True)
+                history.export(path)
+            except OSError as e:
+                print(f"Could not export history: {e}")
+                return
+            print(f"History exported to {path}")
+            return
+        minutes = None
+        if args:
+            try:
+                minutes = float(args[0])
+            except ValueError:
+                minutes = 0
+            if not minutes > 0:
+                print("Usage: history [minutes] [export <file.csv|file.json>] (minutes > 0)")
+                return
+        if not history.total:
+            print("No history yet: stats are recorded every tick.")
+            return
+        self._display_history(minutes, member)
+
+    def _display_history(self, minutes=None, member=None):
+        """
+        Print a pet's (by default the active pet's) stats over the last minutes of game time
+        (all of it by default) as sparklines, with the danger zones it entered and why the
+        game ended, if it did.
+        """
+        member = member or self.member
+        history = member.history
+        now = history.last_time()
+        start, means, ranges = history.columns(now - minutes * 60 if minutes else None)
+        if start is None:
+            print("No history recorded in that window.")
+            return
+        print(f"=== {member.pet.name}'s stats from {_clock(start)} to {_clock(now)} (game time) ===")
+        for field, values in means.items():
+            current = next(v for v in reversed(values) if v is not None)
+            low, high = ranges[field]
+            print(f"{field:<10} {sparkline(values)}  now {current:.0f}, min {low:.0f}, max {high:.0f}")
+        alerts = [f"{_clock(when)} {label}" + (f" ({value[0]})" if not label.startswith('failed') else '')
+                  for _, when, label, value in history.alerts.since(0) if when >= start]
+        if alerts:
+            print("Alerts: " + " | ".join(alerts[-8:]))
+
+    def _export_path(self, name):
+        """
+        Where an export named name is written: only the file name is kept, and it goes into
+        EXPORT_DIR. Returns None, after saying why, if exporting is off or the type is not allowed.
+        """
+        if self.EXPORT_DIR is None:
+            print("Exporting is not available in this game.")
+            return None
+        name = os.path.basename(name)
+        if not name.endswith(self.EXPORT_TYPES):
+            print(f"Export files must end in {' or '.join(self.EXPORT_TYPES)}.")
+            return None
+        return os.path.join(self.EXPORT_DIR, name)
+
+    def _cmd_stats(self, *args):
+        """
+        Show profiling statistics: stats [export <file.json|file.prom>]
+        """
+        if not self.metrics:
+            print("Profiling is off. Start the game with --metrics <file> to enable it.")
+            return
+        if len(args) >= 2 and args[0] == 'export':
+            try:
+                self.metrics.export(args[1])
+            except OSError as e:
+                print(f"Could not export statistics: {e}")
+                return
+            print(f"Statistics exported to {args[1]}")
+            return
+        print("=== Timing statistics (microseconds) ===")
+        print(self.metrics.report())
+
+    def _cmd_adopt(self, *args):
+        """
+        Adopt another parrot into the household: adopt <name>. Then e.g. "feed <name>", "feed all".
+        """
+        if len(args) != 1:
+            print("Usage: adopt <name> (a single word)")
+            return
+        name = args[0]
+        # The name is used as a command argument, so it must not look like any other argument
+        reserved = {'all', *self.interact.thresholds, *self.travel.locations}
+        if name.lower() in reserved or name.isdigit() or '=' in name:
+            print(f"'{name}' cannot be used as a pet name.")
+            return
+        try:
+            self.household.adopt(name)
+        except ValueError as e:
+            print(str(e))
+            return
+        print(f"{name} joins the household! Commands act on {self.pet.name}; add {name} or 'all' "
+              f"to a command (e.g. feed {name}), or use select {name}.")
+
+    def _cmd_select(self, *args):
+        """
+        Choose the pet that commands act on: select <name>
+        """
+        member = self.household.get(args[0]) if args else None
+        if member is None:
+            print(f"Usage: select <{'|'.join(m.pet.name for m in self.household)}>")
+            return
+        if not member.pet.is_alive():
+            print(f"{member.pet.name} is no longer in your care.")
+            return
+        self._focus(member)
+        print(f"{self.pet.name} is now the active pet.")
 
     def _cmd_help(self, *args):
         """
@@ -228,26 +572,86 @@ class TextUI:
         print("Thank you for playing!")
         self.running = False
 
-    def run(self):
+    def dispatch(self, line):
         """
-        Start the game UI.
+        Parse one command line and run the matching command handler, returning its result.
         """
-        print(f"Welcome, pet owner of {self.pet.name}! Let's start the game ~")
-        self._cmd_help()
-        self.timer.start()
-        self.running = True
-        while self.running and self.pet.is_alive():
-            try:
-                raw = input(self.PROMPT).strip().split()
-            except (KeyboardInterrupt, EOFError):
-                print("Exiting game.")
-                break
-            if not raw:
-                continue
-            cmd, *args = raw
-            fn = self.commands.get(cmd)
-            if fn:
-                fn(*args)
+        raw = line.strip().split()
+        if not raw:
+            return None
+        cmd, *args = raw
+        fn = self.commands.get(cmd)
+        if not fn:
+            print(f"Unknown command: {cmd}")
+            return None
+        with self._turn:
+            if self.metrics:
+                self.metrics.incr('commands')
+            if self.store:
+                self.store.log_command(line.strip())
+            if self.recorder:
+                self.recorder.command(line)
+            if cmd in self.TARGETED:
+                members, args = self._targets(cmd, args, self.member)
+                # The status line starts with the pet's name already
+                result = self._for_each(members, fn, args, label=len(members) > 1 and cmd != 'status')
             else:
-                print(f"Unknown command: {cmd}")
+                result = fn(*args)
+            # A coroutine command (earn in the async UIs) has not run yet; it saves when done
+            if self.store and not inspect.iscoroutine(result):
+                self.store.save(self)
+        return result
+
+    def record(self, path):
+        """
+        Record this session's commands, ticks and minigame answers to path, for ui.replay.
+        Only a new game can be recorded, since a replay starts from a new game.
+        """
+        if self.resumed:
+            raise ValueError("A resumed game cannot be recorded; start a new one to record it")
+        self.recorder = Recorder(path, self.random.seed, self.pet.name, self.difficulty)
+        for _, game in self.minigames.values():
+            game.clock = self.recorder.clock
+
+    def _shutdown(self):
+        """
+        Save and close the game store and the recording when the game loop ends.
+        """
+        if self.recorder:
+            self.recorder.close(session_state(self))
+            self.recorder = None
+        if self.store:
+            self.store.save(self)
+            self.store.close()
+
+    def run(self):
+        """
+        Start the game UI. While it runs, output goes through a Renderer: one write per
+        command (with the next prompt) and one per tick.
+        """
+        console = sys.stdout
+        self.renderer = Renderer(console)
+        if readline:
+            self.renderer.typed = readline.get_line_buffer
+        sys.stdout = self.renderer
+        try:
+            print(f"Welcome, pet owner of {self.pet.name}! Let's start the game ~")
+            self._cmd_help()
+            self.events.catalog.watch()
+            self.timer.start()
+            self.running = True
+            # Not self.pet: the tick thread only refocuses after the active pet has died
+            while self.running and self.household.living():
+                try:
+                    line = self._input(self.PROMPT)
+                except (KeyboardInterrupt, EOFError):
+                    print("Exiting game.")
+                    break
+                self.dispatch(line)
+            self.timer.stop()
+            self._shutdown()
+        finally:
+            sys.stdout = console
+            self.renderer.render()
+            self.renderer = None
         print("Game over. Goodbye!")
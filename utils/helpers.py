@@ -1,3 +1,6 @@
+import os
+import sys
+
 def print_banner():
     banner = r"""
       
@@ -9,3 +12,40 @@ def print_banner():
 ==PARROT PET GAME==
 """
     print(banner)
+
+class NullOutput:
+    """
+    A stdout stand-in that throws text away, for headless runs.
+    """
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+def silence():
+    """
+    Throw away everything this process prints from now on (e.g. in simulation worker processes).
+    """
+    sys.stdout = NullOutput()
+
+def supports_ansi(stream):
+    """
+    Whether stream is a terminal that understands ANSI escape codes. Classic Windows consoles
+    do not; Windows Terminal (WT_SESSION) and terminals that set TERM do.
+    """
+    isatty = getattr(stream, 'isatty', None)
+    if not (isatty and isatty()):
+        return False
+    return os.name != 'nt' or 'WT_SESSION' in os.environ or 'TERM' in os.environ
+
+SPARK_BLOCKS = '▁▂▃▄▅▆▇█'
+
+def sparkline(values, low=0, high=100):
+    """
+    Render numbers as one block character each, scaled from low to high; None is a gap.
+    """
+    top = len(SPARK_BLOCKS) - 1
+    span = (high - low) or 1
+    return ''.join(' ' if v is None else SPARK_BLOCKS[round(min(max((v - low) / span, 0), 1) * top)]
+                   for v in values)
@@ -0,0 +1,190 @@
+import inspect
+import json
+import re
+import time
+from functools import wraps
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of durations in nanoseconds.
+    Values below 32ns get exact buckets; above that each power of two is split into
+    16 sub-buckets, so any recorded value is known to within ~6% using a few hundred ints.
+    """
+    SUB_BITS = 4
+    SUB = 1 << SUB_BITS
+
+    def __init__(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @classmethod
+    def _index(cls, value):
+        if value < 2 * cls.SUB:
+            return value
+        shift = value.bit_length() - (cls.SUB_BITS + 1)
+        return (shift + 1) * cls.SUB + (value >> shift) - cls.SUB
+
+    @classmethod
+    def _lower_bound(cls, index):
+        if index < 2 * cls.SUB:
+            return index
+        shift = index // cls.SUB - 1
+        return (index % cls.SUB + cls.SUB) << shift
+
+    def record(self, ns):
+        ns = max(0, int(ns))
+        i = self._index(ns)
+        if i >= len(self.counts):
+            self.counts.extend([0] * (i + 1 - len(self.counts)))
+        self.counts[i] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q):
+        """
+        Return the (lower bound of the bucket holding the) q-th quantile, 0 <= q <= 1, in ns.
+        """
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return self._lower_bound(i)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+class Metrics:
+    """
+    Counters and latency histograms for the game loop, command handlers and minigames.
+    Instrumentation is applied by wrapping callables with wrap(), so when profiling is off
+    (no Metrics object at all) the game runs the original functions with no overhead.
+    """
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, prefix='parrot'):
+        self.prefix = prefix
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.time()
+
+    def incr(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def histogram(self, name):
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = LatencyHistogram()
+        return hist
+
+    def observe(self, name, seconds):
+        """
+        Record a duration given in seconds (e.g. how late a tick ran).
+        """
+        self.histogram(name).record(seconds * 1e9)
+
+    def wrap(self, name, fn):
+        """
+        Return fn timed into the histogram called name.
+        """
+        hist = self.histogram(name)
+        clock = time.perf_counter_ns
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def timed_async(*args, **kwargs):
+                start = clock()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    hist.record(clock() - start)
+            return timed_async
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                hist.record(clock() - start)
+        return timed
+
+    def snapshot(self):
+        """
+        Return all counters and histogram summaries (in seconds) as a plain dict.
+        """
+        return {
+            'uptime_seconds': time.time() - self.started,
+            'counters': dict(self.counters),
+            'latency': {
+                name: {
+                    'count': h.count,
+                    'mean': h.mean / 1e9,
+                    'max': h.max / 1e9,
+                    **{f'p{int(q * 100)}': h.percentile(q) / 1e9 for q in self.QUANTILES},
+                }
+                for name, h in self.histograms.items()
+            },
+        }
+
+    def _metric_name(self, name):
+        return f"{self.prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}"
+
+    def to_prometheus(self):
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        for name, value in self.counters.items():
+            metric = self._metric_name(name) + '_total'
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, h in self.histograms.items():
+            metric = self._metric_name(name) + '_seconds'
+            lines.append(f"# TYPE {metric} summary")
+            for q in self.QUANTILES:
+                lines.append(f'{metric}{{quantile="{q}"}} {h.percentile(q) / 1e9:.9f}')
+            lines += [f"{metric}_sum {h.total / 1e9:.9f}", f"{metric}_count {h.count}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """
+        Write the metrics to path: Prometheus text for *.prom / *.txt, JSON otherwise.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith(('.prom', '.txt')):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.snapshot(), f, indent=2)
+
+    def report(self):
+        """
+        Return a human readable table of the latency histograms (microseconds).
+        """
+        rows = [f"{'name':<28}{'count':>8}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}"]
+        for name, h in sorted(self.histograms.items()):
+            if not h.count:
+                continue
+            rows.append(f"{name:<28}{h.count:>8}{h.mean / 1e3:>10.1f}{h.percentile(0.5) / 1e3:>10.1f}"
+                        f"{h.percentile(0.99) / 1e3:>10.1f}{h.max / 1e3:>10.1f}")
+        for name, value in sorted(self.counters.items()):
+            rows.append(f"{name:<28}{value:>8}")
+        return "\n".join(rows)
+
+class TimedStream:
+    """
+    Wraps an output stream and times every write, to see how much of a tick is spent printing.
+    """
+    def __init__(self, stream, metrics, name='output'):
+        self.stream = stream
+        self.write = metrics.wrap(name, stream.write)
+
+    def __getattr__(self, attr):
+        return getattr(self.stream, attr)
@@ -0,0 +1,136 @@
+import sys
+import threading
+import time
+from collections import deque
+
+from utils.helpers import supports_ansi
+
+def emit(text, kind='info', key=None):
+    """
+    Show a message from a game subsystem: kind is e.g. 'event', 'warning' or 'info', and
+    key names a message that repeats (e.g. one pet's hunger warning) so it can be
+    deduplicated. When a Renderer (or the server's session router) is installed as
+    sys.stdout the message is queued for its next frame; otherwise it is printed.
+    """
+    post = getattr(sys.stdout, 'post', None)
+    if post is None:
+        print(text)
+    else:
+        post(text, kind, key)
+
+def forget(key):
+    """
+    The condition behind a repeating message (see emit) has ended: if it comes back,
+    its message is shown at once.
+    """
+    drop = getattr(sys.stdout, 'forget', None)
+    if drop is not None:
+        drop(key)
+
+class Renderer:
+    """
+    Batched terminal output. Installed as sys.stdout while a game runs, it queues every
+    print() and emit() from any subsystem or thread, and render() turns the queue into one
+    frame written with a single write and flush. A flush() (as done by input() after its
+    prompt) renders at once, so command output and the next prompt leave together.
+    Frames for output that arrives while the player is at a prompt (ticks) start on a clean
+    line and end by drawing the prompt again, so messages never run into what is being
+    typed. Such frames are held back to at most one per min_interval seconds.
+    A warning, or any message with a key, is shown at most once per repeat_after seconds;
+    the copies in between are counted and the count is shown with the next copy.
+    forget(key) ends that, once the message's condition no longer holds.
+    """
+    def __init__(self, target, ansi=None, min_interval=1 / 30, repeat_after=30.0, clock=time.monotonic):
+        """
+        target is a file-like object (the console, or a socket adapter); ansi says whether
+        it understands escape codes (by default: whether it is a terminal that does).
+        """
+        self.target = target
+        self.ansi = supports_ansi(target) if ansi is None else ansi
+        self.min_interval = min_interval
+        self.repeat_after = repeat_after
+        self.clock = clock
+        self.prompt = None          # The prompt being answered, redrawn after a frame
+        self.typed = None           # Returns the input typed at the prompt so far, redrawn with it
+        self._queue = deque()       # (text, key); appends are safe from any thread
+        self._lock = threading.Lock()
+        self._shown = {}            # key -> [time last shown, copies hidden since]
+        self._last = float('-inf')
+        self.frames = 0
+        self.hidden = 0
+
+    def __getattr__(self, name):
+        # isatty, encoding, fileno, ... come from the real output
+        return getattr(self.target, name)
+
+    def write(self, text):
+        if text:
+            self._queue.append((text, None))
+        return len(text)
+
+    def post(self, text, kind='info', key=None):
+        if key is None and kind == 'warning':
+            key = text
+        self._queue.append((text + '\n', key))
+
+    def flush(self):
+        self.render()
+
+    def pending(self):
+        return bool(self._queue)
+
+    def forget(self, key):
+        with self._lock:
+            self._shown.pop(key, None)
+
+    def discard(self):
+        """
+        Drop everything queued (e.g. for a client that is not reading).
+        """
+        self._queue.clear()
+
+    def _unrepeated(self, text, key, now):
+        seen = self._shown.get(key)
+        if seen is not None and now - seen[0] < self.repeat_after:
+            seen[1] += 1
+            self.hidden += 1
+            return None
+        if seen is not None and seen[1]:
+            hidden = seen[1]
+            text = f"{text[:-1]} (repeated {hidden} more time{'s' if hidden != 1 else ''})\n"
+        self._shown[key] = [now, 0]
+        return text
+
+    def render(self, redraw=False, force=True, final=False):
+        """
+        Write everything queued as one frame. With redraw, the output interrupts a prompt:
+        it goes on a fresh line and the prompt is drawn again after it, with the input typed so
+        far (unless final, when no more input is wanted). Unless force, nothing is written within min_interval of
+        the previous frame (the queue is kept for later). Returns whether a frame was written.
+        """
+        with self._lock:
+            now = self.clock()
+            if not force and now - self._last < self.min_interval:
+                return False
+            parts = []
+            while self._queue:
+                text, key = self._queue.popleft()
+                if key is not None:
+                    text = self._unrepeated(text, key, now)
+                    if text is None:
+                        continue
+                parts.append(text)
+            if not parts:
+                return False
+            frame = ''.join(parts)
+            if redraw and self.prompt is not None:
+                # On a terminal, overwrite the prompt line instead of leaving it half used,
+                # as long as what was typed on it can be drawn again
+                typed = self.typed() if self.typed else ''
+                erase = self.ansi and self.typed is not None
+                frame = ('\r\x1b[K' if erase else '\n') + frame + ('' if final else self.prompt + typed)
+            self.target.write(frame)
+            self.target.flush()
+            self._last = now
+            self.frames += 1
+            return True